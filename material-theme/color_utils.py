@@ -0,0 +1,551 @@
+#!/usr/bin/env python3
+"""
+Color Utilities
+Shared HCT helpers for the Material You theme generators
+"""
+import functools
+import hashlib
+import importlib
+import json
+import math
+import os
+import stat
+import sys
+import tempfile
+from pathlib import Path
+from materialyoucolor.hct import Hct
+from materialyoucolor.hct.hct_solver import HctSolver
+from materialyoucolor.hct.viewing_conditions import ViewingConditions
+from materialyoucolor.utils.color_utils import argb_from_linrgb, y_from_lstar
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# numpy is optional and takes ~100ms to import, more than the vectorized
+# solver saves on a generator's couple dozen colors. It is only imported for
+# batches of at least NUMPY_MIN_BATCH colors, or used when already loaded.
+NUMPY_MIN_BATCH = 4096
+np = None
+
+# Handing QuantizeCelebi an ndarray instead of a list of pixel tuples saves
+# about 1us per pixel, so numpy only pays for itself on big bitmaps
+NUMPY_MIN_PIXELS = 1 << 17
+
+# PIL's median cut costs ~6ms up front, which only pays off once
+# QuantizeCelebi has a few thousand pixels to cluster
+PRE_QUANTIZE_MIN_PIXELS = 1 << 13
+# ...and only runs on images that already have a limited palette, since it
+# shifts the accent picked from photos
+PRE_QUANTIZE_MAX_COLORS = 1024
+
+# Resolved once per process instead of on every write
+HOME = Path.home()
+# Read at import, before any worker threads exist: os.umask can only be
+# queried by setting it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+_ENSURED_DIRS = set()
+
+# Persisted generator output, see disk_cached()
+COLOR_CACHE_DIR = HOME / '.cache' / 'material-theme' / 'colors'
+
+# ViewingConditions.DEFAULT() rebuilds the CAM16 constants on every call
+_VIEWING_CONDITIONS = ViewingConditions.DEFAULT()
+_T_INNER_COEFF = 1 / math.pow(1.64 - math.pow(0.29, _VIEWING_CONDITIONS.n), 0.73)
+
+# Scheme name -> (materialyoucolor.scheme module, class), imported on demand
+# so only the selected scheme is loaded
+SCHEMES = {
+    'scheme-fruit-salad': ('scheme_fruit_salad', 'SchemeFruitSalad'),
+    'scheme-expressive': ('scheme_expressive', 'SchemeExpressive'),
+    'scheme-monochrome': ('scheme_monochrome', 'SchemeMonochrome'),
+    'scheme-rainbow': ('scheme_rainbow', 'SchemeRainbow'),
+    'scheme-tonal-spot': ('scheme_tonal_spot', 'SchemeTonalSpot'),
+    'scheme-neutral': ('scheme_neutral', 'SchemeNeutral'),
+    'scheme-fidelity': ('scheme_fidelity', 'SchemeFidelity'),
+    'scheme-content': ('scheme_content', 'SchemeContent'),
+    'scheme-vibrant': ('scheme_vibrant', 'SchemeVibrant'),
+}
+DEFAULT_SCHEME = 'scheme-tonal-spot'
+
+# Below this chroma the J iteration converges without HctSolver's bisection
+LOW_CHROMA = 10.0
+
+
+def _solve_low_chroma(hue: float, chroma: float, tone: float) -> int:
+    """
+    HctSolver.find_result_by_j with the CAM16 constants hoisted out
+
+    Meant for low chroma colors, which always converge here. Returns 0 if
+    the color still needs the scalar solver's fallback.
+    """
+    vc = _VIEWING_CONDITIONS
+    hue_radians = (hue % 360.0) / 180 * math.pi
+    y = y_from_lstar(tone)
+    j = math.sqrt(y) * 11.0
+    e_hue = 0.25 * (math.cos(hue_radians + 2.0) + 3.8)
+    p1 = e_hue * (50000.0 / 13.0) * vc.nc * vc.ncb
+    h_sin = math.sin(hue_radians)
+    h_cos = math.cos(hue_radians)
+    m = HctSolver.LINRGB_FROM_SCALED_DISCOUNT
+    k_r, k_g, k_b = HctSolver.Y_FROM_LINRGB
+    adapt = HctSolver.inverse_chromatic_adaptation
+
+    for iteration_round in range(5):
+        j_normalized = j / 100.0
+        alpha = chroma / math.sqrt(j_normalized) if (chroma != 0.0 and j != 0.0) else 0.0
+        t = math.pow(alpha * _T_INNER_COEFF, 1.0 / 0.9)
+        ac = vc.aw * math.pow(j_normalized, 1.0 / vc.c / vc.z)
+        p2 = ac / vc.nbb
+        gamma = 23.0 * (p2 + 0.305) * t / (23.0 * p1 + 11 * t * h_cos + 108.0 * t * h_sin)
+        a = gamma * h_cos
+        b = gamma * h_sin
+        r_c = adapt((460.0 * p2 + 451.0 * a + 288.0 * b) / 1403.0)
+        g_c = adapt((460.0 * p2 - 891.0 * a - 261.0 * b) / 1403.0)
+        b_c = adapt((460.0 * p2 - 220.0 * a - 6300.0 * b) / 1403.0)
+        lin_r = r_c * m[0][0] + g_c * m[0][1] + b_c * m[0][2]
+        lin_g = r_c * m[1][0] + g_c * m[1][1] + b_c * m[1][2]
+        lin_b = r_c * m[2][0] + g_c * m[2][1] + b_c * m[2][2]
+        if lin_r < 0 or lin_g < 0 or lin_b < 0:
+            return 0
+        fnj = k_r * lin_r + k_g * lin_g + k_b * lin_b
+        if fnj <= 0:
+            return 0
+        if iteration_round == 4 or abs(fnj - y) < 0.002:
+            if lin_r > 100.01 or lin_g > 100.01 or lin_b > 100.01:
+                return 0
+            return argb_from_linrgb([lin_r, lin_g, lin_b])
+        j = j - (fnj - y) * j / (2 * fnj)
+
+    return 0
+
+
+def _use_numpy(batch_size: int, min_batch: int = NUMPY_MIN_BATCH) -> bool:
+    """Whether to run a batch through numpy, importing it if worthwhile"""
+    global np
+    if np is None and (batch_size >= min_batch or 'numpy' in sys.modules):
+        try:
+            import numpy as np
+        except ImportError:
+            np = False
+    return bool(np)
+
+
+def _solve_batch_np(hues, chromas, tones):
+    """
+    Vectorized port of HctSolver.find_result_by_j
+
+    All colors run the CAM16 J iteration in lockstep. Entries the fast path
+    can't resolve (achromatic, out of gamut) are left as 0 so the caller can
+    hand them to the scalar solver, exactly like HctSolver.solve_to_int does.
+    """
+    vc = _VIEWING_CONDITIONS
+    hues = np.asarray(hues, dtype=np.float64) % 360.0
+    chroma = np.asarray(chromas, dtype=np.float64)
+    lstar = np.asarray(tones, dtype=np.float64)
+    result = np.zeros(hues.shape, dtype=np.int64)
+
+    # Same early-out as solve_to_int; those go through argb_from_lstar
+    active = (chroma >= 0.0001) & (lstar >= 0.0001) & (lstar <= 99.9999)
+    if not active.any():
+        return result
+
+    # y_from_lstar
+    ft = (lstar + 16.0) / 116.0
+    ft3 = ft * ft * ft
+    y = 100.0 * np.where(ft3 > 216.0 / 24389.0, ft3, (116 * ft - 16) / (24389.0 / 27.0))
+
+    hue_radians = hues / 180 * math.pi
+    j = np.sqrt(y) * 11.0
+    e_hue = 0.25 * (np.cos(hue_radians + 2.0) + 3.8)
+    p1 = e_hue * (50000.0 / 13.0) * vc.nc * vc.ncb
+    h_sin = np.sin(hue_radians)
+    h_cos = np.cos(hue_radians)
+    m = HctSolver.LINRGB_FROM_SCALED_DISCOUNT
+    k_r, k_g, k_b = HctSolver.Y_FROM_LINRGB
+
+    def inverse_chromatic_adaptation(adapted):
+        adapted_abs = np.abs(adapted)
+        base = np.maximum(0, 27.13 * adapted_abs / (400.0 - adapted_abs))
+        return np.sign(adapted) * np.power(base, 1.0 / 0.42)
+
+    with np.errstate(all='ignore'):
+        for iteration_round in range(5):
+            j_normalized = j / 100.0
+            alpha = np.where((chroma != 0.0) & (j != 0.0), chroma / np.sqrt(j_normalized), 0.0)
+            t = np.power(alpha * _T_INNER_COEFF, 1.0 / 0.9)
+            ac = vc.aw * np.power(j_normalized, 1.0 / vc.c / vc.z)
+            p2 = ac / vc.nbb
+            gamma = 23.0 * (p2 + 0.305) * t / (23.0 * p1 + 11 * t * h_cos + 108.0 * t * h_sin)
+            a = gamma * h_cos
+            b = gamma * h_sin
+            r_c = inverse_chromatic_adaptation((460.0 * p2 + 451.0 * a + 288.0 * b) / 1403.0)
+            g_c = inverse_chromatic_adaptation((460.0 * p2 - 891.0 * a - 261.0 * b) / 1403.0)
+            b_c = inverse_chromatic_adaptation((460.0 * p2 - 220.0 * a - 6300.0 * b) / 1403.0)
+            lin_r = r_c * m[0][0] + g_c * m[0][1] + b_c * m[0][2]
+            lin_g = r_c * m[1][0] + g_c * m[1][1] + b_c * m[1][2]
+            lin_b = r_c * m[2][0] + g_c * m[2][1] + b_c * m[2][2]
+            fnj = k_r * lin_r + k_g * lin_g + k_b * lin_b
+
+            # Negative channels / luminance: give up, scalar bisection handles it
+            failed = active & ((lin_r < 0) | (lin_g < 0) | (lin_b < 0) | (fnj <= 0))
+            active &= ~failed
+
+            converged = active & ((iteration_round == 4) | (np.abs(fnj - y) < 0.002))
+            in_gamut = converged & (lin_r <= 100.01) & (lin_g <= 100.01) & (lin_b <= 100.01)
+            if in_gamut.any():
+                result[in_gamut] = _argb_from_linrgb_np(lin_r, lin_g, lin_b)[in_gamut]
+            active &= ~converged
+
+            if not active.any():
+                break
+            j = j - (fnj - y) * j / (2 * fnj)
+
+    return result
+
+
+def _argb_from_linrgb_np(lin_r, lin_g, lin_b):
+    """Vectorized materialyoucolor argb_from_linrgb"""
+    def delinearized(component):
+        normalized = component / 100.0
+        srgb = np.where(
+            normalized <= 0.0031308,
+            normalized * 12.92,
+            1.055 * np.power(normalized, 1.0 / 2.4) - 0.055
+        )
+        return np.clip(np.rint(srgb * 255.0), 0, 255).astype(np.int64)
+
+    return (0xFF << 24) | (delinearized(lin_r) << 16) | (delinearized(lin_g) << 8) | delinearized(lin_b)
+
+
+def image_pixels(image, pre_quantize: bool = False, paletted: bool = False):
+    """
+    Pixel data of a PIL image in the shape QuantizeCelebi expects
+
+    Args:
+        image: PIL image, already converted and resized
+        pre_quantize: Median cut RGB images down to 256 colors first, so
+            QuantizeCelebi has far fewer distinct colors to cluster. Only
+            done for paletted sources or images with at most
+            PRE_QUANTIZE_MAX_COLORS distinct colors; photos and small
+            bitmaps are passed through as they are
+        paletted: The image was converted from a PIL palette ("P") image
+
+    Returns:
+        (N, bands) uint8 ndarray when numpy is worth it, else a sequence of
+        pixel tuples
+    """
+    width, height = image.size
+    if (pre_quantize and image.mode == 'RGB' and width * height >= PRE_QUANTIZE_MIN_PIXELS
+            and (paletted or image.getcolors(PRE_QUANTIZE_MAX_COLORS) is not None)):
+        from PIL import Image
+        quantized = image.quantize(colors=256, method=Image.Quantize.MEDIANCUT)
+        palette = quantized.getpalette()
+        # Every palette color repeated by its pixel count keeps the
+        # population the scorer ranks by
+        pixels = []
+        for count, index in quantized.getcolors(256):
+            pixels.extend([tuple(palette[index * 3:index * 3 + 3])] * count)
+        return pixels
+
+    if _use_numpy(width * height, NUMPY_MIN_PIXELS):
+        return np.asarray(image).reshape(-1, len(image.getbands()))
+    # getdata() is deprecated since Pillow 12
+    if hasattr(image, 'get_flattened_data'):
+        return image.get_flattened_data()
+    return list(image.getdata())
+
+
+def load_scheme(name: str):
+    """Import and return the scheme class for a 'scheme-*' name, tonal spot if unknown"""
+    module_name, class_name = SCHEMES.get(name, SCHEMES[DEFAULT_SCHEME])
+    return getattr(importlib.import_module(f'materialyoucolor.scheme.{module_name}'), class_name)
+
+
+@functools.lru_cache(maxsize=None)
+def hex_to_argb(hex_code: str) -> int:
+    """Convert hex color to ARGB integer"""
+    return 0xFF000000 | int(hex_code[1:7], 16)
+
+
+@functools.lru_cache(maxsize=1024)
+def argb_to_hex(argb: int) -> str:
+    """Convert ARGB integer to hex color"""
+    return "#%06X" % (argb & 0xFFFFFF)
+
+
+@functools.lru_cache(maxsize=256)
+def hct_from_argb(argb: int) -> Hct:
+    """
+    Convert ARGB integer to HCT, cached so repeated colors are solved once
+
+    The returned Hct is shared between callers and must not be modified.
+    """
+    return Hct.from_int(argb)
+
+
+@functools.lru_cache(maxsize=None)
+def hct_from_hex(hex_code: str) -> Hct:
+    """
+    Convert hex color to HCT, cached so generators share one instance
+
+    The returned Hct is shared between callers and must not be modified.
+    """
+    return hct_from_argb(hex_to_argb(hex_code))
+
+
+@functools.lru_cache(maxsize=256)
+def hct_components(argb: int) -> tuple:
+    """(hue, chroma, tone) of an ARGB color, unpacked once and cached"""
+    hct = hct_from_argb(argb)
+    return hct.hue, hct.chroma, hct.tone
+
+
+def hex_to_rgb(hex_code: str) -> str:
+    """Convert hex color to lowercase RRGGBB (no #)"""
+    return hex_code.lstrip('#')[:6].lower()
+
+
+@functools.lru_cache(maxsize=512)
+def hct_to_argb(hue: float, chroma: float, tone: float) -> int:
+    """Solve an HCT color straight to ARGB, without building an Hct object"""
+    return HctSolver.solve_to_int(hue, chroma, tone)
+
+
+def hct_to_hex(hue: float, chroma: float, tone: float) -> str:
+    """Convert an HCT color to a hex color, with solver results memoized across generators"""
+    if 0.0001 <= chroma < LOW_CHROMA and 0.0001 <= tone <= 99.9999:
+        argb = _solve_low_chroma(hue, chroma, tone)
+        if argb:
+            return argb_to_hex(argb)
+    return argb_to_hex(hct_to_argb(hue, chroma, tone))
+
+
+def hct_array_to_argb(hues, chromas, tones) -> list:
+    """
+    Convert a batch of HCT colors to ARGB integers
+
+    Args:
+        hues: Sequence of hues in degrees
+        chromas: Sequence of chromas
+        tones: Sequence of tones (L*)
+
+    Returns:
+        List of ARGB integers, identical to Hct.from_hct(h, c, t).to_int()
+    """
+    if not _use_numpy(len(hues)):
+        return [HctSolver.solve_to_int(h, c, t) for h, c, t in zip(hues, chromas, tones)]
+
+    argbs = _solve_batch_np(hues, chromas, tones).tolist()
+    for i, argb in enumerate(argbs):
+        if argb == 0:
+            argbs[i] = HctSolver.solve_to_int(hues[i], chromas[i], tones[i])
+    return argbs
+
+
+def hct_batch_to_hex(hues, chromas, tones) -> list:
+    """Convert a batch of HCT colors to hex colors"""
+    if not _use_numpy(len(hues)):
+        return [hct_to_hex(h, c, t) for h, c, t in zip(hues, chromas, tones)]
+    # np.char.mod formats element by element through Python anyway and
+    # measures ~4x slower than this; argb_to_hex's cache would only thrash
+    return ["#%06X" % (argb & 0xFFFFFF) for argb in hct_array_to_argb(hues, chromas, tones)]
+
+
+def hct_spec_to_hex(spec, base_hue: float, base_chroma: float, darkmode: bool) -> dict:
+    """
+    Resolve a generator spec table into hex colors in a single batch
+
+    Args:
+        spec: Rows of (name, hue_offset, chroma_mult, chroma_cap, tone_dark, tone_light)
+        base_hue: Hue every offset is relative to
+        base_chroma: Chroma every multiplier scales
+        darkmode: Pick the dark or light tone column
+
+    Returns:
+        Dict of name -> hex color
+    """
+    # Tables reuse a handful of offsets and (multiplier, cap) pairs, so each
+    # distinct one is evaluated once
+    hue_of = {dh: (base_hue + dh) % 360 for _, dh, _, _, _, _ in spec}
+    chroma_of = {(mult, cap): min(base_chroma * mult, cap) for _, _, mult, cap, _, _ in spec}
+    hues = [hue_of[dh] for _, dh, _, _, _, _ in spec]
+    chromas = [chroma_of[mult, cap] for _, _, mult, cap, _, _ in spec]
+    tone_col = 4 if darkmode else 5
+    tones = [row[tone_col] for row in spec]
+    return dict(zip((row[0] for row in spec), hct_batch_to_hex(hues, chromas, tones)))
+
+
+def dynamic_colors_to_argb(dynamic_colors, scheme) -> dict:
+    """
+    Resolve MaterialDynamicColors roles against a scheme in a single batch
+
+    Matches color.get_argb(scheme) for every role, without the per-color
+    Hct round trip DynamicColor.get_hct makes through its palette
+
+    Args:
+        dynamic_colors: (name, DynamicColor) pairs
+        scheme: DynamicScheme to evaluate the roles in
+
+    Returns:
+        Dict of name -> ARGB integer
+    """
+    palettes = [dc.palette(scheme) for _, dc in dynamic_colors]
+    tones = [dc.get_tone(scheme) for _, dc in dynamic_colors]
+    argbs = hct_array_to_argb([p.hue for p in palettes], [p.chroma for p in palettes], tones)
+    return dict(zip((name for name, _ in dynamic_colors), argbs))
+
+
+def read_json(path: Path):
+    """Read a JSON file, through orjson when it is installed"""
+    with open(path, 'rb') as f:
+        payload = f.read()
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def write_json(path: Path, data, indent: bool = True) -> None:
+    """Write data as JSON (2-space indented by default), through orjson when it is installed"""
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else None)
+    elif indent:
+        payload = json.dumps(data, indent=2).encode()
+    else:
+        payload = json.dumps(data).encode()
+    with open(path, 'wb') as f:
+        f.write(payload)
+
+
+def ensure_dir(path: Path) -> Path:
+    """Create a directory (and parents) once per process and return it"""
+    if path not in _ENSURED_DIRS:
+        path.mkdir(parents=True, exist_ok=True)
+        _ENSURED_DIRS.add(path)
+    return path
+
+
+def write_if_changed(path: Path, payload: bytes) -> bool:
+    """
+    Write payload to path unless the file already holds exactly those bytes
+
+    The new content goes to a uniquely named temporary file that then
+    replaces the real one, so watchers never see a half-written config and
+    concurrent runs don't share a temp file. The replaced file keeps its
+    permissions. A symlinked path (e.g. into a dotfiles repo) has its target
+    replaced, leaving the link in place.
+    """
+    try:
+        with open(path, 'rb') as f:
+            if f.read(len(payload) + 1) == payload:
+                return False
+    except OSError:
+        pass
+    target = os.path.realpath(path)
+    try:
+        mode = stat.S_IMODE(os.stat(target).st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(target), prefix=f'.{os.path.basename(target)}.', suffix='.tmp'
+    )
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, target)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    return True
+
+
+def _file_versions(paths) -> list:
+    """[mtime_ns, size] of each file, to key a cache on the source that produced it"""
+    return [[st.st_mtime_ns, st.st_size] for st in map(Path.stat, paths)]
+
+
+def disk_cached(generate):
+    """
+    Persist a generate_*_colors(material_colors, term_colors, darkmode) result
+
+    One file per generator and mode is kept in COLOR_CACHE_DIR, so
+    re-applying a theme or toggling dark/light mode skips the HCT work. The
+    key covers the inputs and the generator and color_utils source files, so
+    editing a palette table invalidates it.
+    """
+    sources = (Path(sys.modules[generate.__module__].__file__), Path(__file__))
+
+    @functools.wraps(generate)
+    def wrapper(material_colors: dict, term_colors: dict, darkmode: bool = True) -> dict:
+        versions = _file_versions(sources)
+        key = hashlib.blake2b(json.dumps(
+            [versions, material_colors, term_colors, darkmode], sort_keys=True
+        ).encode(), digest_size=16).hexdigest()
+        cache_path = COLOR_CACHE_DIR / f"{generate.__name__}-{'dark' if darkmode else 'light'}.json"
+
+        try:
+            cached = read_json(cache_path)
+            if cached['key'] == key:
+                return cached['colors']
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+        colors = generate(material_colors, term_colors, darkmode)
+        try:
+            ensure_dir(COLOR_CACHE_DIR)
+            write_json(cache_path, {'key': key, 'colors': colors}, indent=False)
+        except OSError:
+            pass
+        return colors
+
+    return wrapper
+
+
+def image_cached(extract):
+    """
+    Persist an extract(path, *params) -> dict result for an image file
+
+    Re-running a generator on the same wallpaper then skips decoding and
+    quantizing it. The key covers the resolved image path, its mtime and
+    size, the extra parameters and the calling script and color_utils
+    source files, so a replaced wallpaper or a changed --size re-extracts.
+    """
+    module_path = Path(sys.modules[extract.__module__].__file__)
+    sources = (module_path, Path(__file__))
+    cache_path = COLOR_CACHE_DIR / f"{module_path.stem}-{extract.__name__}.json"
+
+    @functools.wraps(extract)
+    def wrapper(path, *params) -> dict:
+        image_path = Path(path).resolve()
+        try:
+            image_stat = image_path.stat()
+        except OSError:
+            image_stat = None
+        if image_stat is None:
+            # Let extract() report the unreadable image
+            return extract(path, *params)
+        versions = _file_versions(sources)
+        key = [str(image_path), image_stat.st_mtime_ns, image_stat.st_size, list(params), versions]
+
+        try:
+            cached = read_json(cache_path)
+            if cached['key'] == key:
+                return cached['result']
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+        result = extract(path, *params)
+        try:
+            ensure_dir(COLOR_CACHE_DIR)
+            write_json(cache_path, {'key': key, 'result': result}, indent=False)
+        except OSError:
+            pass
+        return result
+
+    return wrapper
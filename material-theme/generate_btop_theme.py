@@ -3,22 +3,77 @@
 Btop Theme Generator
 Generates Btop system monitor configuration with Material You colors
 """
-from pathlib import Path
-from materialyoucolor.hct import Hct
-from materialyoucolor.utils.color_utils import rgba_from_argb, argb_from_rgb
-
-
-def hex_to_argb(hex_code: str) -> int:
-    """Convert hex color to ARGB integer"""
-    return argb_from_rgb(int(hex_code[1:3], 16), int(hex_code[3:5], 16), int(hex_code[5:], 16))
-
-
-def argb_to_hex(argb: int) -> str:
-    """Convert ARGB integer to hex color"""
-    rgba = rgba_from_argb(argb)
-    return "#{:02X}{:02X}{:02X}".format(*map(round, rgba))
+from color_utils import hct_from_hex, hct_spec_to_hex, HOME, ensure_dir, disk_cached
 
 
+# Btop palette, relative to the primary key color:
+# (name, hue offset, chroma multiplier, chroma cap, dark tone, light tone)
+BTOP_SPEC = (
+    # Title and highlight colors (selected items, active elements)
+    ('title',        0,   1.4, 80, 78, 38),
+    ('hi_fg',        5,   1.5, 85, 85, 30),
+    # Inactive/disabled text
+    ('inactive_fg',  0,   0.3, float('inf'), 55, 60),
+    # Process misc info
+    ('proc_misc',    -10, 1.2, 70, 70, 45),
+    # CPU colors - gradient from cool to warm purples (low, medium, high usage)
+    ('cpu_box',      0,   1.3, 75, 65, 50),
+    ('cpu_start',    20,  1.1, 60, 68, 48),
+    ('cpu_mid',      0,   1.4, 75, 72, 42),
+    ('cpu_end',      -15, 1.5, 85, 75, 38),
+    # Memory colors - cooler purple tones
+    ('mem_box',      15,  1.2, 70, 65, 50),
+    ('mem_start',    25,  1.0, 55, 65, 50),
+    ('mem_mid',      15,  1.3, 70, 70, 45),
+    ('mem_end',      5,   1.5, 80, 75, 40),
+    # Network colors - cyan-purple tones
+    ('net_box',      140, 1.2, 70, 65, 50),
+    ('net_download', 150, 1.3, 75, 72, 42),
+    ('net_upload',   130, 1.3, 75, 70, 45),
+    # Disk colors - warm purple tones
+    ('disk_box',     30,  1.2, 70, 65, 50),
+    ('disk_start',   40,  1.1, 60, 65, 50),
+    ('disk_mid',     30,  1.3, 70, 70, 45),
+    ('disk_end',     20,  1.5, 80, 75, 40),
+    # Meter background and divider lines
+    ('meter_bg',     0,   0.4, float('inf'), 20, 85),
+    ('div_line',     0,   0.6, float('inf'), 35, 70),
+)
+
+
+# Btop theme keys that reuse another color: (theme key, source color)
+BTOP_ALIASES = (
+    ('selected_bg', 'cpu_start'),
+    ('selected_fg', 'hi_fg'),
+    ('proc_box', 'cpu_box'),
+    ('temp_start', 'cpu_start'),
+    ('temp_mid', 'cpu_mid'),
+    ('temp_end', 'cpu_end'),
+    ('free_start', 'mem_start'),
+    ('free_mid', 'mem_mid'),
+    ('free_end', 'mem_end'),
+    ('cached_start', 'mem_start'),
+    ('cached_mid', 'mem_mid'),
+    ('cached_end', 'mem_end'),
+    ('available_start', 'disk_start'),
+    ('available_mid', 'disk_mid'),
+    ('available_end', 'disk_end'),
+    ('used_start', 'cpu_start'),
+    ('used_mid', 'cpu_mid'),
+    ('used_end', 'cpu_end'),
+    ('download_start', 'net_download'),
+    ('download_mid', 'net_download'),
+    ('download_end', 'net_download'),
+    ('upload_start', 'net_upload'),
+    ('upload_mid', 'net_upload'),
+    ('upload_end', 'net_upload'),
+    ('process_start', 'cpu_start'),
+    ('process_mid', 'cpu_mid'),
+    ('process_end', 'cpu_end'),
+)
+
+
+@disk_cached
 def generate_btop_colors(material_colors: dict, term_colors: dict, darkmode: bool = True) -> dict:
     """
     Generate Btop color scheme
@@ -32,210 +87,133 @@ def generate_btop_colors(material_colors: dict, term_colors: dict, darkmode: boo
         Dict of Btop color definitions
     """
     # Get primary hue for consistency
-    primary_hct = Hct.from_int(hex_to_argb(material_colors['primary_paletteKeyColor']))
-    base_hue = primary_hct.hue
-    
-    btop_colors = {}
+    primary_hct = hct_from_hex(material_colors['primary_paletteKeyColor'])
     
     # Main background and foreground
-    btop_colors['main_bg'] = term_colors['term0']
-    btop_colors['main_fg'] = term_colors['term7']
-    
-    # Title
-    btop_colors['title'] = argb_to_hex(
-        Hct.from_hct(base_hue, min(primary_hct.chroma * 1.4, 80), 78 if darkmode else 38).to_int()
-    )
-    
-    # Highlight colors (selected items, active elements)
-    btop_colors['hi_fg'] = argb_to_hex(
-        Hct.from_hct(base_hue + 5, min(primary_hct.chroma * 1.5, 85), 85 if darkmode else 30).to_int()
-    )
-    
-    # Inactive/disabled text
-    btop_colors['inactive_fg'] = argb_to_hex(
-        Hct.from_hct(base_hue, primary_hct.chroma * 0.3, 55 if darkmode else 60).to_int()
-    )
-    
-    # Process states - create a gradient of purples
-    btop_colors['proc_misc'] = argb_to_hex(  # Process misc info
-        Hct.from_hct(base_hue - 10, min(primary_hct.chroma * 1.2, 70), 70 if darkmode else 45).to_int()
-    )
+    btop_colors = {
+        'main_bg': term_colors['term0'],
+        'main_fg': term_colors['term7'],
+        'graph_text': term_colors['term7'],
+    }
     
-    # CPU colors - gradient from cool to warm purples
-    btop_colors['cpu_box'] = argb_to_hex(
-        Hct.from_hct(base_hue, min(primary_hct.chroma * 1.3, 75), 65 if darkmode else 50).to_int()
-    )
-    btop_colors['cpu_start'] = argb_to_hex(  # Low usage
-        Hct.from_hct(base_hue + 20, min(primary_hct.chroma * 1.1, 60), 68 if darkmode else 48).to_int()
-    )
-    btop_colors['cpu_mid'] = argb_to_hex(  # Medium usage
-        Hct.from_hct(base_hue, min(primary_hct.chroma * 1.4, 75), 72 if darkmode else 42).to_int()
-    )
-    btop_colors['cpu_end'] = argb_to_hex(  # High usage
-        Hct.from_hct(base_hue - 15, min(primary_hct.chroma * 1.5, 85), 75 if darkmode else 38).to_int()
-    )
+    # All derived colors are solved in one batch
+    btop_colors.update(hct_spec_to_hex(BTOP_SPEC, primary_hct.hue, primary_hct.chroma, darkmode))
     
-    # Memory colors - cooler purple tones
-    btop_colors['mem_box'] = argb_to_hex(
-        Hct.from_hct(base_hue + 15, min(primary_hct.chroma * 1.2, 70), 65 if darkmode else 50).to_int()
-    )
-    btop_colors['mem_start'] = argb_to_hex(
-        Hct.from_hct(base_hue + 25, min(primary_hct.chroma * 1.0, 55), 65 if darkmode else 50).to_int()
-    )
-    btop_colors['mem_mid'] = argb_to_hex(
-        Hct.from_hct(base_hue + 15, min(primary_hct.chroma * 1.3, 70), 70 if darkmode else 45).to_int()
-    )
-    btop_colors['mem_end'] = argb_to_hex(
-        Hct.from_hct(base_hue + 5, min(primary_hct.chroma * 1.5, 80), 75 if darkmode else 40).to_int()
-    )
-    
-    # Network colors - cyan-purple tones
-    btop_colors['net_box'] = argb_to_hex(
-        Hct.from_hct(base_hue + 140, min(primary_hct.chroma * 1.2, 70), 65 if darkmode else 50).to_int()
-    )
-    btop_colors['net_download'] = argb_to_hex(
-        Hct.from_hct(base_hue + 150, min(primary_hct.chroma * 1.3, 75), 72 if darkmode else 42).to_int()
-    )
-    btop_colors['net_upload'] = argb_to_hex(
-        Hct.from_hct(base_hue + 130, min(primary_hct.chroma * 1.3, 75), 70 if darkmode else 45).to_int()
-    )
-    
-    # Disk colors - warm purple tones
-    btop_colors['disk_box'] = argb_to_hex(
-        Hct.from_hct(base_hue + 30, min(primary_hct.chroma * 1.2, 70), 65 if darkmode else 50).to_int()
-    )
-    btop_colors['disk_start'] = argb_to_hex(
-        Hct.from_hct(base_hue + 40, min(primary_hct.chroma * 1.1, 60), 65 if darkmode else 50).to_int()
-    )
-    btop_colors['disk_mid'] = argb_to_hex(
-        Hct.from_hct(base_hue + 30, min(primary_hct.chroma * 1.3, 70), 70 if darkmode else 45).to_int()
-    )
-    btop_colors['disk_end'] = argb_to_hex(
-        Hct.from_hct(base_hue + 20, min(primary_hct.chroma * 1.5, 80), 75 if darkmode else 40).to_int()
-    )
-    
-    # Graph colors - various purple shades
-    btop_colors['graph_text'] = term_colors['term7']
-    
-    # Meter background
-    btop_colors['meter_bg'] = argb_to_hex(
-        Hct.from_hct(base_hue, primary_hct.chroma * 0.4, 20 if darkmode else 85).to_int()
-    )
-    
-    # Divider lines
-    btop_colors['div_line'] = argb_to_hex(
-        Hct.from_hct(base_hue, primary_hct.chroma * 0.6, 35 if darkmode else 70).to_int()
-    )
+    for alias, source in BTOP_ALIASES:
+        btop_colors[alias] = btop_colors[source]
     
     return btop_colors
 
 
-def write_btop_theme(btop_colors: dict, output_path: str = None, debug: bool = False) -> str:
-    """
-    Write Btop theme configuration file
-
-    Args:
-        btop_colors: Dict of Btop color definitions
-        output_path: Optional custom output path
-        debug: Enable debug output
-
-    Returns:
-        Path to the written config file
-    """
-    if output_path is None:
-        btop_config_dir = Path.home() / '.config' / 'btop' / 'themes'
-        btop_config_dir.mkdir(parents=True, exist_ok=True)
-        output_path = str(btop_config_dir / 'material-you.theme')
-    
-    # Btop uses a specific theme format
-    theme_content = f'''# Auto-generated Btop theme (Material You)
+# Btop theme file; each theme[key] is filled from btop_colors[key]
+_BTOP_TEMPLATE = '''# Auto-generated Btop theme (Material You)
 # Main background, empty for terminal default, need to be empty if you want transparent background
-theme[main_bg]="{btop_colors['main_bg']}"
+theme[main_bg]="{main_bg}"
 
 # Main text color
-theme[main_fg]="{btop_colors['main_fg']}"
+theme[main_fg]="{main_fg}"
 
 # Title color for boxes
-theme[title]="{btop_colors['title']}"
+theme[title]="{title}"
 
 # Highlight color for keyboard shortcuts
-theme[hi_fg]="{btop_colors['hi_fg']}"
+theme[hi_fg]="{hi_fg}"
 
 # Background color of selected item in processes box
-theme[selected_bg]="{btop_colors['cpu_start']}"
+theme[selected_bg]="{selected_bg}"
 
 # Foreground color of selected item in processes box
-theme[selected_fg]="{btop_colors['hi_fg']}"
+theme[selected_fg]="{selected_fg}"
 
 # Color of inactive/disabled text
-theme[inactive_fg]="{btop_colors['inactive_fg']}"
+theme[inactive_fg]="{inactive_fg}"
 
 # Color of text appearing on top of graphs, i.e. uptime and current network graph scaling
-theme[graph_text]="{btop_colors['graph_text']}"
+theme[graph_text]="{graph_text}"
 
 # Background color of the percentage meters
-theme[meter_bg]="{btop_colors['meter_bg']}"
+theme[meter_bg]="{meter_bg}"
 
 # Misc colors for processes box including mini cpu graphs, details memory graph and details status text
-theme[proc_misc]="{btop_colors['proc_misc']}"
+theme[proc_misc]="{proc_misc}"
 
 # CPU, Memory, Network and Proc box outline colors
-theme[cpu_box]="{btop_colors['cpu_box']}"
-theme[mem_box]="{btop_colors['mem_box']}"
-theme[net_box]="{btop_colors['net_box']}"
-theme[proc_box]="{btop_colors['cpu_box']}"
+theme[cpu_box]="{cpu_box}"
+theme[mem_box]="{mem_box}"
+theme[net_box]="{net_box}"
+theme[proc_box]="{proc_box}"
 
 # Box divider line and small boxes line color
-theme[div_line]="{btop_colors['div_line']}"
+theme[div_line]="{div_line}"
 
 # Temperature graph color (Green -> Yellow -> Red)
-theme[temp_start]="{btop_colors['cpu_start']}"
-theme[temp_mid]="{btop_colors['cpu_mid']}"
-theme[temp_end]="{btop_colors['cpu_end']}"
+theme[temp_start]="{temp_start}"
+theme[temp_mid]="{temp_mid}"
+theme[temp_end]="{temp_end}"
 
 # CPU graph colors (Teal -> Lavender)
-theme[cpu_start]="{btop_colors['cpu_start']}"
-theme[cpu_mid]="{btop_colors['cpu_mid']}"
-theme[cpu_end]="{btop_colors['cpu_end']}"
+theme[cpu_start]="{cpu_start}"
+theme[cpu_mid]="{cpu_mid}"
+theme[cpu_end]="{cpu_end}"
 
 # Mem/Disk free meter (Mauve -> Lavender -> Blue)
-theme[free_start]="{btop_colors['mem_start']}"
-theme[free_mid]="{btop_colors['mem_mid']}"
-theme[free_end]="{btop_colors['mem_end']}"
+theme[free_start]="{free_start}"
+theme[free_mid]="{free_mid}"
+theme[free_end]="{free_end}"
 
 # Mem/Disk cached meter (Sapphire -> Lavender)
-theme[cached_start]="{btop_colors['mem_start']}"
-theme[cached_mid]="{btop_colors['mem_mid']}"
-theme[cached_end]="{btop_colors['mem_end']}"
+theme[cached_start]="{cached_start}"
+theme[cached_mid]="{cached_mid}"
+theme[cached_end]="{cached_end}"
 
 # Mem/Disk available meter (Peach -> Red)
-theme[available_start]="{btop_colors['disk_start']}"
-theme[available_mid]="{btop_colors['disk_mid']}"
-theme[available_end]="{btop_colors['disk_end']}"
+theme[available_start]="{available_start}"
+theme[available_mid]="{available_mid}"
+theme[available_end]="{available_end}"
 
 # Mem/Disk used meter (Green -> Sky)
-theme[used_start]="{btop_colors['cpu_start']}"
-theme[used_mid]="{btop_colors['cpu_mid']}"
-theme[used_end]="{btop_colors['cpu_end']}"
+theme[used_start]="{used_start}"
+theme[used_mid]="{used_mid}"
+theme[used_end]="{used_end}"
 
 # Download graph colors (Peach -> Red)
-theme[download_start]="{btop_colors['net_download']}"
-theme[download_mid]="{btop_colors['net_download']}"
-theme[download_end]="{btop_colors['net_download']}"
+theme[download_start]="{download_start}"
+theme[download_mid]="{download_mid}"
+theme[download_end]="{download_end}"
 
 # Upload graph colors (Green -> Sky)
-theme[upload_start]="{btop_colors['net_upload']}"
-theme[upload_mid]="{btop_colors['net_upload']}"
-theme[upload_end]="{btop_colors['net_upload']}"
+theme[upload_start]="{upload_start}"
+theme[upload_mid]="{upload_mid}"
+theme[upload_end]="{upload_end}"
 
 # Process box color gradient for threads, mem and cpu usage (Sapphire -> Mauve)
-theme[process_start]="{btop_colors['cpu_start']}"
-theme[process_mid]="{btop_colors['cpu_mid']}"
-theme[process_end]="{btop_colors['cpu_end']}"
+theme[process_start]="{process_start}"
+theme[process_mid]="{process_mid}"
+theme[process_end]="{process_end}"
 '''
+
+
+def write_btop_theme(btop_colors: dict, output_path: str = None, debug: bool = False) -> str:
+    """
+    Write Btop theme configuration file
+
+    Args:
+        btop_colors: Dict of Btop color definitions
+        output_path: Optional custom output path
+        debug: Enable debug output
+
+    Returns:
+        Path to the written config file
+    """
+    if output_path is None:
+        btop_config_dir = ensure_dir(HOME / '.config' / 'btop' / 'themes')
+        output_path = str(btop_config_dir / 'material-you.theme')
+    
+    # Btop uses a specific theme format
+    theme_content = _BTOP_TEMPLATE.format_map(btop_colors)
     
-    with open(output_path, 'w') as f:
-        f.write(theme_content)
+    with open(output_path, 'wb') as f:
+        f.write(theme_content.encode())
     
     if debug:
         print(f"\nBtop theme written to: {output_path}")
@@ -1,8 +1,8 @@
 #!/usr/bin/env -S\_/bin/sh\_-c\_"source\_\$(eval\_echo\_\$ILLOGICAL_IMPULSE_VIRTUAL_ENV)/bin/activate&&exec\_python\_-E\_"\$0"\_"\$@""
 import argparse
-import math
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from PIL import Image
 
@@ -13,13 +13,16 @@ from generate_nvim_theme import generate_neovim_theme, write_neovim_colorscheme
 from generate_kitty_theme import write_kitty_colors
 from generate_lazygit_theme import generate_lazygit_colors, write_lazygit_config, configure_git_diff_colors
 from generate_yazi_theme import generate_yazi_colors, write_yazi_theme
+from color_utils import hex_to_argb, argb_to_hex, hct_from_argb, hct_from_hex, hct_to_argb, hct_array_to_argb, image_pixels, image_cached, load_scheme, dynamic_colors_to_argb
 from materialyoucolor.quantize import QuantizeCelebi
 from materialyoucolor.score.score import Score
-from materialyoucolor.hct import Hct
 from materialyoucolor.dynamiccolor.material_dynamic_colors import MaterialDynamicColors
-from materialyoucolor.utils.color_utils import (rgba_from_argb, argb_from_rgb, argb_from_rgba)
+from materialyoucolor.utils.color_utils import rgba_from_argb
 from materialyoucolor.utils.math_utils import (sanitize_degrees_double, difference_degrees, rotation_direction)
 
+# The dynamic color roles are fixed, so the class is scanned once
+_DYNAMIC_COLORS = tuple((name, dc) for name, dc in vars(MaterialDynamicColors).items() if hasattr(dc, 'get_hct'))
+
 parser = argparse.ArgumentParser(description='Color generation script')
 parser.add_argument('--path', type=str, default=None, help='generate colorscheme from image')
 parser.add_argument('--size', type=int , default=128 , help='bitmap image size')
@@ -47,36 +50,30 @@ parser.add_argument('--lazygit-output', type=str, default=None, help='custom out
 parser.add_argument('--yazi-output', type=str, default=None, help='custom output path for yazi theme')
 args = parser.parse_args()
 
-rgba_to_hex = lambda rgba: "#{:02X}{:02X}{:02X}".format(rgba[0], rgba[1], rgba[2])
-argb_to_hex = lambda argb: "#{:02X}{:02X}{:02X}".format(*map(round, rgba_from_argb(argb)))
-hex_to_argb = lambda hex_code: argb_from_rgb(int(hex_code[1:3], 16), int(hex_code[3:5], 16), int(hex_code[5:], 16))
-display_color = lambda rgba : "\x1B[38;2;{};{};{}m{}\x1B[0m".format(rgba[0], rgba[1], rgba[2], "\x1b[7m   \x1b[7m")
-
-def calculate_optimal_size (width: int, height: int, bitmap_size: int) -> (int, int):
-    image_area = width * height;
-    bitmap_area = bitmap_size ** 2
-    scale = math.sqrt(bitmap_area/image_area) if image_area > bitmap_area else 1
-    new_width = round(width * scale)
-    new_height = round(height * scale)
-    if new_width == 0:
-        new_width = 1
-    if new_height == 0:
-        new_height = 1
-    return new_width, new_height
+def display_color (rgba) -> str:
+    return "\x1B[38;2;%d;%d;%dm\x1b[7m   \x1b[7m\x1B[0m" % (rgba[0], rgba[1], rgba[2])
+
+# Per terminal color (chroma, dark mode tone, light mode tone)
+TERM_TARGETS = {
+    'term1': (90, 65, 50), 'term9': (90, 65, 50),    # Red
+    'term2': (95, 70, 45), 'term10': (95, 70, 45),   # Green
+    'term3': (90, 75, 55), 'term11': (90, 75, 55),   # Yellow
+    'term4': (95, 70, 50), 'term12': (95, 70, 50),   # Blue
+    'term5': (92, 68, 48), 'term13': (92, 68, 48),   # Magenta
+    'term6': (95, 72, 52), 'term14': (95, 72, 52),   # Cyan
+    'term7': (20, 85, 30),                           # Normal foreground
+    'term15': (30, 90, 25),                          # Bright foreground
+}
 
 def harmonize (design_color: int, source_color: int, threshold: float = 35, harmony: float = 0.5) -> int:
-    from_hct = Hct.from_int(design_color)
-    to_hct = Hct.from_int(source_color)
+    from_hct = hct_from_argb(design_color)
+    to_hct = hct_from_argb(source_color)
     difference_degrees_ = difference_degrees(from_hct.hue, to_hct.hue)
     rotation_degrees = min(difference_degrees_ * harmony, threshold)
     output_hue = sanitize_degrees_double(
         from_hct.hue + rotation_degrees * rotation_direction(from_hct.hue, to_hct.hue)
     )
-    return Hct.from_hct(output_hue, from_hct.chroma, from_hct.tone).to_int()
-
-def boost_chroma_tone (argb: int, chroma: float = 1, tone: float = 1) -> int:
-    hct = Hct.from_int(argb)
-    return Hct.from_hct(hct.hue, hct.chroma * chroma, hct.tone * tone).to_int()
+    return hct_to_argb(output_hue, from_hct.chroma, from_hct.tone)
 
 def convert_catppuccin_to_terminal_colors(catppuccin_colors: dict) -> dict:
     """Convert Catppuccin color scheme to terminal colors (term0-term15)"""
@@ -102,64 +99,52 @@ def convert_catppuccin_to_terminal_colors(catppuccin_colors: dict) -> dict:
 darkmode = (args.mode == 'dark')
 transparent = (args.transparency == 'transparent')
 
-if args.path is not None:
-    image = Image.open(args.path)
+@image_cached
+def extract_source_color (path, size):
+    image = Image.open(path)
 
     if image.format == "GIF":
         image.seek(1)
 
-    if image.mode in ["L", "P"]:
+    # Palette images have to be expanded before resampling. Grayscale is
+    # converted after thumbnail() instead, which keeps its JPEG draft decode
+    if image.mode == "P":
         image = image.convert('RGB')
     wsize, hsize = image.size
-    wsize_new, hsize_new = calculate_optimal_size(wsize, hsize, args.size)
-    if wsize_new < wsize or hsize_new < hsize:
-        image = image.resize((wsize_new, hsize_new), Image.Resampling.BICUBIC)
-    colors = QuantizeCelebi(list(image.getdata()), 128)
-    argb = Score.score(colors)[0]
+    # The quantizer only needs the color distribution, so a box average
+    # is enough; thumbnail() is a no-op for images already within bounds
+    image.thumbnail((size, size), Image.Resampling.BOX)
+    if image.mode == "L":
+        image = image.convert('RGB')
+    colors = QuantizeCelebi(image_pixels(image), 128)
+    return {'argb': Score.score(colors)[0], 'size': [wsize, hsize], 'resized': list(image.size)}
+
+if args.path is not None:
+    # Cached per wallpaper, so re-applying one skips decoding and quantizing
+    source = extract_source_color(args.path, args.size)
+    argb = source['argb']
+    wsize, hsize = source['size']
+    wsize_new, hsize_new = source['resized']
 
     if args.cache is not None:
         with open(args.cache, 'w') as file:
             file.write(argb_to_hex(argb))
-    hct = Hct.from_int(argb)
+    hct = hct_from_argb(argb)
     if(args.smart):
         if(hct.chroma < 20):
             args.scheme = 'neutral'
 elif args.color is not None:
     argb = hex_to_argb(args.color)
-    hct = Hct.from_int(argb)
-
-if args.scheme == 'scheme-fruit-salad':
-    from materialyoucolor.scheme.scheme_fruit_salad import SchemeFruitSalad as Scheme
-elif args.scheme == 'scheme-expressive':
-    from materialyoucolor.scheme.scheme_expressive import SchemeExpressive as Scheme
-elif args.scheme == 'scheme-monochrome':
-    from materialyoucolor.scheme.scheme_monochrome import SchemeMonochrome as Scheme
-elif args.scheme == 'scheme-rainbow':
-    from materialyoucolor.scheme.scheme_rainbow import SchemeRainbow as Scheme
-elif args.scheme == 'scheme-tonal-spot':
-    from materialyoucolor.scheme.scheme_tonal_spot import SchemeTonalSpot as Scheme
-elif args.scheme == 'scheme-neutral':
-    from materialyoucolor.scheme.scheme_neutral import SchemeNeutral as Scheme
-elif args.scheme == 'scheme-fidelity':
-    from materialyoucolor.scheme.scheme_fidelity import SchemeFidelity as Scheme
-elif args.scheme == 'scheme-content':
-    from materialyoucolor.scheme.scheme_content import SchemeContent as Scheme
-elif args.scheme == 'scheme-vibrant':
-    from materialyoucolor.scheme.scheme_vibrant import SchemeVibrant as Scheme
-else:
-    from materialyoucolor.scheme.scheme_tonal_spot import SchemeTonalSpot as Scheme
+    hct = hct_from_argb(argb)
+
+Scheme = load_scheme(args.scheme)
 # Generate
 scheme = Scheme(hct, darkmode, 0.0)
 
-material_colors = {}
+material_argb = dynamic_colors_to_argb(_DYNAMIC_COLORS, scheme)
+material_colors = {color: argb_to_hex(code) for color, code in material_argb.items()}
 term_colors = {}
 
-for color in vars(MaterialDynamicColors).keys():
-    color_name = getattr(MaterialDynamicColors, color)
-    if hasattr(color_name, "get_hct"):
-        rgba = color_name.get_hct(scheme).to_rgba()
-        material_colors[color] = rgba_to_hex(rgba)
-
 # Extended material
 if darkmode == True:
     material_colors['success'] = '#B5CCBA'
@@ -192,6 +177,7 @@ if args.termscheme is not None:
     base_hue = accent_hct.hue
     base_chroma = accent_hct.chroma
 
+    batch_names, batch_hues, batch_chromas, batch_tones = [], [], [], []
     for color, val in term_source_colors.items():
         if(args.scheme == 'monochrome') :
             term_colors[color] = val
@@ -200,19 +186,22 @@ if args.termscheme is not None:
             # Generate background directly from wallpaper (like old script)
             if args.blend_bg_fg:
                 # Instead of using potentially gray surfaceContainerLow, generate from wallpaper
-                bg_hct = Hct.from_hct(base_hue, min(base_chroma * 0.6, 25), 8).to_int()
-                harmonized = boost_chroma_tone(bg_hct, 1.2, 0.95)
+                # The boost is relative to the solved color, which may have
+                # less chroma than requested at this tone
+                bg_hct = hct_from_argb(hct_to_argb(base_hue, min(base_chroma * 0.6, 25), 8))
+                harmonized = hct_to_argb(bg_hct.hue, bg_hct.chroma * 1.2, bg_hct.tone * 0.95)
             else:
                 # Create dark background with wallpaper's hue
-                harmonized = Hct.from_hct(base_hue, min(base_chroma * 0.6, 25), 6).to_int()
+                harmonized = hct_to_argb(base_hue, min(base_chroma * 0.6, 25), 6)
         elif color == "term8":
             # Bright black / secondary background - slightly lighter than term0
-            harmonized = Hct.from_hct(base_hue, min(base_chroma * 0.5, 20), 15).to_int()
+            harmonized = hct_to_argb(base_hue, min(base_chroma * 0.5, 20), 15)
         elif args.blend_bg_fg and color == "term15":
-            harmonized = boost_chroma_tone(hex_to_argb(material_colors['onSurface']), 3, 1)
+            on_surface_hct = hct_from_argb(material_argb['onSurface'])
+            harmonized = hct_to_argb(on_surface_hct.hue, on_surface_hct.chroma * 3, on_surface_hct.tone)
         else:
             # Get the source color's properties
-            source_hct = Hct.from_int(hex_to_argb(val))
+            source_hct = hct_from_hex(val)
 
             # IMPROVED: Stronger harmonization toward wallpaper hue
             # Calculate the hue difference and rotate more aggressively
@@ -233,30 +222,9 @@ if args.termscheme is not None:
 
             # FORCE MAXIMUM SATURATION: Set absolute chroma values per color
             # This overrides source colors completely for vibrant results
-            if color in ['term1', 'term9']:  # Red
-                target_chroma = 90
-                target_tone = 65 if darkmode else 50  # Optimal tone for vibrant red
-            elif color in ['term2', 'term10']:  # Green
-                target_chroma = 95
-                target_tone = 70 if darkmode else 45  # Optimal tone for vibrant green
-            elif color in ['term3', 'term11']:  # Yellow
-                target_chroma = 90
-                target_tone = 75 if darkmode else 55  # Optimal tone for vibrant yellow
-            elif color in ['term4', 'term12']:  # Blue
-                target_chroma = 95
-                target_tone = 70 if darkmode else 50  # Optimal tone for vibrant blue
-            elif color in ['term5', 'term13']:  # Magenta
-                target_chroma = 92
-                target_tone = 68 if darkmode else 48  # Optimal tone for vibrant magenta
-            elif color in ['term6', 'term14']:  # Cyan
-                target_chroma = 95
-                target_tone = 72 if darkmode else 52  # Optimal tone for vibrant cyan
-            elif color in ['term7']:  # Normal foreground
-                target_chroma = 20
-                target_tone = 85 if darkmode else 30
-            elif color in ['term15']:  # Bright foreground
-                target_chroma = 30
-                target_tone = 90 if darkmode else 25
+            if color in TERM_TARGETS:
+                target_chroma, tone_dark, tone_light = TERM_TARGETS[color]
+                target_tone = tone_dark if darkmode else tone_light
             else:
                 target_chroma = 90
                 target_tone = source_hct.tone
@@ -265,11 +233,21 @@ if args.termscheme is not None:
             if color in ['term7', 'term15']:
                 target_tone = target_tone * (1 + (args.term_fg_boost * (1 if darkmode else -1)))
 
-            harmonized = Hct.from_hct(target_hue, target_chroma, target_tone).to_int()
+            # Solved together with the other harmonized colors below, the
+            # placeholder keeps term_colors in source order
+            batch_names.append(color)
+            batch_hues.append(target_hue)
+            batch_chromas.append(target_chroma)
+            batch_tones.append(target_tone)
+            term_colors[color] = None
+            continue
+        term_colors[color] = argb_to_hex(harmonized)
+
+    for color, harmonized in zip(batch_names, hct_array_to_argb(batch_hues, batch_chromas, batch_tones)):
         term_colors[color] = argb_to_hex(harmonized)
 
 # Generate theme files if requested
-if args.generate_all or args.generate_nvim:
+def run_nvim():
     if args.debug:
         print('\n---------------Generating Neovim theme---------')
     nvim_theme = generate_neovim_theme(material_colors, term_colors, transparent, None, args.debug)
@@ -277,69 +255,77 @@ if args.generate_all or args.generate_nvim:
     if args.debug:
         print(f'Neovim theme written to: {nvim_path}')
 
-if args.generate_all or args.generate_kitty:
-    if term_colors:
-        if args.debug:
-            print('\n---------------Generating Kitty theme----------')
-        kitty_path = write_kitty_colors(term_colors, args.kitty_output, args.debug)
-        if args.debug:
-            print(f'Kitty theme written to: {kitty_path}')
-    else:
-        if args.debug:
-            print('Warning: No terminal colors generated. Use --termscheme to generate Kitty theme.')
+def run_kitty():
+    if args.debug:
+        print('\n---------------Generating Kitty theme----------')
+    kitty_path = write_kitty_colors(term_colors, args.kitty_output, args.debug)
+    if args.debug:
+        print(f'Kitty theme written to: {kitty_path}')
 
-if args.generate_all or args.generate_lazygit:
-    if term_colors:
-        if args.debug:
-            print('\n---------------Generating LazyGit theme--------')
-        lazygit_colors = generate_lazygit_colors(material_colors, term_colors, darkmode)
-        lazygit_path = write_lazygit_config(lazygit_colors, args.lazygit_output, args.debug)
-        configure_git_diff_colors(lazygit_colors, term_colors, args.debug)
-        if args.debug:
-            print(f'LazyGit theme written to: {lazygit_path}')
-    else:
-        if args.debug:
-            print('Warning: No terminal colors generated. Use --termscheme to generate LazyGit theme.')
+def run_lazygit():
+    if args.debug:
+        print('\n---------------Generating LazyGit theme--------')
+    lazygit_colors = generate_lazygit_colors(material_colors, term_colors, darkmode)
+    lazygit_path = write_lazygit_config(lazygit_colors, args.lazygit_output, args.debug)
+    configure_git_diff_colors(lazygit_colors, term_colors, args.debug)
+    if args.debug:
+        print(f'LazyGit theme written to: {lazygit_path}')
 
-if args.generate_all or args.generate_yazi:
-    if term_colors:
-        if args.debug:
-            print('\n---------------Generating Yazi theme-----------')
-        yazi_colors = generate_yazi_colors(material_colors, term_colors, darkmode)
-        yazi_path = write_yazi_theme(yazi_colors, args.yazi_output, args.debug)
-        if args.debug:
-            print(f'Yazi theme written to: {yazi_path}')
-    else:
-        if args.debug:
-            print('Warning: No terminal colors generated. Use --termscheme to generate Yazi theme.')
+def run_yazi():
+    if args.debug:
+        print('\n---------------Generating Yazi theme-----------')
+    yazi_colors = generate_yazi_colors(material_colors, term_colors, darkmode)
+    yazi_path = write_yazi_theme(yazi_colors, args.yazi_output, args.debug)
+    if args.debug:
+        print(f'Yazi theme written to: {yazi_path}')
 
-# Original output
+theme_jobs = []
+if args.generate_all or args.generate_nvim:
+    theme_jobs.append(run_nvim)
+for enabled, job, name in (
+    (args.generate_kitty, run_kitty, 'Kitty'),
+    (args.generate_lazygit, run_lazygit, 'LazyGit'),
+    (args.generate_yazi, run_yazi, 'Yazi'),
+):
+    if args.generate_all or enabled:
+        if term_colors:
+            theme_jobs.append(job)
+        elif args.debug:
+            print(f'Warning: No terminal colors generated. Use --termscheme to generate {name} theme.')
+
+# The generators write independent files, so overlap their file and git IO.
+# With --debug run them one at a time to keep the output in order.
+if theme_jobs:
+    with ThreadPoolExecutor(max_workers=1 if args.debug else len(theme_jobs)) as executor:
+        for future in [executor.submit(job) for job in theme_jobs]:
+            future.result()
+
+# Original output, written at once instead of a print per line
 if args.debug == False:
-    print(f"$darkmode: {darkmode};")
-    print(f"$transparent: {transparent};")
-    for color, code in material_colors.items():
-        print(f"${color}: {code};")
-    for color, code in term_colors.items():
-        print(f"${color}: {code};")
+    out = [f"$darkmode: {darkmode};", f"$transparent: {transparent};"]
+    out.extend(f"${color}: {code};" for color, code in material_colors.items())
+    out.extend(f"${color}: {code};" for color, code in term_colors.items())
 else:
+    out = []
     if args.path is not None:
-        print('\n--------------Image properties-----------------')
-        print(f"Image size: {wsize} x {hsize}")
-        print(f"Resized image: {wsize_new} x {hsize_new}")
-    print('\n---------------Selected color------------------')
-    print(f"Dark mode: {darkmode}")
-    print(f"Scheme: {args.scheme}")
-    print(f"Accent color: {display_color(rgba_from_argb(argb))} {argb_to_hex(argb)}")
-    print(f"HCT: {hct.hue:.2f}  {hct.chroma:.2f}  {hct.tone:.2f}")
-    print('\n---------------Material colors-----------------')
+        out.append('\n--------------Image properties-----------------')
+        out.append(f"Image size: {wsize} x {hsize}")
+        out.append(f"Resized image: {wsize_new} x {hsize_new}")
+    out.append('\n---------------Selected color------------------')
+    out.append(f"Dark mode: {darkmode}")
+    out.append(f"Scheme: {args.scheme}")
+    out.append(f"Accent color: {display_color(rgba_from_argb(argb))} {argb_to_hex(argb)}")
+    out.append(f"HCT: {hct.hue:.2f}  {hct.chroma:.2f}  {hct.tone:.2f}")
+    out.append('\n---------------Material colors-----------------')
     for color, code in material_colors.items():
         rgba = rgba_from_argb(hex_to_argb(code))
-        print(f"{color.ljust(32)} : {display_color(rgba)}  {code}")
+        out.append(f"{color.ljust(32)} : {display_color(rgba)}  {code}")
     if term_colors:
-        print('\n----------Harmonize terminal colors------------')
+        out.append('\n----------Harmonize terminal colors------------')
         for color, code in term_colors.items():
             rgba = rgba_from_argb(hex_to_argb(code))
             code_source = term_source_colors[color]
             rgba_source = rgba_from_argb(hex_to_argb(code_source))
-            print(f"{color.ljust(6)} : {display_color(rgba_source)} {code_source} --> {display_color(rgba)} {code}")
-    print('-----------------------------------------------')
+            out.append(f"{color.ljust(6)} : {display_color(rgba_source)} {code_source} --> {display_color(rgba)} {code}")
+    out.append('-----------------------------------------------')
+sys.stdout.write('\n'.join(out) + '\n')
@@ -3,33 +3,46 @@
 Fish Shell Theme Generator
 Generates Fish shell color configuration with Material You colors
 """
-from pathlib import Path
-from materialyoucolor.hct import Hct
-from materialyoucolor.utils.color_utils import rgba_from_argb, argb_from_rgb
+from color_utils import hct_from_hex, hex_to_rgb, hct_spec_to_hex, HOME, ensure_dir, disk_cached
 
 
-def hex_to_argb(hex_code: str) -> int:
-    """Convert hex color to ARGB integer"""
-    return argb_from_rgb(int(hex_code[1:3], 16), int(hex_code[3:5], 16), int(hex_code[5:], 16))
-
-
-def argb_to_hex(argb: int) -> str:
-    """Convert ARGB integer to hex color"""
-    rgba = rgba_from_argb(argb)
-    return "#{:02X}{:02X}{:02X}".format(*map(round, rgba))
-
-
-def hex_to_rgb(hex_code: str) -> str:
-    """Convert hex color to RGB values for fish"""
-    # Remove the # if present
-    hex_code = hex_code.lstrip('#')
-    # Convert to RGB
-    r = int(hex_code[0:2], 16)
-    g = int(hex_code[2:4], 16)
-    b = int(hex_code[4:6], 16)
-    return f"{r:02x}{g:02x}{b:02x}"
+# Fish palette, relative to the primary key color:
+# (name, hue offset, chroma multiplier, chroma cap, dark tone, light tone)
+FISH_SPEC = (
+    # Command colors (what you type)
+    ('command',           0,   1.4, 80, 75, 40),
+    # Keywords (if, else, end, etc.)
+    ('keyword',           -10, 1.5, 85, 78, 38),
+    # Quotes (strings)
+    ('quote',             25,  1.2, 70, 72, 42),
+    # Redirection (>, <, |, etc.)
+    ('redirection',       15,  1.3, 75, 70, 45),
+    # End of command (;, &, etc.)
+    ('end',               -5,  1.2, 70, 68, 47),
+    # Errors
+    ('error',             200, 1.4, 80, 72, 42),
+    # Comments
+    ('comment',           0,   0.5, float('inf'), 50, 65),
+    # Selection background
+    ('selection_bg',      0,   1.3, 60, 22, 82),
+    # Operators (+, -, *, /, =, etc.)
+    ('operator',          10,  1.3, 75, 73, 43),
+    # Escape sequences (\n, \t, etc.)
+    ('escape',            140, 1.2, 70, 70, 45),
+    # Autosuggestions (grayed out suggestions)
+    ('autosuggestion',    0,   0.3, float('inf'), 45, 70),
+    # Valid paths
+    ('valid_path',        5,   1.1, 65, 72, 43),
+    # Search match
+    ('search_match',      30,  1.4, 80, 75, 40),
+    # Pager (completion menu) colors
+    ('pager_prefix',      0,   1.5, 85, 78, 38),
+    ('pager_description', 0,   0.6, float('inf'), 60, 55),
+    ('pager_progress',    20,  1.3, 75, 70, 45),
+)
 
 
+@disk_cached
 def generate_fish_colors(material_colors: dict, term_colors: dict, darkmode: bool = True) -> dict:
     """
     Generate Fish shell color scheme
@@ -43,98 +56,71 @@ def generate_fish_colors(material_colors: dict, term_colors: dict, darkmode: boo
         Dict of Fish color definitions
     """
     # Get primary hue for consistency
-    primary_hct = Hct.from_int(hex_to_argb(material_colors['primary_paletteKeyColor']))
-    base_hue = primary_hct.hue
+    primary_hct = hct_from_hex(material_colors['primary_paletteKeyColor'])
     
-    fish_colors = {}
+    fish_colors = hct_spec_to_hex(FISH_SPEC, primary_hct.hue, primary_hct.chroma, darkmode)
     
-    # Normal text colors
+    # Normal text, parameters/arguments and pager completions
     fish_colors['normal'] = term_colors['term7']
-    
-    # Command colors (what you type)
-    fish_colors['command'] = argb_to_hex(
-        Hct.from_hct(base_hue, min(primary_hct.chroma * 1.4, 80), 75 if darkmode else 40).to_int()
-    )
-    
-    # Keywords (if, else, end, etc.)
-    fish_colors['keyword'] = argb_to_hex(
-        Hct.from_hct(base_hue - 10, min(primary_hct.chroma * 1.5, 85), 78 if darkmode else 38).to_int()
-    )
-    
-    # Quotes (strings)
-    fish_colors['quote'] = argb_to_hex(
-        Hct.from_hct(base_hue + 25, min(primary_hct.chroma * 1.2, 70), 72 if darkmode else 42).to_int()
-    )
-    
-    # Redirection (>, <, |, etc.)
-    fish_colors['redirection'] = argb_to_hex(
-        Hct.from_hct(base_hue + 15, min(primary_hct.chroma * 1.3, 75), 70 if darkmode else 45).to_int()
-    )
-    
-    # End of command (;, &, etc.)
-    fish_colors['end'] = argb_to_hex(
-        Hct.from_hct(base_hue - 5, min(primary_hct.chroma * 1.2, 70), 68 if darkmode else 47).to_int()
-    )
-    
-    # Errors
-    fish_colors['error'] = argb_to_hex(
-        Hct.from_hct((base_hue + 200) % 360, min(primary_hct.chroma * 1.4, 80), 72 if darkmode else 42).to_int()
-    )
-    
-    # Parameters/arguments
     fish_colors['param'] = term_colors['term7']
-    
-    # Comments
-    fish_colors['comment'] = argb_to_hex(
-        Hct.from_hct(base_hue, primary_hct.chroma * 0.5, 50 if darkmode else 65).to_int()
-    )
-    
-    # Selection background
-    fish_colors['selection_bg'] = argb_to_hex(
-        Hct.from_hct(base_hue, min(primary_hct.chroma * 1.3, 60), 22 if darkmode else 82).to_int()
-    )
-    
-    # Operators (+, -, *, /, =, etc.)
-    fish_colors['operator'] = argb_to_hex(
-        Hct.from_hct(base_hue + 10, min(primary_hct.chroma * 1.3, 75), 73 if darkmode else 43).to_int()
-    )
-    
-    # Escape sequences (\n, \t, etc.)
-    fish_colors['escape'] = argb_to_hex(
-        Hct.from_hct(base_hue + 140, min(primary_hct.chroma * 1.2, 70), 70 if darkmode else 45).to_int()
-    )
-    
-    # Autosuggestions (grayed out suggestions)
-    fish_colors['autosuggestion'] = argb_to_hex(
-        Hct.from_hct(base_hue, primary_hct.chroma * 0.3, 45 if darkmode else 70).to_int()
-    )
-    
-    # Valid paths
-    fish_colors['valid_path'] = argb_to_hex(
-        Hct.from_hct(base_hue + 5, min(primary_hct.chroma * 1.1, 65), 72 if darkmode else 43).to_int()
-    )
-    
-    # Search match
-    fish_colors['search_match'] = argb_to_hex(
-        Hct.from_hct(base_hue + 30, min(primary_hct.chroma * 1.4, 80), 75 if darkmode else 40).to_int()
-    )
-    
-    # Pager (completion menu) colors
-    fish_colors['pager_prefix'] = argb_to_hex(
-        Hct.from_hct(base_hue, min(primary_hct.chroma * 1.5, 85), 78 if darkmode else 38).to_int()
-    )
     fish_colors['pager_completion'] = term_colors['term7']
-    fish_colors['pager_description'] = argb_to_hex(
-        Hct.from_hct(base_hue, primary_hct.chroma * 0.6, 60 if darkmode else 55).to_int()
-    )
-    fish_colors['pager_progress'] = argb_to_hex(
-        Hct.from_hct(base_hue + 20, min(primary_hct.chroma * 1.3, 75), 70 if darkmode else 45).to_int()
-    )
     fish_colors['pager_selected_bg'] = fish_colors['selection_bg']
     
     return fish_colors
 
 
+# Fish theme file; placeholders are fish_colors keys
+_FISH_THEME_TEMPLATE = '''# Auto-generated Fish shell colors (Material You theme)
+# This file is sourced automatically by fish
+
+# IMPORTANT: Use -U (universal) to override any existing universal variables
+# This ensures the theme takes effect even if colors were previously set with -U
+
+# Syntax highlighting colors
+set -U fish_color_normal {normal}
+set -U fish_color_command {command}
+set -U fish_color_keyword {keyword}
+set -U fish_color_quote {quote}
+set -U fish_color_redirection {redirection}
+set -U fish_color_end {end}
+set -U fish_color_error {error}
+set -U fish_color_param {param}
+set -U fish_color_comment {comment}
+set -U fish_color_selection --background={selection_bg}
+set -U fish_color_operator {operator}
+set -U fish_color_escape {escape}
+set -U fish_color_autosuggestion {autosuggestion}
+set -U fish_color_valid_path {valid_path} --underline
+set -U fish_color_search_match --background={search_match}
+
+# Pager (completion menu) colors
+set -U fish_pager_color_prefix {pager_prefix} --bold
+set -U fish_pager_color_completion {pager_completion}
+set -U fish_pager_color_description {pager_description}
+set -U fish_pager_color_progress {pager_progress}
+set -U fish_pager_color_selected_background --background={pager_selected_bg}
+
+# Additional useful colors
+set -U fish_color_cancel {error}
+set -U fish_color_cwd {command}
+set -U fish_color_cwd_root {error}
+set -U fish_color_history_current {search_match} --bold
+set -U fish_color_host {quote}
+set -U fish_color_host_remote {quote}
+set -U fish_color_match {search_match}
+set -U fish_color_user {command}
+
+# Export global variables for custom prompts to use
+# These match your current prompt's color scheme
+set -U material_prompt_bracket {keyword}
+set -U material_prompt_username {command}
+set -U material_prompt_hostname {quote}
+set -U material_prompt_path {redirection}
+set -U material_prompt_git {quote}
+set -U material_prompt_arrow {keyword}
+'''
+
+
 def write_fish_theme(fish_colors: dict, output_path: str = None, debug: bool = False) -> str:
     """
     Write Fish shell theme configuration file
@@ -148,65 +134,16 @@ def write_fish_theme(fish_colors: dict, output_path: str = None, debug: bool = F
         Path to the written config file
     """
     if output_path is None:
-        fish_config_dir = Path.home() / '.config' / 'fish' / 'conf.d'
-        fish_config_dir.mkdir(parents=True, exist_ok=True)
+        fish_config_dir = ensure_dir(HOME / '.config' / 'fish' / 'conf.d')
         output_path = str(fish_config_dir / 'material_you_colors.fish')
     
     # Convert all colors to fish RGB format (without #)
     fish_rgb = {k: hex_to_rgb(v) for k, v in fish_colors.items()}
     
-    theme_content = f'''# Auto-generated Fish shell colors (Material You theme)
-# This file is sourced automatically by fish
-
-# IMPORTANT: Use -U (universal) to override any existing universal variables
-# This ensures the theme takes effect even if colors were previously set with -U
-
-# Syntax highlighting colors
-set -U fish_color_normal {fish_rgb['normal']}
-set -U fish_color_command {fish_rgb['command']}
-set -U fish_color_keyword {fish_rgb['keyword']}
-set -U fish_color_quote {fish_rgb['quote']}
-set -U fish_color_redirection {fish_rgb['redirection']}
-set -U fish_color_end {fish_rgb['end']}
-set -U fish_color_error {fish_rgb['error']}
-set -U fish_color_param {fish_rgb['param']}
-set -U fish_color_comment {fish_rgb['comment']}
-set -U fish_color_selection --background={fish_rgb['selection_bg']}
-set -U fish_color_operator {fish_rgb['operator']}
-set -U fish_color_escape {fish_rgb['escape']}
-set -U fish_color_autosuggestion {fish_rgb['autosuggestion']}
-set -U fish_color_valid_path {fish_rgb['valid_path']} --underline
-set -U fish_color_search_match --background={fish_rgb['search_match']}
-
-# Pager (completion menu) colors
-set -U fish_pager_color_prefix {fish_rgb['pager_prefix']} --bold
-set -U fish_pager_color_completion {fish_rgb['pager_completion']}
-set -U fish_pager_color_description {fish_rgb['pager_description']}
-set -U fish_pager_color_progress {fish_rgb['pager_progress']}
-set -U fish_pager_color_selected_background --background={fish_rgb['pager_selected_bg']}
-
-# Additional useful colors
-set -U fish_color_cancel {fish_rgb['error']}
-set -U fish_color_cwd {fish_rgb['command']}
-set -U fish_color_cwd_root {fish_rgb['error']}
-set -U fish_color_history_current {fish_rgb['search_match']} --bold
-set -U fish_color_host {fish_rgb['quote']}
-set -U fish_color_host_remote {fish_rgb['quote']}
-set -U fish_color_match {fish_rgb['search_match']}
-set -U fish_color_user {fish_rgb['command']}
-
-# Export global variables for custom prompts to use
-# These match your current prompt's color scheme
-set -U material_prompt_bracket {fish_rgb['keyword']}
-set -U material_prompt_username {fish_rgb['command']}
-set -U material_prompt_hostname {fish_rgb['quote']}
-set -U material_prompt_path {fish_rgb['redirection']}
-set -U material_prompt_git {fish_rgb['quote']}
-set -U material_prompt_arrow {fish_rgb['keyword']}
-'''
+    theme_content = _FISH_THEME_TEMPLATE.format_map(fish_rgb)
     
-    with open(output_path, 'w') as f:
-        f.write(theme_content)
+    with open(output_path, 'wb') as f:
+        f.write(theme_content.encode())
     
     if debug:
         print(f"\nFish shell theme written to: {output_path}")
@@ -217,30 +154,8 @@ set -U material_prompt_arrow {fish_rgb['keyword']}
     return output_path
 
 
-def write_fish_prompt(material_colors: dict, term_colors: dict, output_path: str = None, debug: bool = False) -> str:
-    """
-    Write a custom Fish prompt using dynamic Material You color variables
-    
-    This prompt uses the $material_prompt_* variables set by write_fish_theme(),
-    so colors update automatically when you change themes.
-
-    Args:
-        material_colors: Dict of Material You colors
-        term_colors: Dict of terminal colors
-        output_path: Optional custom output path
-        debug: Enable debug output
-
-    Returns:
-        Path to the written prompt file
-    """
-    if output_path is None:
-        fish_functions_dir = Path.home() / '.config' / 'fish' / 'functions'
-        fish_functions_dir.mkdir(parents=True, exist_ok=True)
-        output_path = str(fish_functions_dir / 'fish_prompt.fish')
-    
-    # Use dynamic color variables instead of hardcoded colors
-    # These variables are set by write_fish_theme() and update automatically
-    prompt_content = '''# Auto-generated Fish prompt (Material You theme)
+# Fish prompt; colors come from the $material_prompt_* variables set by the theme
+_FISH_PROMPT = '''# Auto-generated Fish prompt (Material You theme)
 # Uses dynamic color variables that update when theme changes
 
 function fish_prompt
@@ -283,9 +198,34 @@ function fish_prompt
     set_color normal
 end
 '''
+
+
+def write_fish_prompt(material_colors: dict, term_colors: dict, output_path: str = None, debug: bool = False) -> str:
+    """
+    Write a custom Fish prompt using dynamic Material You color variables
+    
+    This prompt uses the $material_prompt_* variables set by write_fish_theme(),
+    so colors update automatically when you change themes.
+
+    Args:
+        material_colors: Dict of Material You colors
+        term_colors: Dict of terminal colors
+        output_path: Optional custom output path
+        debug: Enable debug output
+
+    Returns:
+        Path to the written prompt file
+    """
+    if output_path is None:
+        fish_functions_dir = ensure_dir(HOME / '.config' / 'fish' / 'functions')
+        output_path = str(fish_functions_dir / 'fish_prompt.fish')
+    
+    # Use dynamic color variables instead of hardcoded colors
+    # These variables are set by write_fish_theme() and update automatically
+    prompt_content = _FISH_PROMPT
     
-    with open(output_path, 'w') as f:
-        f.write(prompt_content)
+    with open(output_path, 'wb') as f:
+        f.write(prompt_content.encode())
     
     if debug:
         print(f"\nFish prompt written to: {output_path}")
@@ -4,21 +4,35 @@ FZF Theme Generator
 Generates FZF color configuration with Material You colors
 """
 from pathlib import Path
-from materialyoucolor.hct import Hct
-from materialyoucolor.utils.color_utils import rgba_from_argb, argb_from_rgb
+from color_utils import hct_from_hex, hct_spec_to_hex, HOME, ensure_dir, disk_cached
 
 
-def hex_to_argb(hex_code: str) -> int:
-    """Convert hex color to ARGB integer"""
-    return argb_from_rgb(int(hex_code[1:3], 16), int(hex_code[3:5], 16), int(hex_code[5:], 16))
-
-
-def argb_to_hex(argb: int) -> str:
-    """Convert ARGB integer to hex color"""
-    rgba = rgba_from_argb(argb)
-    return "#{:02X}{:02X}{:02X}".format(*map(round, rgba))
+# FZF palette, relative to the primary key color:
+# (name, hue offset, chroma multiplier, chroma cap, dark tone, light tone)
+FZF_SPEC = (
+    # Selected line background and text (brighter)
+    ('bg+',       0,   1.4, 55, 18, 85),
+    ('fg+',       0,   0.3, 20, 92, 20),
+    # Border and UI elements
+    ('border',    0,   0.7, float('inf'), 45, 60),
+    # Header
+    ('header',    5,   1.3, 70, 75, 40),
+    # Prompt and current selection pointer
+    ('prompt',    0,   1.4, 80, 72, 42),
+    ('pointer',   -5,  1.5, 85, 78, 38),
+    # Marker (multi-select)
+    ('marker',    15,  1.3, 75, 70, 45),
+    # Matched characters, and matched characters in the selected line
+    ('hl',        10,  1.5, 85, 80, 35),
+    ('hl+',       12,  1.6, 90, 85, 30),
+    # Scrollbar
+    ('scrollbar', 0,   0.5, float('inf'), 35, 70),
+    # Label
+    ('label',     -5,  1.2, 65, 68, 48),
+)
 
 
+@disk_cached
 def generate_fzf_colors(material_colors: dict, term_colors: dict, darkmode: bool = True) -> dict:
     """
     Generate FZF color scheme
@@ -32,77 +46,52 @@ def generate_fzf_colors(material_colors: dict, term_colors: dict, darkmode: bool
         Dict of FZF color definitions
     """
     # Get primary hue for consistency
-    primary_hct = Hct.from_int(hex_to_argb(material_colors['primary_paletteKeyColor']))
-    base_hue = primary_hct.hue
+    primary_hct = hct_from_hex(material_colors['primary_paletteKeyColor'])
     
-    fzf_colors = {}
+    fzf_colors = hct_spec_to_hex(FZF_SPEC, primary_hct.hue, primary_hct.chroma, darkmode)
     
-    # Background colors
     fzf_colors['bg'] = term_colors['term0']  # Main background
-    fzf_colors['bg+'] = argb_to_hex(  # Selected line background
-        Hct.from_hct(base_hue, min(primary_hct.chroma * 1.4, 55), 18 if darkmode else 85).to_int()
-    )
-    
-    # Foreground colors
     fzf_colors['fg'] = term_colors['term7']  # Normal text
-    fzf_colors['fg+'] = argb_to_hex(  # Selected line text (brighter)
-        Hct.from_hct(base_hue, min(primary_hct.chroma * 0.3, 20), 92 if darkmode else 20).to_int()
-    )
-    
-    # Border and UI elements
-    fzf_colors['border'] = argb_to_hex(
-        Hct.from_hct(base_hue, primary_hct.chroma * 0.7, 45 if darkmode else 60).to_int()
-    )
     fzf_colors['separator'] = fzf_colors['border']
-    
-    # Header
-    fzf_colors['header'] = argb_to_hex(
-        Hct.from_hct(base_hue + 5, min(primary_hct.chroma * 1.3, 70), 75 if darkmode else 40).to_int()
-    )
-    
-    # Info line
     fzf_colors['info'] = term_colors['term4']  # Purple
-    
-    # Prompt and pointer
-    fzf_colors['prompt'] = argb_to_hex(
-        Hct.from_hct(base_hue, min(primary_hct.chroma * 1.4, 80), 72 if darkmode else 42).to_int()
-    )
-    fzf_colors['pointer'] = argb_to_hex(  # Current selection pointer
-        Hct.from_hct(base_hue - 5, min(primary_hct.chroma * 1.5, 85), 78 if darkmode else 38).to_int()
-    )
-    
-    # Marker (multi-select)
-    fzf_colors['marker'] = argb_to_hex(
-        Hct.from_hct(base_hue + 15, min(primary_hct.chroma * 1.3, 75), 70 if darkmode else 45).to_int()
-    )
-    
-    # Spinner (loading)
     fzf_colors['spinner'] = term_colors['term5']  # Pink-purple
-    
-    # Match highlighting
-    fzf_colors['hl'] = argb_to_hex(  # Matched characters
-        Hct.from_hct(base_hue + 10, min(primary_hct.chroma * 1.5, 85), 80 if darkmode else 35).to_int()
-    )
-    fzf_colors['hl+'] = argb_to_hex(  # Matched characters in selected line
-        Hct.from_hct(base_hue + 12, min(primary_hct.chroma * 1.6, 90), 85 if darkmode else 30).to_int()
-    )
-    
-    # Query (search text)
-    fzf_colors['query'] = term_colors['term7']
-    
-    # Scrollbar
-    fzf_colors['scrollbar'] = argb_to_hex(
-        Hct.from_hct(base_hue, primary_hct.chroma * 0.5, 35 if darkmode else 70).to_int()
-    )
-    
-    # Label
-    fzf_colors['label'] = argb_to_hex(
-        Hct.from_hct(base_hue - 5, min(primary_hct.chroma * 1.2, 65), 68 if darkmode else 48).to_int()
-    )
+    fzf_colors['query'] = term_colors['term7']  # Search text
     
     return fzf_colors
 
 
+# Order of the --color entries in FZF_DEFAULT_OPTS
+_FZF_COLOR_KEYS = (
+    'bg', 'bg+', 'fg', 'fg+', 'border', 'separator', 'header', 'info', 'prompt',
+    'pointer', 'marker', 'spinner', 'hl', 'hl+', 'query', 'scrollbar', 'label',
+)
+
+# FZF_DEFAULT_OPTS for POSIX shells and fish
+_FZF_SH_TEMPLATE = '''# Auto-generated FZF colors (Material You theme)
+# Source this file in your shell config (.bashrc, .zshrc, config.fish, etc.)
+
+export FZF_DEFAULT_OPTS="\\
+  --color={color_string} \\
+  --border=rounded \\
+  --preview-window=border-rounded \\
+  --prompt='❯ ' \\
+  --pointer='â–¶' \\
+  --marker='✓'"
+'''
+
+_FZF_FISH_TEMPLATE = '''# Auto-generated FZF colors (Material You theme) for Fish shell
+# Source this file in your config.fish
+
+set -gx FZF_DEFAULT_OPTS "\\
+  --color={color_string} \\
+  --border=rounded \\
+  --preview-window=border-rounded \\
+  --prompt='❯ ' \\
+  --pointer='â–¶' \\
+  --marker='✓'"
+'''
+
+
 def write_fzf_config(fzf_colors: dict, output_path: str = None, debug: bool = False) -> str:
     """
     Write FZF configuration to shell config files
@@ -116,47 +105,16 @@ def write_fzf_config(fzf_colors: dict, output_path: str = None, debug: bool = Fa
         Path to the written config file
     """
     if output_path is None:
-        fzf_config_dir = Path.home() / '.config' / 'fzf'
-        fzf_config_dir.mkdir(parents=True, exist_ok=True)
+        fzf_config_dir = ensure_dir(HOME / '.config' / 'fzf')
         output_path = str(fzf_config_dir / 'colors.sh')
     
     # Build the FZF_DEFAULT_OPTS color string
-    color_parts = [
-        f"bg:{fzf_colors['bg']}",
-        f"bg+:{fzf_colors['bg+']}",
-        f"fg:{fzf_colors['fg']}",
-        f"fg+:{fzf_colors['fg+']}",
-        f"border:{fzf_colors['border']}",
-        f"separator:{fzf_colors['separator']}",
-        f"header:{fzf_colors['header']}",
-        f"info:{fzf_colors['info']}",
-        f"prompt:{fzf_colors['prompt']}",
-        f"pointer:{fzf_colors['pointer']}",
-        f"marker:{fzf_colors['marker']}",
-        f"spinner:{fzf_colors['spinner']}",
-        f"hl:{fzf_colors['hl']}",
-        f"hl+:{fzf_colors['hl+']}",
-        f"query:{fzf_colors['query']}",
-        f"scrollbar:{fzf_colors['scrollbar']}",
-        f"label:{fzf_colors['label']}"
-    ]
+    color_string = ','.join(f"{key}:{fzf_colors[key]}" for key in _FZF_COLOR_KEYS)
     
-    color_string = ','.join(color_parts)
-    
-    fzf_config = f'''# Auto-generated FZF colors (Material You theme)
-# Source this file in your shell config (.bashrc, .zshrc, config.fish, etc.)
-
-export FZF_DEFAULT_OPTS="\\
-  --color={color_string} \\
-  --border=rounded \\
-  --preview-window=border-rounded \\
-  --prompt='❯ ' \\
-  --pointer='â–¶' \\
-  --marker='✓'"
-'''
+    fzf_config = _FZF_SH_TEMPLATE.format(color_string=color_string)
     
-    with open(output_path, 'w') as f:
-        f.write(fzf_config)
+    with open(output_path, 'wb') as f:
+        f.write(fzf_config.encode())
     
     if debug:
         print(f"\nFZF color config written to: {output_path}")
@@ -166,20 +124,10 @@ export FZF_DEFAULT_OPTS="\\
     
     # Also create a fish-compatible version
     fish_output = str(Path(output_path).parent / 'colors.fish')
-    fish_config = f'''# Auto-generated FZF colors (Material You theme) for Fish shell
-# Source this file in your config.fish
-
-set -gx FZF_DEFAULT_OPTS "\\
-  --color={color_string} \\
-  --border=rounded \\
-  --preview-window=border-rounded \\
-  --prompt='❯ ' \\
-  --pointer='â–¶' \\
-  --marker='✓'"
-'''
+    fish_config = _FZF_FISH_TEMPLATE.format(color_string=color_string)
     
-    with open(fish_output, 'w') as f:
-        f.write(fish_config)
+    with open(fish_output, 'wb') as f:
+        f.write(fish_config.encode())
     
     if debug:
         print(f"Fish-compatible config written to: {fish_output}")
@@ -5,7 +5,9 @@ Generates Glamour JSON matching your Neovim colorscheme's vibrant purple aesthet
 Reference: https://github.com/charmbracelet/glamour/tree/master/styles
 """
 import json
+import re
 from pathlib import Path
+from color_utils import HOME, ensure_dir, write_if_changed
 
 # Material Purple Mocha colors (from your Neovim theme)
 COLORS = {
@@ -124,40 +126,23 @@ def generate_glow_colors(material_colors: dict = None, term_colors: dict = None,
     }
 
 
-def write_glow_config(glow_colors: dict = None, output_path: str = None, debug: bool = False) -> str:
-    """
-    Writes a Glamour JSON style file matching your Neovim theme.
+def _bold(fg, bg=None):
+    o = {"color": fg, "bold": True}
+    if bg: o["background_color"] = bg
+    return o
 
-    Args:
-        glow_colors: Optional colors dict (not used, for compatibility)
-        output_path: Optional custom output path
-        debug: Whether to print debug info
-    """
-    glow_cfg_dir = Path.home() / ".config" / "glow"
-    glow_cfg_dir.mkdir(parents=True, exist_ok=True)
-
-    style_path = glow_cfg_dir / "material-purple-mocha.json"
-    if output_path is not None:
-        style_path = Path(output_path)
-        style_path.parent.mkdir(parents=True, exist_ok=True)
+def _plain(fg, bg=None):
+    o = {"color": fg}
+    if bg: o["background_color"] = bg
+    return o
 
-    # Always use our generated colors, ignore passed colors
-    c = generate_glow_colors()
+def _italic(fg):
+    return {"color": fg, "italic": True}
 
-    def bold(fg, bg=None):
-        o = {"color": fg, "bold": True}
-        if bg: o["background_color"] = bg
-        return o
 
-    def plain(fg, bg=None):
-        o = {"color": fg}
-        if bg: o["background_color"] = bg
-        return o
-
-    def italic(fg):
-        return {"color": fg, "italic": True}
-
-    glamour = {
+def _glamour_style(c: dict) -> dict:
+    """Glamour style document for a glow_colors dict"""
+    return {
         "document": {
             "color": c["fg"],
             "margin": 2
@@ -167,8 +152,8 @@ def write_glow_config(glow_colors: dict = None, output_path: str = None, debug:
             "indent_token": "│ ",
             "color": c["quote_fg"]
         },
-        "paragraph": plain(c["fg"]),
-        "list": plain(c["fg"]),
+        "paragraph": _plain(c["fg"]),
+        "list": _plain(c["fg"]),
         "item": {"color": c["fg"], "block_prefix": "• "},
         "enumeration": {"color": c["fg"], "block_prefix": ". "},
         "task": {
@@ -179,21 +164,21 @@ def write_glow_config(glow_colors: dict = None, output_path: str = None, debug:
             "bold": True,
             "color": c["h1"]
         },
-        "h1": {**bold(c["h1"]), "prefix": "# ", "suffix": " ", "margin_top": 1, "margin_bottom": 1},
-        "h2": {**bold(c["h2"]), "prefix": "## ", "suffix": " ", "margin_top": 1, "margin_bottom": 1},
-        "h3": {**bold(c["h3"]), "prefix": "### ", "margin_top": 1, "margin_bottom": 0},
-        "h4": {**bold(c["h4"]), "prefix": "#### ", "margin_top": 1, "margin_bottom": 0},
-        "h5": {**bold(c["h5"]), "prefix": "##### "},
-        "h6": {**bold(c["h6"]), "prefix": "###### "},
+        "h1": {**_bold(c["h1"]), "prefix": "# ", "suffix": " ", "margin_top": 1, "margin_bottom": 1},
+        "h2": {**_bold(c["h2"]), "prefix": "## ", "suffix": " ", "margin_top": 1, "margin_bottom": 1},
+        "h3": {**_bold(c["h3"]), "prefix": "### ", "margin_top": 1, "margin_bottom": 0},
+        "h4": {**_bold(c["h4"]), "prefix": "#### ", "margin_top": 1, "margin_bottom": 0},
+        "h5": {**_bold(c["h5"]), "prefix": "##### "},
+        "h6": {**_bold(c["h6"]), "prefix": "###### "},
         "strikethrough": {"color": c["strikethrough"], "crossed_out": True},
-        "emph": italic(c["emph"]),
-        "strong": bold(c["strong"]),
+        "emph": _italic(c["emph"]),
+        "strong": _bold(c["strong"]),
         "hr": {"color": c["hr"], "format": "\n───────────────────────────────────\n"},
         "link": {"color": c["link"], "underline": True},
-        "link_text": plain(c["link_text"]),
+        "link_text": _plain(c["link_text"]),
         "image": {"color": c["link"], "underline": True},
-        "image_text": italic(c["image_text"]),
-        "code": plain(c["code_fg"], c["code_bg"]),
+        "image_text": _italic(c["image_text"]),
+        "code": _plain(c["code_fg"], c["code_bg"]),
         "code_block": {
             "margin": 1,
             "chroma": {
@@ -382,27 +367,64 @@ def write_glow_config(glow_colors: dict = None, output_path: str = None, debug:
         "table": {
             "color": c["fg"]
         },
-        "definition_list": plain(c["fg"]),
-        "definition_term": bold(c["strong"]),
-        "definition_description": italic(c["fg_muted"]),
-        "html_block": plain(c["fg_muted"]),
-        "html_span": plain(c["fg_muted"]),
-        "text": plain(c["fg"])
+        "definition_list": _plain(c["fg"]),
+        "definition_term": _bold(c["strong"]),
+        "definition_description": _italic(c["fg_muted"]),
+        "html_block": _plain(c["fg_muted"]),
+        "html_span": _plain(c["fg_muted"]),
+        "text": _plain(c["fg"])
     }
 
-    with open(style_path, "w") as f:
-        json.dump(glamour, f, indent=2)
 
-    # Update glow.yml to point at our style
-    glow_yml_path = glow_cfg_dir / "glow.yml"
-    glow_yml = f"""# Auto-generated - Material Purple Mocha theme
+def _glamour_template() -> str:
+    """
+    Render _glamour_style once with a {role} placeholder per glow color
+
+    The layout never changes between runs, so writing the style is a single
+    format_map over this JSON text instead of building and encoding the
+    nested dict every time.
+    """
+    placeholders = {role: "{%s}" % role for role in generate_glow_colors()}
+    text = json.dumps(_glamour_style(placeholders), indent=2)
+    text = text.replace("{", "{{").replace("}", "}}")
+    return re.sub(r'"\{\{(\w+)\}\}"', r'"{\1}"', text)
+
+
+_GLAMOUR_TEMPLATE = _glamour_template()
+
+# glow.yml only varies by the style path it points at
+_GLOW_YML_TEMPLATE = """# Auto-generated - Material Purple Mocha theme
 style: "{style_path}"
 mouse: false
 pager: false
 width: 100
 """
-    with open(glow_yml_path, "w") as f:
-        f.write(glow_yml)
+
+
+def write_glow_config(glow_colors: dict = None, output_path: str = None, debug: bool = False) -> str:
+    """
+    Writes a Glamour JSON style file matching your Neovim theme.
+
+    Args:
+        glow_colors: Optional colors dict from generate_glow_colors (built if omitted)
+        output_path: Optional custom output path
+        debug: Whether to print debug info
+    """
+    glow_cfg_dir = ensure_dir(HOME / ".config" / "glow")
+
+    style_path = glow_cfg_dir / "material-purple-mocha.json"
+    if output_path is not None:
+        style_path = Path(output_path)
+        ensure_dir(style_path.parent)
+
+    # run_glow passes the palette it already built; only standalone runs build one
+    c = glow_colors or generate_glow_colors()
+
+    write_if_changed(style_path, _GLAMOUR_TEMPLATE.format_map(c).encode())
+
+    # Update glow.yml to point at our style
+    glow_yml_path = glow_cfg_dir / "glow.yml"
+    write_if_changed(glow_yml_path, _GLOW_YML_TEMPLATE.format(style_path=style_path).encode())
 
     if debug:
         print(f"\n✓ Glamour style written to: {style_path}")
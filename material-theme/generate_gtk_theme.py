@@ -1,8 +1,9 @@
-from pathlib import Path
+import os
+from color_utils import HOME, ensure_dir
 
 def write_gtk_settings(theme_name: str, icon_theme: str, font: str):
-    gtk3 = Path.home() / ".config/gtk-3.0/settings.ini"
-    gtk4 = Path.home() / ".config/gtk-4.0/settings.ini"
+    gtk3 = HOME / ".config/gtk-3.0/settings.ini"
+    gtk4 = HOME / ".config/gtk-4.0/settings.ini"
 
     content = f"""[Settings]
 gtk-theme-name={theme_name}
@@ -12,9 +13,23 @@ gtk-cursor-theme-name={icon_theme}
 gtk-application-prefer-dark-theme=1
 """
 
-    gtk3.parent.mkdir(parents=True, exist_ok=True)
-    gtk4.parent.mkdir(parents=True, exist_ok=True)
+    ensure_dir(gtk3.parent)
+    ensure_dir(gtk4.parent)
 
-    gtk3.write_text(content)
-    gtk4.write_text(content)
+    data = content.encode()
+    gtk3.write_bytes(data)
+
+    # gtk-4.0 uses the same settings, so hardlink them unless gtk4 is a
+    # user-managed symlink (dotfiles) or the link fails (different filesystem)
+    if gtk4.is_symlink():
+        gtk4.write_bytes(data)
+        return
+    try:
+        gtk4.unlink()
+    except FileNotFoundError:
+        pass
+    try:
+        os.link(gtk3, gtk4)
+    except OSError:
+        gtk4.write_bytes(data)
 
@@ -3,7 +3,44 @@
 Kitty Terminal Theme Generator
 Generates Kitty terminal color configuration with Material You colors
 """
-from pathlib import Path
+from color_utils import HOME, ensure_dir
+
+
+# Kitty color config; the ANSI palette is appended as color0-color15 lines
+_KITTY_TEMPLATE = """# Auto-generated Kitty colors (Material You theme)
+
+# Main colors
+background {background}
+foreground {foreground}
+
+# Cursor colors
+cursor {foreground}
+cursor_text_color {background}
+
+# Selection colors
+selection_foreground {background}
+selection_background {selection_bg}
+
+# URL underline color
+url_color {url}
+
+# Tab bar colors
+active_tab_foreground {foreground}
+active_tab_background {active_tab_bg}
+inactive_tab_foreground {foreground}
+inactive_tab_background {tab_bg}
+tab_bar_background {background}
+
+# Marks
+mark1_foreground {background}
+mark1_background {mark1}
+mark2_foreground {background}
+mark2_background {mark2}
+mark3_foreground {background}
+mark3_background {mark3}
+
+# Terminal ANSI colors
+{ansi_colors}"""
 
 
 def write_kitty_colors(term_colors: dict, material_colors: dict = None, output_path: str = None, debug: bool = False) -> str:
@@ -20,67 +57,41 @@ def write_kitty_colors(term_colors: dict, material_colors: dict = None, output_p
         Path to the written config file
     """
     if output_path is None:
-        kitty_config_dir = Path.home() / '.config' / 'kitty'
-        kitty_config_dir.mkdir(parents=True, exist_ok=True)
+        kitty_config_dir = ensure_dir(HOME / '.config' / 'kitty')
         output_path = str(kitty_config_dir / 'current-theme.conf')
 
+    # The ANSI palette in order, looked up once
+    terms = [term_colors[f"term{i}"] for i in range(16)]
+
     # Use Material You colors for background/foreground if available, otherwise fallback to term colors
     if material_colors:
-        background = material_colors.get('surface', term_colors["term0"])
-        foreground = material_colors.get('onSurface', term_colors["term7"])
-        selection_bg = material_colors.get('primaryContainer', term_colors["term12"])
-        tab_bg = material_colors.get('surfaceContainerLow', term_colors["term0"])
-        active_tab_bg = material_colors.get('surfaceContainerHigh', term_colors["term8"])
+        background = material_colors.get('surface', terms[0])
+        foreground = material_colors.get('onSurface', terms[7])
+        selection_bg = material_colors.get('primaryContainer', terms[12])
+        tab_bg = material_colors.get('surfaceContainerLow', terms[0])
+        active_tab_bg = material_colors.get('surfaceContainerHigh', terms[8])
     else:
-        background = term_colors["term0"]
-        foreground = term_colors["term7"]
-        selection_bg = term_colors["term12"]
-        tab_bg = term_colors["term0"]
-        active_tab_bg = term_colors["term8"]
-
-    with open(output_path, 'w') as f:
-        f.write('# Auto-generated Kitty colors (Material You theme)\n\n')
-
-        # Main colors with opacity support
-        f.write('# Main colors\n')
-        f.write(f'background {background}\n')
-        f.write(f'foreground {foreground}\n')
-
-        # Cursor colors
-        f.write('\n# Cursor colors\n')
-        f.write(f'cursor {foreground}\n')
-        f.write(f'cursor_text_color {background}\n')
-
-        # Selection colors
-        f.write('\n# Selection colors\n')
-        f.write(f'selection_foreground {background}\n')
-        f.write(f'selection_background {selection_bg}\n')
-
-        # URL colors
-        f.write('\n# URL underline color\n')
-        f.write(f'url_color {term_colors["term12"]}\n')
-
-        # Tab bar colors
-        f.write('\n# Tab bar colors\n')
-        f.write(f'active_tab_foreground {foreground}\n')
-        f.write(f'active_tab_background {active_tab_bg}\n')
-        f.write(f'inactive_tab_foreground {foreground}\n')
-        f.write(f'inactive_tab_background {tab_bg}\n')
-        f.write(f'tab_bar_background {background}\n')
-
-        # Mark colors
-        f.write('\n# Marks\n')
-        f.write(f'mark1_foreground {background}\n')
-        f.write(f'mark1_background {term_colors["term12"]}\n')
-        f.write(f'mark2_foreground {background}\n')
-        f.write(f'mark2_background {term_colors["term13"]}\n')
-        f.write(f'mark3_foreground {background}\n')
-        f.write(f'mark3_background {term_colors["term14"]}\n')
-
-        # Terminal colors
-        f.write('\n# Terminal ANSI colors\n')
-        for i in range(16):
-            f.write(f'color{i} {term_colors[f"term{i}"]}\n')
+        background = terms[0]
+        foreground = terms[7]
+        selection_bg = terms[12]
+        tab_bg = terms[0]
+        active_tab_bg = terms[8]
+
+    theme_content = _KITTY_TEMPLATE.format(
+        background=background,
+        foreground=foreground,
+        selection_bg=selection_bg,
+        tab_bg=tab_bg,
+        active_tab_bg=active_tab_bg,
+        url=terms[12],
+        mark1=terms[12],
+        mark2=terms[13],
+        mark3=terms[14],
+        ansi_colors=''.join(f'color{i} {color}\n' for i, color in enumerate(terms)),
+    )
+
+    with open(output_path, 'wb') as f:
+        f.write(theme_content.encode())
 
     if debug:
         print(f"\nKitty color config written to: {output_path}")
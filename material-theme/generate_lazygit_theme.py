@@ -5,20 +5,39 @@ Generates LazyGit configuration with Material You colors
 """
 import os
 import subprocess
-from pathlib import Path
-from materialyoucolor.hct import Hct
-from materialyoucolor.utils.color_utils import rgba_from_argb, argb_from_rgb
+from color_utils import hct_from_hex, hct_to_hex, hct_spec_to_hex, HOME, ensure_dir
 
+# Included from the global git config by configure_git_diff_colors()
+GIT_COLORS_PATH = HOME / '.config' / 'material-theme' / 'git-colors.gitconfig'
 
-def hex_to_argb(hex_code: str) -> int:
-    """Convert hex color to ARGB integer"""
-    return argb_from_rgb(int(hex_code[1:3], 16), int(hex_code[3:5], 16), int(hex_code[5:], 16))
 
-
-def argb_to_hex(argb: int) -> str:
-    """Convert ARGB integer to hex color"""
-    rgba = rgba_from_argb(argb)
-    return "#{:02X}{:02X}{:02X}".format(*map(round, rgba))
+# Derived colors: (name, hue offset, chroma multiplier, chroma cap, dark tone, light tone)
+LAZYGIT_SPEC = (
+    # Selection background - darker, more saturated purple
+    ('selectedLineBg',  0,   1.6,  65, 15, 88),
+    # Selected range - darker medium purple
+    ('selectedRangeBg', 0,   1.5,  60, 22, 82),
+    # Inactive border - desaturated purple
+    ('inactiveBorder',  0,   0.6,  float('inf'), 40, 55),
+    # Active border - vibrant purple
+    ('activeBorder',    0,   1.5,  85, 70, 45),
+    # Options text - bright purple
+    ('optionsText',     5,   1.4,  75, 75, 40),
+    # Default foreground - light purple-tinted white
+    ('defaultFg',       0,   0.2,  18, 88, 25),
+    # Cherry picked - slightly shifted purple
+    ('cherryPickedBg',  -10, 1.4,  60, 32, 78),
+    # DIFF COLORS - Subtle purple-tinted versions
+    # Deletions (red) - slight shift towards red, low saturation
+    ('unstagedChanges', -12, 0.8,  45, 58, 52),
+    # Additions (green) - slight shift towards cyan, low saturation
+    ('stagedChanges',   25,  0.9,  48, 62, 48),
+    # Search / diff emphasis - soft purple
+    ('searchMatching',  8,   1.2,  65, 72, 55),
+    # Conflict colors - all subtle purples
+    ('conflictOurs',    20,  0.85, 50, 60, 50),
+    ('conflictTheirs',  -15, 0.85, 50, 56, 48),
+)
 
 
 def generate_lazygit_colors(material_colors: dict, term_colors: dict, darkmode: bool = True) -> dict:
@@ -33,68 +52,15 @@ def generate_lazygit_colors(material_colors: dict, term_colors: dict, darkmode:
     Returns:
         Dict of LazyGit color definitions
     """
-    lazygit_colors = {}
-
     # Get primary hue for consistency
-    primary_hct = Hct.from_int(hex_to_argb(material_colors['primary_paletteKeyColor']))
+    primary_hct = hct_from_hex(material_colors['primary_paletteKeyColor'])
     base_hue = primary_hct.hue
 
-    # Selection background - darker, more saturated purple
-    lazygit_colors['selectedLineBg'] = argb_to_hex(
-        Hct.from_hct(base_hue, min(primary_hct.chroma * 1.6, 65), 15 if darkmode else 88).to_int()
-    )
+    # All derived colors are solved in one batch
+    lazygit_colors = hct_spec_to_hex(LAZYGIT_SPEC, base_hue, primary_hct.chroma, darkmode)
 
-    # Selected range - darker medium purple
-    lazygit_colors['selectedRangeBg'] = argb_to_hex(
-        Hct.from_hct(base_hue, min(primary_hct.chroma * 1.5, 60), 22 if darkmode else 82).to_int()
-    )
-
-    # Inactive border - desaturated purple
-    lazygit_colors['inactiveBorder'] = argb_to_hex(
-        Hct.from_hct(base_hue, primary_hct.chroma * 0.6, 40 if darkmode else 55).to_int()
-    )
-
-    # Active border - vibrant purple
-    lazygit_colors['activeBorder'] = argb_to_hex(
-        Hct.from_hct(base_hue, min(primary_hct.chroma * 1.5, 85), 70 if darkmode else 45).to_int()
-    )
-
-    # Options text - bright purple
-    lazygit_colors['optionsText'] = argb_to_hex(
-        Hct.from_hct(base_hue + 5, min(primary_hct.chroma * 1.4, 75), 75 if darkmode else 40).to_int()
-    )
-
-    # Default foreground - light purple-tinted white
-    lazygit_colors['defaultFg'] = argb_to_hex(
-        Hct.from_hct(base_hue, min(primary_hct.chroma * 0.2, 18), 88 if darkmode else 25).to_int()
-    )
-
-    # Cherry picked - slightly shifted purple
-    lazygit_colors['cherryPickedBg'] = argb_to_hex(
-        Hct.from_hct(base_hue - 10, min(primary_hct.chroma * 1.4, 60), 32 if darkmode else 78).to_int()
-    )
-    lazygit_colors['cherryPickedFg'] = argb_to_hex(
-        Hct.from_hct(base_hue - 10, 12, 90 if darkmode else 20).to_int()
-    )
-
-    # DIFF COLORS - Subtle purple-tinted versions
-    # Deletions (red) - desaturated red-purple, subtle
-    lazygit_colors['unstagedChanges'] = argb_to_hex(
-        Hct.from_hct(
-            base_hue - 12,  # Slight shift towards red
-            min(primary_hct.chroma * 0.8, 45),  # Low saturation
-            58 if darkmode else 52
-        ).to_int()
-    )
-
-    # Additions (green) - desaturated blue-purple/teal, subtle
-    lazygit_colors['stagedChanges'] = argb_to_hex(
-        Hct.from_hct(
-            base_hue + 25,  # Slight shift towards cyan
-            min(primary_hct.chroma * 0.9, 48),  # Low saturation
-            62 if darkmode else 48
-        ).to_int()
-    )
+    # Cherry picked foreground keeps a fixed chroma
+    lazygit_colors['cherryPickedFg'] = hct_to_hex((base_hue - 10) % 360, 12, 90 if darkmode else 20)
 
     # Modified/changed sections - use term3 (light purple)
     lazygit_colors['diffModified'] = term_colors['term3']
@@ -102,71 +68,39 @@ def generate_lazygit_colors(material_colors: dict, term_colors: dict, darkmode:
     # Context lines - use term7 (normal text)
     lazygit_colors['diffContext'] = term_colors['term7']
 
-    # Search / diff emphasis - soft purple
-    lazygit_colors['searchMatching'] = argb_to_hex(
-        Hct.from_hct(
-            base_hue + 8,
-            min(primary_hct.chroma * 1.2, 65),
-            72 if darkmode else 55
-        ).to_int()
-    )
-
     # Default text color - use term7
     lazygit_colors['defaultText'] = term_colors['term7']
 
-    # Conflict colors - all subtle purples
-    lazygit_colors['conflictOurs'] = argb_to_hex(
-        Hct.from_hct(base_hue + 20, min(primary_hct.chroma * 0.85, 50), 60 if darkmode else 50).to_int()
-    )
-    lazygit_colors['conflictTheirs'] = argb_to_hex(
-        Hct.from_hct(base_hue - 15, min(primary_hct.chroma * 0.85, 50), 56 if darkmode else 48).to_int()
-    )
     lazygit_colors['conflictBase'] = term_colors['term3']
 
     return lazygit_colors
 
 
-def write_lazygit_config(lazygit_colors: dict, output_path: str = None, debug: bool = False) -> str:
-    """
-    Write LazyGit configuration file
-
-    Args:
-        lazygit_colors: Dict of LazyGit color definitions
-        output_path: Optional custom output path
-        debug: Enable debug output
-
-    Returns:
-        Path to the written config file
-    """
-    if output_path is None:
-        lazygit_config_dir = Path.home() / '.config' / 'lazygit'
-        lazygit_config_dir.mkdir(parents=True, exist_ok=True)
-        output_path = str(lazygit_config_dir / 'config.yml')
-
-    lazygit_config = f'''# Auto-generated LazyGit theme colors
+# LazyGit config; each {key} is filled from lazygit_colors[key]
+_LAZYGIT_TEMPLATE = '''# Auto-generated LazyGit theme colors
 gui:
   theme:
     activeBorderColor:
-      - "{lazygit_colors['activeBorder']}"
+      - "{activeBorder}"
       - bold
     inactiveBorderColor:
-      - "{lazygit_colors['inactiveBorder']}"
+      - "{inactiveBorder}"
     optionsTextColor:
-      - "{lazygit_colors['optionsText']}"
+      - "{optionsText}"
     selectedLineBgColor:
-      - "{lazygit_colors['selectedLineBg']}"
+      - "{selectedLineBg}"
     selectedRangeBgColor:
-      - "{lazygit_colors['selectedRangeBg']}"
+      - "{selectedRangeBg}"
     cherryPickedCommitBgColor:
-      - "{lazygit_colors['cherryPickedBg']}"
+      - "{cherryPickedBg}"
     cherryPickedCommitFgColor:
-      - "{lazygit_colors['cherryPickedFg']}"
+      - "{cherryPickedFg}"
     unstagedChangesColor:
-      - "{lazygit_colors['unstagedChanges']}"
+      - "{unstagedChanges}"
     defaultFgColor:
-      - "{lazygit_colors['defaultFg']}"
+      - "{defaultFg}"
     searchingActiveBorderColor:
-      - "{lazygit_colors['searchMatching']}"
+      - "{searchMatching}"
 
   nerdFontsVersion: "3"
   showFileTree: true
@@ -178,11 +112,30 @@ git:
     colorArg: always
     useConfig: false
     # Using delta for better diff rendering
-    pager: delta --dark --paging=never --line-numbers --minus-style='syntax "{lazygit_colors['unstagedChanges']}"' --minus-emph-style='syntax "{lazygit_colors['unstagedChanges']}"' --plus-style='syntax "{lazygit_colors['stagedChanges']}"' --plus-emph-style='syntax "{lazygit_colors['stagedChanges']}"' --hunk-header-style='file line-number syntax'
+    pager: delta --dark --paging=never --line-numbers --minus-style='syntax "{unstagedChanges}"' --minus-emph-style='syntax "{unstagedChanges}"' --plus-style='syntax "{stagedChanges}"' --plus-emph-style='syntax "{stagedChanges}"' --hunk-header-style='file line-number syntax'
 '''
 
-    with open(output_path, 'w') as f:
-        f.write(lazygit_config)
+
+def write_lazygit_config(lazygit_colors: dict, output_path: str = None, debug: bool = False) -> str:
+    """
+    Write LazyGit configuration file
+
+    Args:
+        lazygit_colors: Dict of LazyGit color definitions
+        output_path: Optional custom output path
+        debug: Enable debug output
+
+    Returns:
+        Path to the written config file
+    """
+    if output_path is None:
+        lazygit_config_dir = ensure_dir(HOME / '.config' / 'lazygit')
+        output_path = str(lazygit_config_dir / 'config.yml')
+
+    lazygit_config = _LAZYGIT_TEMPLATE.format_map(lazygit_colors)
+
+    with open(output_path, 'wb') as f:
+        f.write(lazygit_config.encode())
 
     if debug:
         print(f"\nLazyGit config written to: {output_path}")
@@ -193,6 +146,33 @@ git:
     return output_path
 
 
+# Git color include file; values are quoted since '#' starts a comment
+_GIT_COLORS_TEMPLATE = '''# Auto-generated git colors (Material You)
+[color "diff"]
+\told = "{old}"
+\tnew = "{new}"
+\tmeta = "{meta}"
+\tfrag = "{frag}"
+\tcommit = "{commit}"
+# Also set diff-highlight colors (for better diffs)
+[color "diff-highlight"]
+\toldNormal = "{old}"
+\tnewNormal = "{new}"
+# Status colors
+[color "status"]
+\tadded = "{new}"
+\tdeleted = "{old}"
+\tchanged = "{meta}"
+'''
+
+# Keys written straight into the global git config before the include file
+_LEGACY_GIT_COLOR_KEYS = (
+    'color.diff.old', 'color.diff.new', 'color.diff.meta', 'color.diff.frag', 'color.diff.commit',
+    'color.diff-highlight.oldNormal', 'color.diff-highlight.newNormal',
+    'color.status.added', 'color.status.deleted', 'color.status.changed',
+)
+
+
 def configure_git_diff_colors(lazygit_colors: dict, term_colors: dict, debug: bool = False):
     """
     Configure git global config with matching diff colors
@@ -211,23 +191,34 @@ def configure_git_diff_colors(lazygit_colors: dict, term_colors: dict, debug: bo
         'commit': term_colors['term5'], # Pink-purple
     }
 
-    # Set git config colors
+    # All keys go into one include file, so only the include.path check
+    # spawns git instead of one `git config` process per key
+    git_config = _GIT_COLORS_TEMPLATE.format_map(git_diff_colors)
+
     try:
-        for key, color in git_diff_colors.items():
+        ensure_dir(GIT_COLORS_PATH.parent)
+        with open(GIT_COLORS_PATH, 'wb') as f:
+            f.write(git_config.encode())
+
+        # Hook the file into the global config once
+        includes = subprocess.run(
+            ['git', 'config', '--global', '--get-all', 'include.path'],
+            capture_output=True, text=True
+        ).stdout.splitlines()
+        if str(GIT_COLORS_PATH) not in includes:
+            # Earlier versions set these keys in the global config directly.
+            # Left there, they would override the include whenever it lands
+            # in an [include] section above them
+            for key in _LEGACY_GIT_COLOR_KEYS:
+                subprocess.run(
+                    ['git', 'config', '--global', '--unset-all', key],
+                    capture_output=True
+                )
             subprocess.run(
-                ['git', 'config', '--global', f'color.diff.{key}', color],
+                ['git', 'config', '--global', '--add', 'include.path', str(GIT_COLORS_PATH)],
                 check=True
             )
 
-        # Also set diff-highlight colors (for better diffs)
-        subprocess.run(['git', 'config', '--global', 'color.diff-highlight.oldNormal', git_diff_colors['old']], check=True)
-        subprocess.run(['git', 'config', '--global', 'color.diff-highlight.newNormal', git_diff_colors['new']], check=True)
-
-        # Status colors
-        subprocess.run(['git', 'config', '--global', 'color.status.added', git_diff_colors['new']], check=True)
-        subprocess.run(['git', 'config', '--global', 'color.status.deleted', git_diff_colors['old']], check=True)
-        subprocess.run(['git', 'config', '--global', 'color.status.changed', git_diff_colors['meta']], check=True)
-
         if debug:
             print("\nGit diff colors configured:")
             print(f"  Deletions (red): {git_diff_colors['old']}")
@@ -239,6 +230,9 @@ def configure_git_diff_colors(lazygit_colors: dict, term_colors: dict, debug: bo
     except FileNotFoundError:
         if debug:
             print("Warning: git command not found, skipping git color configuration")
+    except OSError as e:
+        if debug:
+            print(f"Warning: Could not write git color config: {e}")
 
 
 if __name__ == "__main__":
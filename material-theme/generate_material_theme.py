@@ -4,9 +4,9 @@ Standalone Material You Color Generator
 Generates color schemes from images or colors and applies them to multiple applications
 """
 import argparse
-import math
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from PIL import Image
 
@@ -24,30 +24,18 @@ THEME_CACHE_DIR = XDG_CACHE_HOME / 'material-theme'
 for dir_path in [THEME_CONFIG_DIR, THEME_STATE_DIR, THEME_CACHE_DIR]:
     dir_path.mkdir(parents=True, exist_ok=True)
 
-# Import theme generators
-try:
-    from generate_nvim_theme import generate_neovim_theme, write_neovim_colorscheme
-    from generate_kitty_theme import write_kitty_colors
-    from generate_glow_theme import generate_glow_colors, write_glow_config
-    from generate_lazygit_theme import generate_lazygit_colors, write_lazygit_config, configure_git_diff_colors
-    from generate_starship_theme import generate_starship_colors, write_starship_config
-    from generate_yazi_theme import generate_yazi_colors, write_yazi_theme
-    from generate_fzf_theme import generate_fzf_colors, write_fzf_config
-    from generate_wofi_theme import generate_wofi_colors, write_wofi_theme
-    from generate_btop_theme import generate_btop_colors, write_btop_theme
-    from generate_fish_theme import generate_fish_colors, write_fish_theme, write_fish_prompt
-except ImportError as e:
-    print(f"Error importing theme generators: {e}")
-    print("Make sure all generator files are in the same directory or in Python path")
-    sys.exit(1)
-
+# Theme generators are imported by their jobs below, only when requested
+from color_utils import image_pixels, hct_from_argb, hct_from_hex, hct_array_to_argb, hex_to_argb, argb_to_hex, write_json, load_scheme, image_cached, dynamic_colors_to_argb
 from materialyoucolor.quantize import QuantizeCelebi
 from materialyoucolor.score.score import Score
 from materialyoucolor.hct import Hct
 from materialyoucolor.dynamiccolor.material_dynamic_colors import MaterialDynamicColors
-from materialyoucolor.utils.color_utils import (rgba_from_argb, argb_from_rgb, argb_from_rgba)
+from materialyoucolor.utils.color_utils import rgba_from_argb
 from materialyoucolor.utils.math_utils import (sanitize_degrees_double, difference_degrees, rotation_direction)
 
+# The dynamic color roles are fixed, so the class is scanned once
+_DYNAMIC_COLORS = tuple((name, dc) for name, dc in vars(MaterialDynamicColors).items() if hasattr(dc, 'get_hct'))
+
 parser = argparse.ArgumentParser(description='Standalone Material You color scheme generator')
 parser.add_argument('--path', type=str, default=None, help='Generate colorscheme from image')
 parser.add_argument('--generate-wofi', action='store_true', default=False, help='Generate Wofi theme')
@@ -56,6 +44,7 @@ parser.add_argument('--generate-glow', action='store_true', default=False, help=
 parser.add_argument('--glow-output', type=str, default=None, help='Custom Glow theme output path')
 parser.add_argument('--starship-output', type=str, default=None, help='Custom Starship theme output path')
 parser.add_argument('--size', type=int, default=128, help='Bitmap image size for processing')
+parser.add_argument('--no-pre-quantize', dest='pre_quantize', action='store_false', default=True, help='Skip the median cut pass for paletted images before quantizing')
 parser.add_argument('--color', type=str, default=None, help='Generate colorscheme from hex color')
 parser.add_argument('--mode', type=str, choices=['dark', 'light'], default='dark', help='Dark or light mode')
 parser.add_argument('--scheme', type=str, default='vibrant', help='Material scheme to use')
@@ -91,10 +80,10 @@ parser.add_argument('--fish-output', type=str, default=None, help='Custom Fish t
 args = parser.parse_args()
 
 # Utility functions
-rgba_to_hex = lambda rgba: "#{:02X}{:02X}{:02X}".format(rgba[0], rgba[1], rgba[2])
-argb_to_hex = lambda argb: "#{:02X}{:02X}{:02X}".format(*map(round, rgba_from_argb(argb)))
-hex_to_argb = lambda hex_code: argb_from_rgb(int(hex_code[1:3], 16), int(hex_code[3:5], 16), int(hex_code[5:], 16))
-display_color = lambda rgba: "\x1B[38;2;{};{};{}m{}\x1B[0m".format(rgba[0], rgba[1], rgba[2], "\x1b[7m   \x1b[7m")
+def display_color(rgba) -> str:
+    """Render a color swatch with a truecolor escape sequence"""
+    return "\x1B[38;2;%d;%d;%dm\x1b[7m   \x1b[7m\x1B[0m" % (rgba[0], rgba[1], rgba[2])
+
 
 def get_app_cfg(cfg: dict, app_name: str) -> tuple[bool, dict]:
     apps = cfg.get("applications", {})
@@ -109,32 +98,26 @@ def get_app_cfg(cfg: dict, app_name: str) -> tuple[bool, dict]:
 
     return False, {}
 
-def calculate_optimal_size(width: int, height: int, bitmap_size: int) -> tuple:
-    """Calculate optimal size for image processing"""
-    image_area = width * height
-    bitmap_area = bitmap_size ** 2
-    scale = math.sqrt(bitmap_area / image_area) if image_area > bitmap_area else 1
-    new_width = max(1, round(width * scale))
-    new_height = max(1, round(height * scale))
-    return new_width, new_height
-
-
-def harmonize(design_color: int, source_color: int, threshold: float = 35, harmony: float = 0.5) -> int:
-    """Harmonize a color towards a source color"""
-    from_hct = Hct.from_int(design_color)
-    to_hct = Hct.from_int(source_color)
-    difference_degrees_ = difference_degrees(from_hct.hue, to_hct.hue)
-    rotation_degrees = min(difference_degrees_ * harmony, threshold)
-    output_hue = sanitize_degrees_double(
-        from_hct.hue + rotation_degrees * rotation_direction(from_hct.hue, to_hct.hue)
-    )
-    return Hct.from_hct(output_hue, from_hct.chroma, from_hct.tone).to_int()
+def harmonize_batch(design_hcts: list, source_hct: Hct, threshold: float = 35, harmony: float = 0.5) -> list:
+    """Harmonize a batch of colors towards a source color, returning Hct objects"""
+    hues, chromas, tones = [], [], []
+    for from_hct in design_hcts:
+        difference_degrees_ = difference_degrees(from_hct.hue, source_hct.hue)
+        rotation_degrees = min(difference_degrees_ * harmony, threshold)
+        hues.append(sanitize_degrees_double(
+            from_hct.hue + rotation_degrees * rotation_direction(from_hct.hue, source_hct.hue)
+        ))
+        chromas.append(from_hct.chroma)
+        tones.append(from_hct.tone)
+    return [hct_from_argb(argb) for argb in hct_array_to_argb(hues, chromas, tones)]
 
 
-def boost_chroma_tone(argb: int, chroma: float = 1, tone: float = 1) -> int:
-    """Boost chroma and tone of a color"""
-    hct = Hct.from_int(argb)
-    return Hct.from_hct(hct.hue, hct.chroma * chroma, hct.tone * tone).to_int()
+def boost_chroma_tone_batch(hcts: list, boosts: list) -> list:
+    """Boost chroma and tone of a batch of Hct colors by (chroma, tone) factors"""
+    hues = [hct.hue for hct in hcts]
+    chromas = [hct.chroma * chroma for hct, (chroma, _) in zip(hcts, boosts)]
+    tones = [hct.tone * tone for hct, (_, tone) in zip(hcts, boosts)]
+    return hct_array_to_argb(hues, chromas, tones)
 
 
 def convert_catppuccin_to_terminal_colors(catppuccin_colors: dict) -> dict:
@@ -163,86 +146,77 @@ def convert_catppuccin_to_terminal_colors(catppuccin_colors: dict) -> dict:
 darkmode = (args.mode == 'dark')
 transparent = (args.transparency == 'transparent')
 
-# Generate or load source color
-if args.path is not None:
-    image = Image.open(args.path)
+@image_cached
+def extract_source_color(path: str, size: int, pre_quantize: bool) -> dict:
+    """Pick the source color of a wallpaper, along with its original and resized dimensions"""
+    image = Image.open(path)
 
     if image.format == "GIF":
         image.seek(1)
 
-    if image.mode in ["L", "P"]:
+    # Palette images have to be expanded before resampling. Grayscale is
+    # converted after thumbnail() instead, which keeps its JPEG draft decode
+    paletted = image.mode == "P"
+    if paletted:
         image = image.convert('RGB')
 
     wsize, hsize = image.size
-    wsize_new, hsize_new = calculate_optimal_size(wsize, hsize, args.size)
-    if wsize_new < wsize or hsize_new < hsize:
-        image = image.resize((wsize_new, hsize_new), Image.Resampling.BICUBIC)
+    # The quantizer only needs the color distribution, so a box average
+    # is enough; thumbnail() is a no-op for images already within bounds
+    image.thumbnail((size, size), Image.Resampling.BOX)
+    if image.mode == "L":
+        image = image.convert('RGB')
+
+    colors = QuantizeCelebi(image_pixels(image, pre_quantize, paletted), 128)
+    return {'argb': Score.score(colors)[0], 'size': [wsize, hsize], 'resized': list(image.size)}
 
-    colors = QuantizeCelebi(list(image.getdata()), 128)
-    argb = Score.score(colors)[0]
+
+# Generate or load source color
+if args.path is not None:
+    # Cached per wallpaper, so re-applying one skips decoding and quantizing
+    source = extract_source_color(args.path, args.size, args.pre_quantize)
+    argb = source['argb']
+    wsize, hsize = source['size']
+    wsize_new, hsize_new = source['resized']
 
     # Cache the color if requested
+    source_hex = argb_to_hex(argb).encode()
     if args.cache is not None:
         cache_path = Path(args.cache)
         cache_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(cache_path, 'w') as file:
-            file.write(argb_to_hex(argb))
+        cache_path.write_bytes(source_hex)
 
     # Also save to default cache location
     default_cache = THEME_STATE_DIR / 'current_color.txt'
-    with open(default_cache, 'w') as f:
-        f.write(argb_to_hex(argb))
+    default_cache.write_bytes(source_hex)
 
-    hct = Hct.from_int(argb)
+    hct = hct_from_argb(argb)
     if args.smart and hct.chroma < 20:
         args.scheme = 'neutral'
 
 elif args.color is not None:
     argb = hex_to_argb(args.color)
-    hct = Hct.from_int(argb)
+    hct = hct_from_argb(argb)
 
     # Save to cache
     default_cache = THEME_STATE_DIR / 'current_color.txt'
-    with open(default_cache, 'w') as f:
-        f.write(args.color)
+    default_cache.write_bytes(args.color.encode())
 else:
     print("Error: Must provide either --path or --color")
     sys.exit(1)
 
 # Select scheme type
-scheme_map = {
-    'scheme-fruit-salad': 'materialyoucolor.scheme.scheme_fruit_salad.SchemeFruitSalad',
-    'scheme-expressive': 'materialyoucolor.scheme.scheme_expressive.SchemeExpressive',
-    'scheme-monochrome': 'materialyoucolor.scheme.scheme_monochrome.SchemeMonochrome',
-    'scheme-rainbow': 'materialyoucolor.scheme.scheme_rainbow.SchemeRainbow',
-    'scheme-tonal-spot': 'materialyoucolor.scheme.scheme_tonal_spot.SchemeTonalSpot',
-    'scheme-neutral': 'materialyoucolor.scheme.scheme_neutral.SchemeNeutral',
-    'scheme-fidelity': 'materialyoucolor.scheme.scheme_fidelity.SchemeFidelity',
-    'scheme-content': 'materialyoucolor.scheme.scheme_content.SchemeContent',
-    'scheme-vibrant': 'materialyoucolor.scheme.scheme_vibrant.SchemeVibrant',
-}
-
 scheme_name = f'scheme-{args.scheme}' if not args.scheme.startswith('scheme-') else args.scheme
-if scheme_name in scheme_map:
-    module_path, class_name = scheme_map[scheme_name].rsplit('.', 1)
-    module = __import__(module_path, fromlist=[class_name])
-    Scheme = getattr(module, class_name)
-else:
-    from materialyoucolor.scheme.scheme_tonal_spot import SchemeTonalSpot as Scheme
+Scheme = load_scheme(scheme_name)
 
 # Generate Material You color scheme
 scheme = Scheme(hct, darkmode, 0.0)
 
-material_colors = {}
+# Extract all Material colors, keeping the ARGB ints for the HCT work below
+material_argb = dynamic_colors_to_argb(_DYNAMIC_COLORS, scheme)
+material_colors = {color: argb_to_hex(code) for color, code in material_argb.items()}
 term_colors = {}
 
-# Extract all Material colors
-for color in vars(MaterialDynamicColors).keys():
-    color_name = getattr(MaterialDynamicColors, color)
-    if hasattr(color_name, "get_hct"):
-        rgba = color_name.get_hct(scheme).to_rgba()
-        material_colors[color] = rgba_to_hex(rgba)
-
 # Add extended material colors
 if darkmode:
     material_colors['success'] = '#B5CCBA'
@@ -255,6 +229,9 @@ else:
     material_colors['successContainer'] = '#D1E8D5'
     material_colors['onSuccessContainer'] = '#0C1F13'
 
+# Solved once here; the generators get the same Hct from hct_from_argb's cache
+primary_hct = hct_from_argb(material_argb['primary_paletteKeyColor'])
+
 # Generate terminal colors
 if args.termscheme is not None:
     termscheme_path = Path(args.termscheme)
@@ -278,8 +255,7 @@ else:
             }
         }
         termscheme_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(termscheme_path, 'w') as f:
-            json.dump(default_scheme, f, indent=4)
+        termscheme_path.write_bytes(json.dumps(default_scheme, indent=4).encode())
 
 if termscheme_path.exists():
     with open(termscheme_path, 'r') as f:
@@ -291,19 +267,32 @@ if termscheme_path.exists():
     else:
         term_source_colors = convert_catppuccin_to_terminal_colors(loaded_colors)
 
-    primary_color_argb = hex_to_argb(material_colors['primary_paletteKeyColor'])
-    for color, val in term_source_colors.items():
-        if args.scheme == 'monochrome':
-            term_colors[color] = val
-            continue
-        if args.blend_bg_fg and color == "term0":
-            harmonized = boost_chroma_tone(hex_to_argb(material_colors['surfaceContainerLow']), 1.2, 0.95)
-        elif args.blend_bg_fg and color == "term15":
-            harmonized = boost_chroma_tone(hex_to_argb(material_colors['onSurface']), 3, 1)
-        else:
-            harmonized = harmonize(hex_to_argb(val), primary_color_argb, args.harmonize_threshold, args.harmony)
-            harmonized = boost_chroma_tone(harmonized, 1, 1 + (args.term_fg_boost * (1 if darkmode else -1)))
-        term_colors[color] = argb_to_hex(harmonized)
+    if args.scheme == 'monochrome':
+        term_colors.update(term_source_colors)
+    else:
+        # Gather every color first so both HCT passes run as one batch each.
+        # Colors stay Hct objects until the end; hct_from_hex reuses the
+        # CAM16 conversion of repeated colors (e.g. term1 and term9).
+        names, hcts, boosts, to_harmonize = [], [], [], []
+        fg_boost = 1 + (args.term_fg_boost * (1 if darkmode else -1))
+        for color, val in term_source_colors.items():
+            names.append(color)
+            if args.blend_bg_fg and color == "term0":
+                hcts.append(hct_from_argb(material_argb['surfaceContainerLow']))
+                boosts.append((1.2, 0.95))
+            elif args.blend_bg_fg and color == "term15":
+                hcts.append(hct_from_argb(material_argb['onSurface']))
+                boosts.append((3, 1))
+            else:
+                to_harmonize.append(len(hcts))
+                hcts.append(hct_from_hex(val))
+                boosts.append((1, fg_boost))
+
+        harmonized = harmonize_batch([hcts[i] for i in to_harmonize], primary_hct, args.harmonize_threshold, args.harmony)
+        for i, harmonized_hct in zip(to_harmonize, harmonized):
+            hcts[i] = harmonized_hct
+        for color, boosted_argb in zip(names, boost_chroma_tone_batch(hcts, boosts)):
+            term_colors[color] = argb_to_hex(boosted_argb)
 
 # Save color data to cache
 color_data = {
@@ -314,11 +303,13 @@ color_data = {
     'source_color': argb_to_hex(argb)
 }
 cache_file = THEME_STATE_DIR / 'colors.json'
-with open(cache_file, 'w') as f:
-    json.dump(color_data, f, indent=2)
+
+def save_color_cache():
+    write_json(cache_file, color_data)
 
 # Generate theme files
-if args.generate_all or args.generate_nvim:
+def run_nvim():
+    from generate_nvim_theme import generate_neovim_theme, write_neovim_colorscheme
     if args.debug:
         print('\n=== Generating Neovim theme ===')
     nvim_theme = generate_neovim_theme(material_colors, term_colors, transparent, None, args.debug)
@@ -326,131 +317,161 @@ if args.generate_all or args.generate_nvim:
     if args.debug:
         print(f'✓ Neovim theme written to: {nvim_path}')
 
-if termscheme_path.exists():
-    with open(termscheme_path, 'r') as f:
-        loaded_colors = json.load(f)
+def run_wofi():
+    from generate_wofi_theme import generate_wofi_colors, write_wofi_theme
+    if args.debug:
+        print('\n=== Generating Wofi theme ===')
+    # Read wofi config from the main config.json, not termscheme
+    main_config_path = THEME_CONFIG_DIR / 'config.json'
+    wofi_cfg = {}
+    if main_config_path.exists():
+        with open(main_config_path, 'r') as f:
+            main_cfg = json.load(f)
+        _, wofi_cfg = get_app_cfg(main_cfg, "wofi")
+    if args.debug:
+        print(f'Wofi config: {wofi_cfg}')
+    wofi_colors = generate_wofi_colors(material_colors, term_colors, darkmode, wofi_cfg)
+    wofi_path = write_wofi_theme(wofi_colors, None, args.debug)
+    if args.debug:
+        print(f'✔ Wofi theme written to: {wofi_path}')
 
-        wofi_enabled, wofi_cfg = get_app_cfg(loaded_colors, "wofi")
-        if args.generate_all or args.generate_wofi:
-            if term_colors:
-                if args.debug:
-                    print('\n=== Generating Wofi theme ===')
-                # Read wofi config from the main config.json, not termscheme
-                main_config_path = THEME_CONFIG_DIR / 'config.json'
-                wofi_cfg = {}
-                if main_config_path.exists():
-                    with open(main_config_path, 'r') as f:
-                        main_cfg = json.load(f)
-                    _, wofi_cfg = get_app_cfg(main_cfg, "wofi")
-                if args.debug:
-                    print(f'Wofi config: {wofi_cfg}')
-                wofi_colors = generate_wofi_colors(material_colors, term_colors, darkmode, wofi_cfg)
-                wofi_path = write_wofi_theme(wofi_colors, None, args.debug)
-                if args.debug:
-                    print(f'✔ Wofi theme written to: {wofi_path}')
-
-if args.generate_all or args.generate_kitty:
-    if term_colors:
-        if args.debug:
-            print('\n=== Generating Kitty theme ===')
-        kitty_path = write_kitty_colors(term_colors, material_colors, args.kitty_output, args.debug)
-        if args.debug:
-            print(f'✓ Kitty theme written to: {kitty_path}')
+def run_kitty():
+    from generate_kitty_theme import write_kitty_colors
+    if args.debug:
+        print('\n=== Generating Kitty theme ===')
+    kitty_path = write_kitty_colors(term_colors, material_colors, args.kitty_output, args.debug)
+    if args.debug:
+        print(f'✓ Kitty theme written to: {kitty_path}')
 
-if args.generate_all or args.generate_lazygit:
-    if term_colors:
-        if args.debug:
-            print('\n=== Generating LazyGit theme ===')
-        lazygit_colors = generate_lazygit_colors(material_colors, term_colors, darkmode)
-        lazygit_path = write_lazygit_config(lazygit_colors, args.lazygit_output, args.debug)
-        configure_git_diff_colors(lazygit_colors, term_colors, args.debug)
-        if args.debug:
-            print(f'✓ LazyGit theme written to: {lazygit_path}')
-
-if args.generate_all or args.generate_yazi:
-    if term_colors:
-        if args.debug:
-            print('\n=== Generating Yazi theme ===')
-        yazi_colors = generate_yazi_colors(material_colors, term_colors, darkmode)
-        yazi_path = write_yazi_theme(yazi_colors, args.yazi_output, args.debug)
-        if args.debug:
-            print(f'✓ Yazi theme written to: {yazi_path}')
-
-if args.generate_all or args.generate_fzf:
-    if term_colors:
-        if args.debug:
-            print('\n=== Generating FZF theme ===')
-        fzf_colors = generate_fzf_colors(material_colors, term_colors, darkmode)
-        fzf_path = write_fzf_config(fzf_colors, args.fzf_output, args.debug)
-        if args.debug:
-            print(f'✓ FZF theme written to: {fzf_path}')
-
-if args.generate_all or args.generate_btop:
-    if term_colors:
-        if args.debug:
-            print('\n=== Generating Btop theme ===')
-        btop_colors = generate_btop_colors(material_colors, term_colors, darkmode)
-        btop_path = write_btop_theme(btop_colors, args.btop_output, args.debug)
-        if args.debug:
-            print(f'✓ Btop theme written to: {btop_path}')
-
-if args.generate_all or args.generate_starship:
-    if term_colors:
-        if args.debug:
-            print('\n=== Generating Starship theme ===')
-        starship_colors = generate_starship_colors(material_colors, term_colors, darkmode)
-        starship_path = write_starship_config(starship_colors, args.starship_output, args.debug)
-        if args.debug:
-            print(f'✓ Starship theme written to: {starship_path}')
-
-if args.generate_all or args.generate_fish:
-    if term_colors:
-        if args.debug:
-            print('\n=== Generating Fish shell theme ===')
-        fish_colors = generate_fish_colors(material_colors, term_colors, darkmode)
-        fish_path = write_fish_theme(fish_colors, args.fish_output, args.debug)
-        write_fish_prompt(material_colors, term_colors, None, args.debug)
-        if args.debug:
-            print(f'✓ Fish theme written to: {fish_path}')
-
-if args.generate_all or args.generate_glow:
-    if term_colors:
-        if args.debug:
-            print('\n=== Generating Glow theme ===')
-        glow_colors = generate_glow_colors(material_colors, term_colors, darkmode)
-        glow_path = write_glow_config(glow_colors, args.glow_output, args.debug)
-        if args.debug:
-            print(f'✓ Glow theme written to: {glow_path}')
-    else:
-        if args.debug:
-            print('Warning: No terminal colors generated. Use --termscheme to generate Glow theme.')
+def run_lazygit():
+    from generate_lazygit_theme import generate_lazygit_colors, write_lazygit_config, configure_git_diff_colors
+    if args.debug:
+        print('\n=== Generating LazyGit theme ===')
+    lazygit_colors = generate_lazygit_colors(material_colors, term_colors, darkmode)
+    lazygit_path = write_lazygit_config(lazygit_colors, args.lazygit_output, args.debug)
+    configure_git_diff_colors(lazygit_colors, term_colors, args.debug)
+    if args.debug:
+        print(f'✓ LazyGit theme written to: {lazygit_path}')
+
+def run_yazi():
+    from generate_yazi_theme import generate_yazi_colors, write_yazi_theme
+    if args.debug:
+        print('\n=== Generating Yazi theme ===')
+    yazi_colors = generate_yazi_colors(material_colors, term_colors, darkmode)
+    yazi_path = write_yazi_theme(yazi_colors, args.yazi_output, args.debug)
+    if args.debug:
+        print(f'✓ Yazi theme written to: {yazi_path}')
+
+def run_fzf():
+    from generate_fzf_theme import generate_fzf_colors, write_fzf_config
+    if args.debug:
+        print('\n=== Generating FZF theme ===')
+    fzf_colors = generate_fzf_colors(material_colors, term_colors, darkmode)
+    fzf_path = write_fzf_config(fzf_colors, args.fzf_output, args.debug)
+    if args.debug:
+        print(f'✓ FZF theme written to: {fzf_path}')
+
+def run_btop():
+    from generate_btop_theme import generate_btop_colors, write_btop_theme
+    if args.debug:
+        print('\n=== Generating Btop theme ===')
+    btop_colors = generate_btop_colors(material_colors, term_colors, darkmode)
+    btop_path = write_btop_theme(btop_colors, args.btop_output, args.debug)
+    if args.debug:
+        print(f'✓ Btop theme written to: {btop_path}')
+
+def run_starship():
+    from generate_starship_theme import generate_starship_colors, write_starship_config
+    if args.debug:
+        print('\n=== Generating Starship theme ===')
+    starship_colors = generate_starship_colors(material_colors, term_colors, darkmode)
+    starship_path = write_starship_config(starship_colors, args.starship_output, args.debug)
+    if args.debug:
+        print(f'✓ Starship theme written to: {starship_path}')
+
+def run_fish():
+    from generate_fish_theme import generate_fish_colors, write_fish_theme, write_fish_prompt
+    if args.debug:
+        print('\n=== Generating Fish shell theme ===')
+    fish_colors = generate_fish_colors(material_colors, term_colors, darkmode)
+    fish_path = write_fish_theme(fish_colors, args.fish_output, args.debug)
+    write_fish_prompt(material_colors, term_colors, None, args.debug)
+    if args.debug:
+        print(f'✓ Fish theme written to: {fish_path}')
+
+def run_glow():
+    from generate_glow_theme import generate_glow_colors, write_glow_config
+    if args.debug:
+        print('\n=== Generating Glow theme ===')
+    glow_colors = generate_glow_colors(material_colors, term_colors, darkmode)
+    glow_path = write_glow_config(glow_colors, args.glow_output, args.debug)
+    if args.debug:
+        print(f'✓ Glow theme written to: {glow_path}')
+
+theme_jobs = [save_color_cache]
+if args.generate_all or args.generate_nvim:
+    theme_jobs.append(run_nvim)
+if termscheme_path.exists() and term_colors and (args.generate_all or args.generate_wofi):
+    theme_jobs.append(run_wofi)
+if term_colors:
+    for enabled, job in (
+        (args.generate_kitty, run_kitty),
+        (args.generate_lazygit, run_lazygit),
+        (args.generate_yazi, run_yazi),
+        (args.generate_fzf, run_fzf),
+        (args.generate_btop, run_btop),
+        (args.generate_starship, run_starship),
+        (args.generate_fish, run_fish),
+        (args.generate_glow, run_glow),
+    ):
+        if args.generate_all or enabled:
+            theme_jobs.append(job)
+elif args.generate_all or args.generate_glow:
+    if args.debug:
+        print('Warning: No terminal colors generated. Use --termscheme to generate Glow theme.')
+
+# The cache and the generators write independent files, so overlap all of
+# their file and git IO. With --debug run them one at a time to keep the
+# output in order.
+with ThreadPoolExecutor(max_workers=1 if args.debug else len(theme_jobs)) as executor:
+    for future in [executor.submit(job) for job in theme_jobs]:
+        try:
+            future.result()
+        except ImportError as e:
+            print(f"Error importing theme generators: {e}")
+            print("Make sure all generator files are in the same directory or in Python path")
+            sys.exit(1)
 
 # Output for scripts (SCSS format for compatibility)
 if not args.debug:
-    print(f"$darkmode: {darkmode};")
-    print(f"$transparent: {transparent};")
-    for color, code in material_colors.items():
-        print(f"${color}: {code};")
-    for color, code in term_colors.items():
-        print(f"${color}: {code};")
+    # One write instead of a print per line
+    scss = [f"$darkmode: {darkmode};", f"$transparent: {transparent};"]
+    scss.extend(f"${color}: {code};" for color, code in material_colors.items())
+    scss.extend(f"${color}: {code};" for color, code in term_colors.items())
+    sys.stdout.write("\n".join(scss) + "\n")
 else:
+    # Buffered like the SCSS output, one write for the whole report
+    report = []
     if args.path is not None:
-        print('\n=== Image Properties ===')
-        print(f"Image size: {wsize} x {hsize}")
-        print(f"Resized: {wsize_new} x {hsize_new}")
-    print('\n=== Selected Color ===')
-    print(f"Dark mode: {darkmode}")
-    print(f"Scheme: {args.scheme}")
-    print(f"Accent: {display_color(rgba_from_argb(argb))} {argb_to_hex(argb)}")
-    print(f"HCT: H={hct.hue:.2f} C={hct.chroma:.2f} T={hct.tone:.2f}")
-    print('\n=== Material Colors ===')
-    for color, code in material_colors.items():
-        rgba = rgba_from_argb(hex_to_argb(code))
-        print(f"{color.ljust(32)} : {display_color(rgba)}  {code}")
+        report.append('\n=== Image Properties ===')
+        report.append(f"Image size: {wsize} x {hsize}")
+        report.append(f"Resized: {wsize_new} x {hsize_new}")
+    report.append('\n=== Selected Color ===')
+    report.append(f"Dark mode: {darkmode}")
+    report.append(f"Scheme: {args.scheme}")
+    report.append(f"Accent: {display_color(rgba_from_argb(argb))} {argb_to_hex(argb)}")
+    report.append(f"HCT: H={hct.hue:.2f} C={hct.chroma:.2f} T={hct.tone:.2f}")
+    report.append('\n=== Material Colors ===')
+    report.extend(
+        f"{color.ljust(32)} : {display_color(rgba_from_argb(hex_to_argb(code)))}  {code}"
+        for color, code in material_colors.items()
+    )
     if term_colors:
-        print('\n=== Terminal Colors (Harmonized) ===')
-        for color, code in term_colors.items():
-            rgba = rgba_from_argb(hex_to_argb(code))
-            print(f"{color.ljust(6)} : {display_color(rgba)} {code}")
-    print('\n' + '=' * 50)
-    print(f"Color data cached to: {cache_file}")
+        report.append('\n=== Terminal Colors (Harmonized) ===')
+        report.extend(
+            f"{color.ljust(6)} : {display_color(rgba_from_argb(hex_to_argb(code)))} {code}"
+            for color, code in term_colors.items()
+        )
+    report.append('\n' + '=' * 50)
+    report.append(f"Color data cached to: {cache_file}")
+    sys.stdout.write("\n".join(report) + "\n")
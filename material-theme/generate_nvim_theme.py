@@ -6,9 +6,16 @@ All background transparency handled through transparent_groups at the end
 
 import os
 import json
-from pathlib import Path
-from materialyoucolor.hct import Hct
-from materialyoucolor.utils.color_utils import rgba_from_argb, argb_from_rgb
+import functools
+from materialyoucolor.utils.math_utils import (
+    sanitize_degrees_double,
+    difference_degrees,
+    rotation_direction,
+)
+from color_utils import (
+    hex_to_argb, argb_to_hex, hct_from_hex, hct_components,
+    hct_array_to_argb, hct_batch_to_hex, HOME, ensure_dir, write_if_changed,
+)
 
 
 # Embedded Catppuccin Mocha palette as fallback
@@ -42,6 +49,65 @@ CATPPUCCIN_MOCHA = {
 }
 
 
+# Harmonization parameters - INCREASED for more vibrant, purple-harmonized colors
+BG_HARMONY = 0.88
+UI_HARMONY = 0.15
+SYNTAX_HARMONY = 0.85
+TEXT_HARMONY = 0.46
+
+BG_THRESH = 5.0
+UI_THRESH = 10.0
+SYNTAX_THRESH = 60.0
+TEXT_THRESH = 8.0
+
+# Rows of (Catppuccin color, harmony, threshold, target chroma, forced tone),
+# where None keeps the harmonized chroma or tone
+NEOVIM_SPEC = (
+    # Background / surfaces (keep Mocha depth)
+    ("base", BG_HARMONY, BG_THRESH, None, None),
+    ("mantle", UI_HARMONY, UI_THRESH, None, None),
+    ("crust", UI_HARMONY, UI_THRESH, None, None),
+    ("surface0", UI_HARMONY, UI_THRESH, None, None),
+    ("surface1", UI_HARMONY, UI_THRESH, None, None),
+    ("surface2", UI_HARMONY, UI_THRESH, None, None),
+    ("overlay0", UI_HARMONY, UI_THRESH, None, None),
+    ("overlay1", UI_HARMONY, UI_THRESH, None, None),
+    ("overlay2", UI_HARMONY, UI_THRESH, None, None),
+    # Text
+    ("text", TEXT_HARMONY, TEXT_THRESH, None, None),
+    ("subtext0", TEXT_HARMONY, TEXT_THRESH, None, None),
+    ("subtext1", TEXT_HARMONY, TEXT_THRESH, None, None),
+    # Syntax accents - VIBRANT, highly saturated, tones forced for contrast
+    ("rosewater", SYNTAX_HARMONY, SYNTAX_THRESH, 90, None),
+    ("flamingo", SYNTAX_HARMONY, SYNTAX_THRESH, 90, None),
+    ("pink", SYNTAX_HARMONY, SYNTAX_THRESH, 92, 70),
+    ("mauve", SYNTAX_HARMONY, SYNTAX_THRESH, 95, 68),
+    ("red", SYNTAX_HARMONY, SYNTAX_THRESH, 90, 65),
+    ("maroon", SYNTAX_HARMONY, SYNTAX_THRESH, 88, None),
+    ("peach", SYNTAX_HARMONY, SYNTAX_THRESH, 90, 72),
+    ("yellow", SYNTAX_HARMONY, SYNTAX_THRESH, 92, 80),
+    ("green", SYNTAX_HARMONY, SYNTAX_THRESH, 95, 70),
+    ("teal", SYNTAX_HARMONY, SYNTAX_THRESH, 95, 72),
+    ("sky", SYNTAX_HARMONY, SYNTAX_THRESH, 95, None),
+    ("sapphire", SYNTAX_HARMONY, SYNTAX_THRESH, 95, 73),
+    ("blue", SYNTAX_HARMONY, SYNTAX_THRESH, 95, 72),
+    ("lavender", SYNTAX_HARMONY, SYNTAX_THRESH, 95, None),
+)
+
+# Rainbow delimiter rows of (name, source color, chroma boost, min tone)
+RAINBOW_SPEC = (
+    ("red", "red", 1.3, 68),
+    ("orange", "peach", 1.25, 72),
+    ("yellow", "yellow", 1.25, 75),
+    ("green", "green", 1.3, 70),
+    ("cyan", "teal", 1.3, 70),
+    ("blue", "blue", 1.3, 72),
+    ("violet", "mauve", 1.4, 68),
+    ("purple", "mauve", 1.4, 68),
+    ("pink", "pink", 1.3, 70),
+)
+
+
 def load_catppuccin_palette(path: str = None) -> dict:
     """
     Load Catppuccin color palette from JSON file or use embedded palette
@@ -54,8 +120,7 @@ def load_catppuccin_palette(path: str = None) -> dict:
     """
     if path and os.path.exists(path):
         try:
-            with open(path, "r") as f:
-                return json.load(f)
+            return _read_palette(path, os.path.getmtime(path))
         except Exception as e:
             print(f"Warning: Could not load Catppuccin palette from {path}: {e}")
             print("Using embedded Catppuccin Mocha palette")
@@ -64,65 +129,26 @@ def load_catppuccin_palette(path: str = None) -> dict:
         return CATPPUCCIN_MOCHA
 
 
-def hex_to_argb(hex_code: str) -> int:
-    """Convert hex color to ARGB integer"""
-    return argb_from_rgb(
-        int(hex_code[1:3], 16), int(hex_code[3:5], 16), int(hex_code[5:], 16)
-    )
-
-
-def argb_to_hex(argb: int) -> str:
-    """Convert ARGB integer to hex color"""
-    rgba = rgba_from_argb(argb)
-    return "#{:02X}{:02X}{:02X}".format(*map(round, rgba))
+@functools.lru_cache(maxsize=8)
+def _read_palette(path: str, mtime: float) -> dict:
+    """Parse a palette file once per modification time"""
+    with open(path, "r") as f:
+        return json.load(f)
 
 
-def harmonize_hex(
-    hex_color: str, accent_argb: int, harmony_amt: float, threshold: float
-) -> str:
-    """
-    Harmonize a hex color toward accent color
-    Preserves Catppuccin tone & chroma, only nudges hue toward accent
+def harmonized_hct(hex_color: str, accent_hue: float, harmony_amt: float, threshold: float) -> tuple:
     """
-    from materialyoucolor.utils.math_utils import (
-        sanitize_degrees_double,
-        difference_degrees,
-        rotation_direction,
-    )
+    HCT of a hex color with its hue nudged toward the accent
 
-    base_argb = hex_to_argb(hex_color)
-    from_hct = Hct.from_int(base_argb)
-    to_hct = Hct.from_int(accent_argb)
+    Returns (hue, chroma, tone) unsolved, so callers can batch the solve
+    """
+    hue, chroma, tone = hct_components(hex_to_argb(hex_color))
 
-    difference_degrees_ = difference_degrees(from_hct.hue, to_hct.hue)
-    rotation_degrees = min(difference_degrees_ * harmony_amt, threshold)
+    rotation_degrees = min(difference_degrees(hue, accent_hue) * harmony_amt, threshold)
     output_hue = sanitize_degrees_double(
-        from_hct.hue + rotation_degrees * rotation_direction(from_hct.hue, to_hct.hue)
+        hue + rotation_degrees * rotation_direction(hue, accent_hue)
     )
-
-    out_argb = Hct.from_hct(output_hue, from_hct.chroma, from_hct.tone).to_int()
-    return argb_to_hex(out_argb)
-
-
-def clamp_chroma(argb: int, max_chroma: float) -> int:
-    """Limit the chroma of a color"""
-    hct = Hct.from_int(argb)
-    return Hct.from_hct(hct.hue, min(hct.chroma, max_chroma), hct.tone).to_int()
-
-
-def force_tone(argb: int, tone: float) -> int:
-    """Force a specific tone value"""
-    hct = Hct.from_int(argb)
-    return Hct.from_hct(hct.hue, hct.chroma, tone).to_int()
-
-
-def lift_tone(argb: int, delta: float) -> int:
-    """
-    Increase brightness ONLY.
-    Preserves hue and chroma.
-    """
-    hct = Hct.from_int(argb)
-    return Hct.from_hct(hct.hue, hct.chroma, min(hct.tone + delta, 100)).to_int()
+    return output_hue, chroma, tone
 
 
 def generate_neovim_theme(
@@ -145,129 +171,50 @@ def generate_neovim_theme(
     Returns:
         Dict of Neovim color scheme
     """
-    neovim_colors = {}
-
     # Load Catppuccin palette (embedded or from file)
     cat = load_catppuccin_palette(catppuccin_path)
-    accent_argb = hex_to_argb(material_colors["primary_paletteKeyColor"])
+    neovim_colors = dict(_generate_neovim_colors(
+        material_colors["primary_paletteKeyColor"], tuple(sorted(cat.items()))
+    ))
+    # Transparency only blanks the base, so both variants share one palette
+    if transparent:
+        neovim_colors["base"] = "NONE"
+    return neovim_colors
 
-    # Harmonization parameters - INCREASED for more vibrant, purple-harmonized colors
-    BG_HARMONY = 0.88
-    UI_HARMONY = 0.15
-    SYNTAX_HARMONY = 0.85
-    TEXT_HARMONY = 0.46
 
-    BG_THRESH = 5.0
-    UI_THRESH = 10.0
-    SYNTAX_THRESH = 60.0
-    TEXT_THRESH = 8.0
+@functools.lru_cache(maxsize=8)
+def _generate_neovim_colors(accent_hex: str, palette: tuple) -> dict:
+    """
+    Opaque generate_neovim_theme palette for one accent, memoized
 
-    # Background / surfaces (keep Mocha depth)
-    neovim_colors["base"] = (
-        "NONE"
-        if transparent
-        else harmonize_hex(cat["base"], accent_argb, BG_HARMONY, BG_THRESH)
-    )
+    The result only depends on these inputs; callers get a copy.
+    """
+    cat = dict(palette)
+    accent_hue = hct_from_hex(accent_hex).hue
 
-    for k in [
-        "mantle",
-        "crust",
-        "surface0",
-        "surface1",
-        "surface2",
-        "overlay0",
-        "overlay1",
-        "overlay2",
-    ]:
-        neovim_colors[k] = harmonize_hex(cat[k], accent_argb, UI_HARMONY, UI_THRESH)
+    # Harmonize every color toward the accent in one batch
+    hcts = [harmonized_hct(cat[k], accent_hue, harmony, thresh) for k, harmony, thresh, _, _ in NEOVIM_SPEC]
+    argbs = dict(zip((row[0] for row in NEOVIM_SPEC), hct_array_to_argb(*zip(*hcts))))
 
-    # Text
-    for k in ["text", "subtext0", "subtext1"]:
-        neovim_colors[k] = harmonize_hex(cat[k], accent_argb, TEXT_HARMONY, TEXT_THRESH)
-
-    # Syntax accents - VIBRANT, highly saturated
-    syntax_colors = {
-        "rosewater": (SYNTAX_HARMONY, SYNTAX_THRESH, 90),
-        "flamingo": (SYNTAX_HARMONY, SYNTAX_THRESH, 90),
-        "pink": (SYNTAX_HARMONY, SYNTAX_THRESH, 92),
-        "mauve": (SYNTAX_HARMONY, SYNTAX_THRESH, 95),
-        "red": (SYNTAX_HARMONY, SYNTAX_THRESH, 90),
-        "maroon": (SYNTAX_HARMONY, SYNTAX_THRESH, 88),
-        "peach": (SYNTAX_HARMONY, SYNTAX_THRESH, 90),
-        "yellow": (SYNTAX_HARMONY, SYNTAX_THRESH, 92),
-        "green": (SYNTAX_HARMONY, SYNTAX_THRESH, 95),
-        "teal": (SYNTAX_HARMONY, SYNTAX_THRESH, 95),
-        "sky": (SYNTAX_HARMONY, SYNTAX_THRESH, 95),
-        "sapphire": (SYNTAX_HARMONY, SYNTAX_THRESH, 95),
-        "blue": (SYNTAX_HARMONY, SYNTAX_THRESH, 95),
-        "lavender": (SYNTAX_HARMONY, SYNTAX_THRESH, 95),
-    }
-
-    for k, (harmony, thresh, target_chroma) in syntax_colors.items():
-        raw = harmonize_hex(cat[k], accent_argb, harmony, thresh)
-        raw_argb = hex_to_argb(raw)
-        raw_hct = Hct.from_int(raw_argb)
-        neovim_colors[k] = argb_to_hex(
-            Hct.from_hct(raw_hct.hue, target_chroma, raw_hct.tone).to_int()
-        )
+    # Re-solve the syntax accents at their target chroma
+    targets = [(k, chroma) for k, _, _, chroma, _ in NEOVIM_SPEC if chroma is not None]
+    hues, _, tones = zip(*(hct_components(argbs[k]) for k, _ in targets))
+    argbs.update(zip((k for k, _ in targets), hct_array_to_argb(
+        hues, [chroma for _, chroma in targets], tones
+    )))
 
     # Force specific tones for better contrast and vibrancy
-    TONE_MAP = {
-        "mauve": 68,
-        "blue": 72,
-        "green": 70,
-        "teal": 72,
-        "yellow": 80,
-        "pink": 70,
-        "sapphire": 73,
-        "red": 65,
-        "peach": 72,
-    }
-
-    for k, tone in TONE_MAP.items():
-        neovim_colors[k] = argb_to_hex(force_tone(hex_to_argb(neovim_colors[k]), tone))
-
-    return neovim_colors
-
+    targets = [(k, tone) for k, _, _, _, tone in NEOVIM_SPEC if tone is not None]
+    hues, chromas, _ = zip(*(hct_components(argbs[k]) for k, _ in targets))
+    argbs.update(zip((k for k, _ in targets), hct_array_to_argb(
+        hues, chromas, [tone for _, tone in targets]
+    )))
 
-def write_neovim_colorscheme(
-    neovim_colors: dict, output_path: str = None, debug: bool = False
-):
-    """
-    Write Neovim colorscheme Lua file
+    return {k: argb_to_hex(argb) for k, argb in argbs.items()}
 
-    Args:
-        neovim_colors: Dict of color definitions
-        output_path: Optional custom output path
-        debug: Enable debug output
-    """
-    if output_path is None:
-        nvim_colors_dir = Path.home() / ".config" / "nvim" / "colors"
-        nvim_colors_dir.mkdir(parents=True, exist_ok=True)
-        output_path = str(nvim_colors_dir / "material_purple_mocha.lua")
 
-    # Generate rainbow delimiter colors
-    def boost_for_rainbow(argb: int, chroma_boost=1.4, min_tone=70) -> str:
-        hct = Hct.from_int(argb)
-        return argb_to_hex(
-            Hct.from_hct(
-                hct.hue, min(hct.chroma * chroma_boost, 90), max(hct.tone, min_tone)
-            ).to_int()
-        )
-
-    rainbow_colors = {
-        "red": boost_for_rainbow(hex_to_argb(neovim_colors["red"]), 1.3, 68),
-        "orange": boost_for_rainbow(hex_to_argb(neovim_colors["peach"]), 1.25, 72),
-        "yellow": boost_for_rainbow(hex_to_argb(neovim_colors["yellow"]), 1.25, 75),
-        "green": boost_for_rainbow(hex_to_argb(neovim_colors["green"]), 1.3, 70),
-        "cyan": boost_for_rainbow(hex_to_argb(neovim_colors["teal"]), 1.3, 70),
-        "blue": boost_for_rainbow(hex_to_argb(neovim_colors["blue"]), 1.3, 72),
-        "violet": boost_for_rainbow(hex_to_argb(neovim_colors["mauve"]), 1.4, 68),
-        "purple": boost_for_rainbow(hex_to_argb(neovim_colors["mauve"]), 1.4, 68),
-        "pink": boost_for_rainbow(hex_to_argb(neovim_colors["pink"]), 1.3, 70),
-    }
-
-    nvim_theme_content = f'''
+# Lua colorscheme; palette colors are {name}, rainbow delimiters {rainbow_name}
+_LUA_TEMPLATE = '''
 -- Auto-generated Neovim colorscheme
 -- Vibrant LSP-semantic based theme with Material You + Catppuccin Mocha
 
@@ -279,725 +226,624 @@ vim.g.colors_name = "material_purple_mocha"
 
 local colors = {{
   -- Base colors
-  base = "{neovim_colors['base']}",
-  mantle = "{neovim_colors['mantle']}",
-  crust = "{neovim_colors['crust']}",
+  base = "{base}",
+  mantle = "{mantle}",
+  crust = "{crust}",
 
   -- Surface colors
-  surface0 = "{neovim_colors['surface0']}",
-  surface1 = "{neovim_colors['surface1']}",
-  surface2 = "{neovim_colors['surface2']}",
+  surface0 = "{surface0}",
+  surface1 = "{surface1}",
+  surface2 = "{surface2}",
 
   -- Overlay colors
-  overlay0 = "{neovim_colors['overlay0']}",
-  overlay1 = "{neovim_colors['overlay1']}",
-  overlay2 = "{neovim_colors['overlay2']}",
+  overlay0 = "{overlay0}",
+  overlay1 = "{overlay1}",
+  overlay2 = "{overlay2}",
 
   -- Text colors
-  text = "{neovim_colors['text']}",
-  subtext1 = "{neovim_colors['subtext1']}",
-  subtext0 = "{neovim_colors['subtext0']}",
+  text = "{text}",
+  subtext1 = "{subtext1}",
+  subtext0 = "{subtext0}",
 
   -- Accent colors (VIBRANT)
-  rosewater = "{neovim_colors['rosewater']}",
-  flamingo = "{neovim_colors['flamingo']}",
-  pink = "{neovim_colors['pink']}",
-  mauve = "{neovim_colors['mauve']}",
-  red = "{neovim_colors['red']}",
-  maroon = "{neovim_colors['maroon']}",
-  peach = "{neovim_colors['peach']}",
-  yellow = "{neovim_colors['yellow']}",
-  green = "{neovim_colors['green']}",
-  teal = "{neovim_colors['teal']}",
-  sky = "{neovim_colors['sky']}",
-  sapphire = "{neovim_colors['sapphire']}",
-  blue = "{neovim_colors['blue']}",
-  lavender = "{neovim_colors['lavender']}",
+  rosewater = "{rosewater}",
+  flamingo = "{flamingo}",
+  pink = "{pink}",
+  mauve = "{mauve}",
+  red = "{red}",
+  maroon = "{maroon}",
+  peach = "{peach}",
+  yellow = "{yellow}",
+  green = "{green}",
+  teal = "{teal}",
+  sky = "{sky}",
+  sapphire = "{sapphire}",
+  blue = "{blue}",
+  lavender = "{lavender}",
 }}
 
-local function hi(group, opts)
-  local cmd = {{"highlight", group}}
-  if opts.fg then table.insert(cmd, "guifg=" .. opts.fg) end
-  if opts.bg then table.insert(cmd, "guibg=" .. opts.bg) end
-  if opts.sp then table.insert(cmd, "guisp=" .. opts.sp) end
-  if opts.style then table.insert(cmd, "gui=" .. opts.style) end
-  if opts.link then
-    vim.cmd(string.format("highlight! link %s %s", group, opts.link))
-  else
-    vim.cmd(table.concat(vim.tbl_flatten(cmd), " "))
-  end
-end
-
 -- ============================================================================
 -- BASE UI ELEMENTS
 -- ============================================================================
 local function setup_highlights()
-    hi("Normal", {{ fg = colors.text, bg = "NONE" }})
-    hi("NormalFloat", {{ fg = colors.text, bg = colors.mantle }})
-    hi("FloatBorder", {{ fg = colors.lavender, bg = "NONE"}})
-    hi("FloatTitle", {{ fg = colors.mauve, bg = "NONE", style = "bold,italic" }})
-    hi("Folded", {{ fg = "NONE", bg = "NONE" }})
-    hi("FoldColumn", {{ fg = colors.red }})
-    hi("UfoFoldedBg", {{ fg = colors.lavender }})
-    hi("UfoFoldedFg", {{ fg = colors.lavender }})
-
-    hi("Cursor", {{ fg = "NONE", bg = colors.text }})
-    hi("CursorLine", {{ bg = "NONE" }})
-    hi("CursorColumn", {{ bg = "NONE" }})
-    hi("ColorColumn", {{ bg = "NONE" }})
-    hi("CursorLineNr", {{ fg = colors.lavender, style = "bold" }})
-    hi("LineNr", {{ fg = colors.overlay0 }})
-    hi("LineNrAbove", {{ fg = colors.mauve }})
-    hi("LineNrBelow", {{ fg = colors.mauve }})
-    hi("SignColumn", {{ bg = "NONE" }})
-    hi("EndOfBuffer", {{ fg = colors.lavender }})
-    hi("NonText", {{ fg = colors.lavender }})
-
-    hi("StatusLine", {{ fg = colors.text, bg = "NONE" }})
-    hi("StatusLineNC", {{ fg = colors.overlay0, bg = "NONE" }})
-    hi("VertSplit", {{ fg = colors.surface0, bg = "NONE" }})
-    hi("WinSeparator", {{ fg = colors.surface0, bg = "NONE" }})
-
-    hi("Search", {{ fg = colors.red, bg = colors.mantle }})
-    hi("IncSearch", {{ fg = "NONE", bg = colors.mantle }})
-    hi("CurSearch", {{ fg = "NONE", bg = colors.mantle }})
-    hi("Visual", {{ bg = colors.surface1 }})
-    hi("VisualNOS", {{ bg = colors.surface1 }})
-
-    hi("Pmenu", {{ fg = colors.text, bg = "NONE" }})
-    hi("PmenuSel", {{ fg = "NONE", bg = colors.surface1, style = "bold" }})
-    hi("PmenuSbar", {{ bg = "NONE"}})
-    hi("PmenuThumb", {{ bg = "NONE" }})
-    hi("PmenuBorder", {{ fg = colors.lavender, bg = "NONE" }})
-
-    -- Completion menu kind highlights (nvim-cmp)
-    hi("CmpItemKindVariable", {{ fg = colors.text, bg = "NONE" }})
-    hi("CmpItemKindFunction", {{ fg = colors.blue, bg = "NONE" }})
-    hi("CmpItemKindMethod", {{ fg = colors.blue, bg = "NONE" }})
-    hi("CmpItemKindConstructor", {{ fg = colors.sapphire, bg = "NONE" }})
-    hi("CmpItemKindClass", {{ fg = colors.yellow, bg = "NONE" }})
-    hi("CmpItemKindInterface", {{ fg = colors.yellow, bg = "NONE" }})
-    hi("CmpItemKindStruct", {{ fg = colors.yellow, bg = "NONE" }})
-    hi("CmpItemKindEnum", {{ fg = colors.peach, bg = "NONE" }})
-    hi("CmpItemKindEnumMember", {{ fg = colors.teal, bg = "NONE" }})
-    hi("CmpItemKindModule", {{ fg = colors.sapphire, bg = "NONE" }})
-    hi("CmpItemKindProperty", {{ fg = colors.teal, bg = "NONE" }})
-    hi("CmpItemKindField", {{ fg = colors.teal, bg = "NONE" }})
-    hi("CmpItemKindTypeParameter", {{ fg = colors.flamingo, bg = "NONE" }})
-    hi("CmpItemKindConstant", {{ fg = colors.teal, bg = "NONE" }})
-    hi("CmpItemKindKeyword", {{ fg = colors.mauve, bg = "NONE" }})
-    hi("CmpItemKindSnippet", {{ fg = colors.pink, bg = "NONE" }})
-    hi("CmpItemKindText", {{ fg = colors.green, bg = "NONE" }})
-    hi("CmpItemKindFile", {{ fg = colors.blue, bg = "NONE" }})
-    hi("CmpItemKindFolder", {{ fg = colors.blue, bg = "NONE" }})
-    hi("CmpItemKindColor", {{ fg = colors.peach, bg = "NONE" }})
-    hi("CmpItemKindReference", {{ fg = colors.peach, bg = "NONE" }})
-    hi("CmpItemKindOperator", {{ fg = colors.sky, bg = "NONE" }})
-    hi("CmpItemKindUnit", {{ fg = colors.peach, bg = "NONE" }})
-    hi("CmpItemKindValue", {{ fg = colors.peach, bg = "NONE" }})
-
-    -- Completion item highlights
-    hi("CmpItemAbbr", {{ fg = colors.text, bg = "NONE" }})
-    hi("CmpItemAbbrDeprecated", {{ fg = colors.overlay0, bg = "NONE", style = "strikethrough" }})
-    hi("CmpItemAbbrMatch", {{ fg = colors.blue, bg = "NONE", style = "bold" }})
-    hi("CmpItemAbbrMatchFuzzy", {{ fg = colors.blue, bg = "NONE" }})
-    hi("CmpItemMenu", {{ fg = colors.subtext0, bg = "NONE", style = "italic" }})
-
-    hi("TabLine", {{ fg = colors.subtext0, bg = colors.mantle }})
-    hi("TabLineFill", {{ bg = "NONE" }})
-    hi("TabLineSel", {{ fg = colors.mauve, bg = "NONE" }})
-
-    hi("SagaBorder", {{ fg = colors.lavender, bg = "NONE" }})
-    hi("SagaNormal", {{ fg = colors.text, bg = colors.mantle }})
-    hi("SagaTitle", {{ fg = colors.mauve, bg = "NONE", style = "bold" }})
-    hi("SagaFolder", {{ fg = colors.blue }})
-    hi("SagaCount", {{ fg = colors.peach, bg = colors.surface0 }})
-    hi("SagaBeacon", {{ bg = colors.red }})
-    hi("SagaCollapse", {{ fg = colors.overlay2 }})
-    hi("SagaExpand", {{ fg = colors.overlay2 }})
-    hi("SagaFinderFname", {{ fg = colors.text }})
-    hi("SagaDetail", {{ fg = colors.subtext0, style = "italic" }})
-    hi("SagaInCurrent", {{ fg = colors.yellow }})
-    hi("SagaOutCurrent", {{ fg = colors.blue }})
-    hi("SagaSelect", {{ fg = colors.mauve, style = "bold" }})
-    hi("SagaSep", {{ fg = colors.overlay0 }})
-
-    -- ============================================================================
-    -- TREESITTER BASE SYNTAX (Fallbacks when LSP not available)
-    -- ============================================================================
-    hi("@variable", {{ fg = colors.text }})
-    hi("@variable.builtin", {{ fg = colors.red, style = "italic" }})
-    hi("@variable.parameter", {{ fg = colors.maroon, style = "italic" }})
-    hi("@variable.member", {{ fg = colors.teal }})
-
-    hi("@constant", {{ fg = colors.teal }})
-    hi("@constant.builtin", {{ fg = colors.red, style = "italic" }})
-    hi("@constant.macro", {{ fg = colors.sapphire }})
-
-    hi("@module", {{ fg = colors.sapphire, style = "italic" }})
-    hi("@label", {{ fg = colors.sapphire }})
-
-    hi("@string", {{ fg = colors.green }})
-    hi("@string.escape", {{ fg = colors.pink }})
-    hi("@string.regexp", {{ fg = colors.pink }})
-    hi("@character", {{ fg = colors.teal }})
-    hi("@character.special", {{ fg = colors.pink }})
-
-    hi("@number", {{ fg = colors.peach }})
-    hi("@number.float", {{ fg = colors.peach }})
-    hi("@boolean", {{ fg = colors.peach }})
-
-    hi("@function", {{ fg = colors.blue, style = "bold" }})
-    hi("@function.builtin", {{ fg = colors.blue, style = "italic" }})
-    hi("@function.macro", {{ fg = colors.mauve }})
-    hi("@function.method", {{ fg = colors.blue, style = "bold" }})
-    hi("@function.method.call", {{ fg = colors.blue }})
-
-    hi("@constructor", {{ fg = colors.sapphire }})
-    hi("@operator", {{ fg = "#00ffff" }})
-    hi("@operator.java", {{ fg = "#00ffff" }})
-
-    hi("@keyword", {{ fg = colors.mauve, style = "bold" }})
-    hi("@keyword.repeat.java", {{ fg = colors.mauve, style = "italic,bold"}})
-    hi("@keyword.conditional", {{ fg = colors.mauve, style = "bold,italic" }})
-    hi("@keyword.function", {{ fg = colors.mauve, style = "bold" }})
-    hi("@keyword.operator", {{ fg = colors.mauve }})
-    hi("@keyword.return", {{ fg = colors.mauve, style = "bold" }})
-
-    hi("@type", {{ fg = colors.yellow }})
-    hi("@type.builtin", {{ fg = colors.yellow, style = "italic" }})
-    hi("@type.qualifier", {{ fg = colors.mauve, style = "italic" }})
-
-    hi("@property", {{ fg = colors.teal }})
-    hi("@attribute", {{ fg = colors.yellow, style = "italic" }})
-    hi("@namespace", {{ fg = colors.sapphire, style = "italic" }})
-
-    hi("@punctuation.delimiter", {{ fg = colors.overlay2 }})
-    hi("@punctuation.bracket", {{ fg = colors.overlay2 }})
-    hi("@punctuation.special", {{ fg = colors.sky }})
-
-    hi("@comment", {{ fg = colors.pink, style = "italic" }})
-    hi("@comment.todo", {{ fg = colors.yellow, bg = "NONE", style = "bold" }})
-    hi("@comment.note", {{ fg = colors.blue, bg = colors.surface0, style = "bold" }})
-    hi("@comment.warning", {{ fg = colors.peach, bg = colors.surface0, style = "bold" }})
-    hi("@comment.error", {{ fg = colors.red, bg = colors.surface0, style = "bold" }})
-
-    hi("@tag", {{ fg = colors.mauve }})
-    hi("@tag.attribute", {{ fg = colors.teal, style = "italic" }})
-    hi("@tag.delimiter", {{ fg = colors.overlay2 }})
-
-    -- ============================================================================
-    -- LSP SEMANTIC TOKENS (Primary highlighting - overrides Treesitter)
-    -- ============================================================================
-
-    -- Variables and Parameters
-    hi("@lsp.type.variable", {{ fg = colors.text }})
-    hi("@lsp.type.parameter", {{ fg = colors.red, style = "italic" }})
-    hi("@lsp.typemod.variable.readonly", {{ fg = colors.teal }})
-    hi("@lsp.typemod.variable.declaration", {{ fg = colors.maroon, style = "italic" }})
-    hi("@lsp.typemod.variable.static", {{ fg = colors.flamingo }})
-    hi("@lsp.typemod.variable.global", {{ fg = colors.flamingo }})
-
-    -- Properties and Fields
-    hi("@lsp.type.property", {{ fg = colors.text }})
-    hi("@lsp.typemod.property.static", {{ fg = colors.teal, style = "italic" }})
-    hi("@lsp.typemod.property.static.java", {{ fg = colors.teal, style = "italic,bold" }})
-
-    -- Functions and Methods
-    hi("@lsp.type.function", {{ fg = colors.blue, style = "bold" }})
-    hi("@lsp.type.method.java", {{ fg = colors.sky, style = "italic" }})
-    hi("@lsp.type.method", {{ fg = colors.sapphire, style = "bold" }})
-    hi("@lsp.typemod.function.static", {{ fg = colors.sky, style = "bold" }})
-    hi("@lsp.typemod.method.static", {{ fg = colors.sapphire, style = "italic" }})
-
-    -- Types and Classes
-    hi("@lsp.type.class", {{ fg = colors.yellow, style = "bold" }})
-    hi("@lsp.type.interface", {{ fg = colors.yellow, style = "italic" }})
-    hi("@lsp.type.struct", {{ fg = colors.yellow }})
-    hi("@lsp.type.enum", {{ fg = colors.peach }})
-    hi("@lsp.type.enumMember", {{ fg = colors.teal }})
-    hi("@lsp.type.type", {{ fg = colors.yellow }})
-    hi("@lsp.type.typeParameter", {{ fg = colors.flamingo, style = "italic" }})
-
-    -- Namespaces and Modules
-    hi("@lsp.type.namespace", {{ fg = colors.sapphire, style = "italic" }})
-    hi("@lsp.type.namespace.java", {{ fg = colors.sapphire, style = "italic" }})
-    hi("@lsp.mod.importDeclaration", {{ fg = colors.yellow, style = "italic" }})
-    hi("@lsp.mod.importDeclaration.java", {{ fg = colors.yellow, style = "italic" }})
-    hi("@lsp.typemod.namespace.importDeclaration.java", {{ fg = colors.yellow, style = "italic" }})
-
-    -- Macros and Preprocessor
-    hi("@lsp.type.macro", {{ fg = colors.sapphire }})
-    hi("@lsp.typemod.macro.globalScope", {{ fg = colors.sapphire }})
-    hi("@lsp.typemod.macro.globalScope.cpp", {{ fg = colors.sapphire }})
+    local H = {{
+        ["Normal"] = {{ fg = colors.text, bg = "NONE" }},
+        ["NormalFloat"] = {{ fg = colors.text, bg = colors.mantle }},
+        ["FloatBorder"] = {{ fg = colors.lavender, bg = "NONE"}},
+        ["FloatTitle"] = {{ fg = colors.mauve, bg = "NONE", bold = true, italic = true }},
+        ["Folded"] = {{ fg = "NONE", bg = "NONE" }},
+        ["FoldColumn"] = {{ fg = colors.red }},
+        ["UfoFoldedBg"] = {{ fg = colors.lavender }},
+        ["UfoFoldedFg"] = {{ fg = colors.lavender }},
+
+        ["Cursor"] = {{ fg = "NONE", bg = colors.text }},
+        ["CursorLine"] = {{ bg = "NONE" }},
+        ["CursorColumn"] = {{ bg = "NONE" }},
+        ["ColorColumn"] = {{ bg = "NONE" }},
+        ["CursorLineNr"] = {{ fg = colors.lavender, bold = true }},
+        ["LineNr"] = {{ fg = colors.overlay0 }},
+        ["LineNrAbove"] = {{ fg = colors.mauve }},
+        ["LineNrBelow"] = {{ fg = colors.mauve }},
+        ["SignColumn"] = {{ bg = "NONE" }},
+        ["EndOfBuffer"] = {{ fg = colors.lavender }},
+        ["NonText"] = {{ fg = colors.lavender }},
+
+        ["StatusLine"] = {{ fg = colors.text, bg = "NONE" }},
+        ["StatusLineNC"] = {{ fg = colors.overlay0, bg = "NONE" }},
+        ["VertSplit"] = {{ fg = colors.surface0, bg = "NONE" }},
+        ["WinSeparator"] = {{ fg = colors.surface0, bg = "NONE" }},
+
+        ["Search"] = {{ fg = colors.red, bg = colors.mantle }},
+        ["IncSearch"] = {{ fg = "NONE", bg = colors.mantle }},
+        ["CurSearch"] = {{ fg = "NONE", bg = colors.mantle }},
+        ["Visual"] = {{ bg = colors.surface1 }},
+        ["VisualNOS"] = {{ bg = colors.surface1 }},
+
+        ["Pmenu"] = {{ fg = colors.text, bg = "NONE" }},
+        ["PmenuSel"] = {{ fg = "NONE", bg = colors.surface1, bold = true }},
+        ["PmenuSbar"] = {{ bg = "NONE"}},
+        ["PmenuThumb"] = {{ bg = "NONE" }},
+        ["PmenuBorder"] = {{ fg = colors.lavender, bg = "NONE" }},
+
+        -- Completion menu kind highlights (nvim-cmp)
+        ["CmpItemKindVariable"] = {{ fg = colors.text, bg = "NONE" }},
+        ["CmpItemKindFunction"] = {{ fg = colors.blue, bg = "NONE" }},
+        ["CmpItemKindMethod"] = {{ fg = colors.blue, bg = "NONE" }},
+        ["CmpItemKindConstructor"] = {{ fg = colors.sapphire, bg = "NONE" }},
+        ["CmpItemKindClass"] = {{ fg = colors.yellow, bg = "NONE" }},
+        ["CmpItemKindInterface"] = {{ fg = colors.yellow, bg = "NONE" }},
+        ["CmpItemKindStruct"] = {{ fg = colors.yellow, bg = "NONE" }},
+        ["CmpItemKindEnum"] = {{ fg = colors.peach, bg = "NONE" }},
+        ["CmpItemKindEnumMember"] = {{ fg = colors.teal, bg = "NONE" }},
+        ["CmpItemKindModule"] = {{ fg = colors.sapphire, bg = "NONE" }},
+        ["CmpItemKindProperty"] = {{ fg = colors.teal, bg = "NONE" }},
+        ["CmpItemKindField"] = {{ fg = colors.teal, bg = "NONE" }},
+        ["CmpItemKindTypeParameter"] = {{ fg = colors.flamingo, bg = "NONE" }},
+        ["CmpItemKindConstant"] = {{ fg = colors.teal, bg = "NONE" }},
+        ["CmpItemKindKeyword"] = {{ fg = colors.mauve, bg = "NONE" }},
+        ["CmpItemKindSnippet"] = {{ fg = colors.pink, bg = "NONE" }},
+        ["CmpItemKindText"] = {{ fg = colors.green, bg = "NONE" }},
+        ["CmpItemKindFile"] = {{ fg = colors.blue, bg = "NONE" }},
+        ["CmpItemKindFolder"] = {{ fg = colors.blue, bg = "NONE" }},
+        ["CmpItemKindColor"] = {{ fg = colors.peach, bg = "NONE" }},
+        ["CmpItemKindReference"] = {{ fg = colors.peach, bg = "NONE" }},
+        ["CmpItemKindOperator"] = {{ fg = colors.sky, bg = "NONE" }},
+        ["CmpItemKindUnit"] = {{ fg = colors.peach, bg = "NONE" }},
+        ["CmpItemKindValue"] = {{ fg = colors.peach, bg = "NONE" }},
+
+        -- Completion item highlights
+        ["CmpItemAbbr"] = {{ fg = colors.text, bg = "NONE" }},
+        ["CmpItemAbbrDeprecated"] = {{ fg = colors.overlay0, bg = "NONE", strikethrough = true }},
+        ["CmpItemAbbrMatch"] = {{ fg = colors.blue, bg = "NONE", bold = true }},
+        ["CmpItemAbbrMatchFuzzy"] = {{ fg = colors.blue, bg = "NONE" }},
+        ["CmpItemMenu"] = {{ fg = colors.subtext0, bg = "NONE", italic = true }},
+
+        ["TabLine"] = {{ fg = colors.subtext0, bg = colors.mantle }},
+        ["TabLineFill"] = {{ bg = "NONE" }},
+        ["TabLineSel"] = {{ fg = colors.mauve, bg = "NONE" }},
+
+        ["SagaBorder"] = {{ fg = colors.lavender, bg = "NONE" }},
+        ["SagaNormal"] = {{ fg = colors.text, bg = colors.mantle }},
+        ["SagaTitle"] = {{ fg = colors.mauve, bg = "NONE", bold = true }},
+        ["SagaFolder"] = {{ fg = colors.blue }},
+        ["SagaCount"] = {{ fg = colors.peach, bg = colors.surface0 }},
+        ["SagaBeacon"] = {{ bg = colors.red }},
+        ["SagaCollapse"] = {{ fg = colors.overlay2 }},
+        ["SagaExpand"] = {{ fg = colors.overlay2 }},
+        ["SagaFinderFname"] = {{ fg = colors.text }},
+        ["SagaDetail"] = {{ fg = colors.subtext0, italic = true }},
+        ["SagaInCurrent"] = {{ fg = colors.yellow }},
+        ["SagaOutCurrent"] = {{ fg = colors.blue }},
+        ["SagaSelect"] = {{ fg = colors.mauve, bold = true }},
+        ["SagaSep"] = {{ fg = colors.overlay0 }},
+
+        -- ============================================================================
+        -- TREESITTER BASE SYNTAX (Fallbacks when LSP not available)
+        -- ============================================================================
+        ["@variable"] = {{ fg = colors.text }},
+        ["@variable.builtin"] = {{ fg = colors.red, italic = true }},
+        ["@variable.parameter"] = {{ fg = colors.maroon, italic = true }},
+        ["@variable.member"] = {{ fg = colors.teal }},
+
+        ["@constant"] = {{ fg = colors.teal }},
+        ["@constant.builtin"] = {{ fg = colors.red, italic = true }},
+        ["@constant.macro"] = {{ fg = colors.sapphire }},
+
+        ["@module"] = {{ fg = colors.sapphire, italic = true }},
+        ["@label"] = {{ fg = colors.sapphire }},
+
+        ["@string"] = {{ fg = colors.green }},
+        ["@string.escape"] = {{ fg = colors.pink }},
+        ["@string.regexp"] = {{ fg = colors.pink }},
+        ["@character"] = {{ fg = colors.teal }},
+        ["@character.special"] = {{ fg = colors.pink }},
+
+        ["@number"] = {{ fg = colors.peach }},
+        ["@number.float"] = {{ fg = colors.peach }},
+        ["@boolean"] = {{ fg = colors.peach }},
+
+        ["@function"] = {{ fg = colors.blue, bold = true }},
+        ["@function.builtin"] = {{ fg = colors.blue, italic = true }},
+        ["@function.macro"] = {{ fg = colors.mauve }},
+        ["@function.method"] = {{ fg = colors.blue, bold = true }},
+        ["@function.method.call"] = {{ fg = colors.blue }},
+
+        ["@constructor"] = {{ fg = colors.sapphire }},
+        ["@operator"] = {{ fg = "#00ffff" }},
+        ["@operator.java"] = {{ fg = "#00ffff" }},
+
+        ["@keyword"] = {{ fg = colors.mauve, bold = true }},
+        ["@keyword.repeat.java"] = {{ fg = colors.mauve, italic = true, bold = true}},
+        ["@keyword.conditional"] = {{ fg = colors.mauve, bold = true, italic = true }},
+        ["@keyword.function"] = {{ fg = colors.mauve, bold = true }},
+        ["@keyword.operator"] = {{ fg = colors.mauve }},
+        ["@keyword.return"] = {{ fg = colors.mauve, bold = true }},
+
+        ["@type"] = {{ fg = colors.yellow }},
+        ["@type.builtin"] = {{ fg = colors.yellow, italic = true }},
+        ["@type.qualifier"] = {{ fg = colors.mauve, italic = true }},
+
+        ["@property"] = {{ fg = colors.teal }},
+        ["@attribute"] = {{ fg = colors.yellow, italic = true }},
+        ["@namespace"] = {{ fg = colors.sapphire, italic = true }},
+
+        ["@punctuation.delimiter"] = {{ fg = colors.overlay2 }},
+        ["@punctuation.bracket"] = {{ fg = colors.overlay2 }},
+        ["@punctuation.special"] = {{ fg = colors.sky }},
+
+        ["@comment"] = {{ fg = colors.pink, italic = true }},
+        ["@comment.todo"] = {{ fg = colors.yellow, bg = "NONE", bold = true }},
+        ["@comment.note"] = {{ fg = colors.blue, bg = colors.surface0, bold = true }},
+        ["@comment.warning"] = {{ fg = colors.peach, bg = colors.surface0, bold = true }},
+        ["@comment.error"] = {{ fg = colors.red, bg = colors.surface0, bold = true }},
+
+        ["@tag"] = {{ fg = colors.mauve }},
+        ["@tag.attribute"] = {{ fg = colors.teal, italic = true }},
+        ["@tag.delimiter"] = {{ fg = colors.overlay2 }},
+
+        -- ============================================================================
+        -- LSP SEMANTIC TOKENS (Primary highlighting - overrides Treesitter)
+        -- ============================================================================
+
+        -- Variables and Parameters
+        ["@lsp.type.variable"] = {{ fg = colors.text }},
+        ["@lsp.type.parameter"] = {{ fg = colors.red, italic = true }},
+        ["@lsp.typemod.variable.readonly"] = {{ fg = colors.teal }},
+        ["@lsp.typemod.variable.declaration"] = {{ fg = colors.maroon, italic = true }},
+        ["@lsp.typemod.variable.static"] = {{ fg = colors.flamingo }},
+        ["@lsp.typemod.variable.global"] = {{ fg = colors.flamingo }},
+
+        -- Properties and Fields
+        ["@lsp.type.property"] = {{ fg = colors.text }},
+        ["@lsp.typemod.property.static"] = {{ fg = colors.teal, italic = true }},
+        ["@lsp.typemod.property.static.java"] = {{ fg = colors.teal, italic = true, bold = true }},
+
+        -- Functions and Methods
+        ["@lsp.type.function"] = {{ fg = colors.blue, bold = true }},
+        ["@lsp.type.method.java"] = {{ fg = colors.sky, italic = true }},
+        ["@lsp.type.method"] = {{ fg = colors.sapphire, bold = true }},
+        ["@lsp.typemod.function.static"] = {{ fg = colors.sky, bold = true }},
+        ["@lsp.typemod.method.static"] = {{ fg = colors.sapphire, italic = true }},
+
+        -- Types and Classes
+        ["@lsp.type.class"] = {{ fg = colors.yellow, bold = true }},
+        ["@lsp.type.interface"] = {{ fg = colors.yellow, italic = true }},
+        ["@lsp.type.struct"] = {{ fg = colors.yellow }},
+        ["@lsp.type.enum"] = {{ fg = colors.peach }},
+        ["@lsp.type.enumMember"] = {{ fg = colors.teal }},
+        ["@lsp.type.type"] = {{ fg = colors.yellow }},
+        ["@lsp.type.typeParameter"] = {{ fg = colors.flamingo, italic = true }},
+
+        -- Namespaces and Modules
+        ["@lsp.type.namespace"] = {{ fg = colors.sapphire, italic = true }},
+        ["@lsp.type.namespace.java"] = {{ fg = colors.sapphire, italic = true }},
+        ["@lsp.mod.importDeclaration"] = {{ fg = colors.yellow, italic = true }},
+        ["@lsp.mod.importDeclaration.java"] = {{ fg = colors.yellow, italic = true }},
+        ["@lsp.typemod.namespace.importDeclaration.java"] = {{ fg = colors.yellow, italic = true }},
+
+        -- Macros and Preprocessor
+        ["@lsp.type.macro"] = {{ fg = colors.sapphire }},
+        ["@lsp.typemod.macro.globalScope"] = {{ fg = colors.sapphire }},
+        ["@lsp.typemod.macro.globalScope.cpp"] = {{ fg = colors.sapphire }},
+
+        -- Decorators and Annotations
+        ["@lsp.type.decorator"] = {{ fg = colors.yellow, italic = true }},
+        ["@lsp.type.annotation"] = {{ fg = colors.yellow, italic = true }},
+
+        -- Keywords (when LSP provides them)
+        ["@lsp.type.keyword"] = {{ fg = colors.mauve, bold = true }},
+        ["@lsp.typemod.keyword.controlFlow"] = {{ fg = colors.pink, bold = true }},
 
     -- Decorators and Annotations
-    hi("@lsp.type.decorator", {{ fg = colors.yellow, style = "italic" }})
-    hi("@lsp.type.annotation", {{ fg = colors.yellow, style = "italic" }})
-
-    -- Keywords (when LSP provides them)
-    hi("@lsp.type.keyword", {{ fg = colors.mauve, style = "bold" }})
-    hi("@lsp.typemod.keyword.controlFlow", {{ fg = colors.pink, style = "bold" }})
-
--- Decorators and Annotations
-    hi("@lsp.type.decorator", {{ fg = colors.yellow, style = "italic" }})
-    hi("@lsp.type.annotation", {{ fg = colors.yellow, style = "italic" }})
-
-    -- Keywords (when LSP provides them)
-    hi("@lsp.type.keyword", {{ fg = colors.mauve, style = "bold" }})
-    hi("@lsp.typemod.keyword.controlFlow", {{ fg = colors.pink, style = "bold" }})
+        ["@lsp.type.decorator"] = {{ fg = colors.yellow, italic = true }},
+        ["@lsp.type.annotation"] = {{ fg = colors.yellow, italic = true }},
+
+        -- Keywords (when LSP provides them)
+        ["@lsp.type.keyword"] = {{ fg = colors.mauve, bold = true }},
+        ["@lsp.typemod.keyword.controlFlow"] = {{ fg = colors.pink, bold = true }},
+
+        -- ============================================================================
+        -- LANGUAGE-SPECIFIC LSP SEMANTIC TOKENS
+        -- ============================================================================
+
+        -- Python-specific
+        ["@lsp.type.selfParameter.python"] = {{ fg = colors.red, italic = true }},
+        ["@lsp.type.clsParameter.python"] = {{ fg = colors.red, italic = true }},
+        ["@lsp.type.decorator.python"] = {{ fg = colors.yellow, italic = true }},
+        ["@lsp.typemod.function.builtin.python"] = {{ fg = colors.blue, italic = true }},
+        ["@lsp.type.method.python"] = {{ fg = colors.sky, italic = true }},
+        ["@lsp.typemod.property.static.python"] = {{ fg = colors.teal, italic = true, bold = true }},
+
+        -- Go-specific
+        ["@lsp.type.namespace.go"] = {{ fg = colors.sapphire, italic = true }},
+        ["@lsp.typemod.variable.exported.go"] = {{ fg = colors.flamingo }},
+        ["@lsp.typemod.function.exported.go"] = {{ fg = colors.sky, bold = true }},
+        ["@lsp.typemod.method.exported.go"] = {{ fg = colors.sapphire, bold = true }},
+        ["@lsp.typemod.type.exported.go"] = {{ fg = colors.yellow, bold = true }},
+        ["@lsp.type.typeParameter.go"] = {{ fg = colors.flamingo, italic = true }},
+        ["@lsp.type.method.go"] = {{ fg = colors.sky, italic = true }},
+        ["@lsp.mod.importDeclaration.go"] = {{ fg = colors.yellow, italic = true }},
+
+        -- C/C++-specific
+        ["@lsp.type.concept.cpp"] = {{ fg = colors.yellow, italic = true }},
+        ["@lsp.typemod.variable.functionScope.cpp"] = {{ fg = colors.text }},
+        ["@lsp.typemod.variable.fileScope.cpp"] = {{ fg = colors.flamingo }},
+        ["@lsp.typemod.function.functionScope.cpp"] = {{ fg = colors.blue, bold = true }},
+        ["@lsp.type.templateParameter.cpp"] = {{ fg = colors.flamingo, italic = true }},
+        ["@lsp.type.namespace.cpp"] = {{ fg = colors.sapphire, italic = true }},
+        ["@lsp.type.method.cpp"] = {{ fg = colors.sky, italic = true }},
+        ["@lsp.typemod.property.static.cpp"] = {{ fg = colors.teal, italic = true, bold = true }},
+        ["@lsp.typemod.macro.globalScope.c"] = {{ fg = colors.sapphire }},
+
+        -- Bash-specific
+        ["@lsp.type.variable.bash"] = {{ fg = colors.text }},
+        ["@lsp.type.function.bash"] = {{ fg = colors.blue, bold = true }},
+        ["@lsp.typemod.variable.readonly.bash"] = {{ fg = colors.teal }},
+
+        -- ============================================================================
+        -- DIAGNOSTIC
+        -- ============================================================================
+        ["DiagnosticError"] = {{ fg = colors.red }},
+        ["DiagnosticWarn"] = {{ fg = colors.yellow }},
+        ["DiagnosticInfo"] = {{ fg = colors.blue }},
+        ["DiagnosticHint"] = {{ fg = colors.teal }},
+        ["DiagnosticOk"] = {{ fg = colors.green }},
+
+        ["DiagnosticVirtualTextError"] = {{ fg = colors.red, bg = "NONE" }},
+        ["DiagnosticVirtualTextWarn"] = {{ fg = colors.yellow, bg = "NONE" }},
+        ["DiagnosticVirtualTextInfo"] = {{ fg = colors.blue, bg = "NONE" }},
+        ["DiagnosticVirtualTextHint"] = {{ fg = colors.teal, bg = "NONE" }},
+
+        ["DiagnosticUnderlineError"] = {{ sp = colors.red, undercurl = true }},
+        ["DiagnosticUnderlineWarn"] = {{ sp = colors.yellow, undercurl = true }},
+        ["DiagnosticUnderlineInfo"] = {{ sp = colors.blue, undercurl = true }},
+        ["DiagnosticUnderlineHint"] = {{ sp = colors.teal, undercurl = true }},
+
+        -- ============================================================================
+        -- LSP REFERENCES
+        -- ============================================================================
+        ["LspReferenceText"] = {{ bg = colors.mantle }},
+        ["LspReferenceRead"] = {{ bg = colors.mantle }},
+        ["LspReferenceWrite"] = {{ bg = colors.surface0, bold = true }},
+
+        ["MatchParen"] = {{ bg = colors.mantle }},
+        ["MatchParenCur"] = {{ bg = colors.mantle }},
+
+        -- ============================================================================
+        -- PLUGIN: TELESCOPE
+        -- ============================================================================
+{plugin_telescope}
+        -- ============================================================================
+        -- PLUGIN: NVIM-TREE / NEO-TREE
+        -- ============================================================================
+{plugin_nvim_tree}
+{plugin_neo_tree}
+        ["DressingInput"] = {{ fg = colors.text, bg = colors.mantle }},
+        ["DressingInputBorder"] = {{ fg = colors.lavender, bg = "NONE" }},
+        ["DressingInputTitle"] = {{ fg = colors.mauve, bg = "NONE", bold = true }},
+        ["DressingInputPrompt"] = {{ fg = colors.text, bg = "NONE" }},  -- This is the key one!
+        ["DressingInputText"] = {{ fg = colors.text, bg = "NONE" }},
+        ["Prompt"] = {{ fg = colors.text, bg = "NONE" }},
+        ["Question"] = {{ fg = colors.text, bg = "NONE" }},
+
+        -- ============================================================================
+        -- PLUGIN: INDENT-BLANKLINE
+        -- ============================================================================
+{plugin_indent_blankline}
+        -- ============================================================================
+        -- PLUGIN: WHICH-KEY
+        -- ============================================================================
+{plugin_which_key}
+        -- ============================================================================
+        -- PLUGIN: NOTIFY
+        -- ============================================================================
+{plugin_notify}
+        -- ============================================================================
+        -- PLUGIN: RAINBOW DELIMITERS
+        -- ============================================================================
+{plugin_rainbow_delimiters}
+        -- ============================================================================
+        -- PLUGIN: RENDER-MARKDOWN
+        -- ============================================================================
+{plugin_render_markdown}
+        -- ============================================================================
+        -- PLUGIN: BUFFERLINE / BARBAR
+        -- ============================================================================
+        ["BufferLineFill"] = {{ bg = "NONE" }},
+        ["BufferLineBackground"] = {{ fg = colors.overlay0, bg = "NONE" }},
+        ["BufferLineBuffer"] = {{ fg = colors.overlay0, bg = "NONE" }},
+        ["BufferLineBufferVisible"] = {{ fg = colors.text, bg = "NONE" }},
+        ["BufferLineBufferSelected"] = {{ fg = colors.mauve, bg = "NONE", bold = true }},
+        ["BufferLineTab"] = {{ fg = colors.overlay0, bg = "NONE" }},
+        ["BufferLineTabSelected"] = {{ fg = colors.mauve, bg = "NONE", bold = true }},
+        ["BufferLineSeparator"] = {{ fg = colors.surface0, bg = "NONE" }},
+        ["BufferLineSeparatorVisible"] = {{ fg = colors.surface0, bg = "NONE" }},
+        ["BufferLineSeparatorSelected"] = {{ fg = colors.surface0, bg = "NONE" }},
+
+        -- Barbar plugin
+        ["BufferCurrent"] = {{ fg = colors.text, bg = "NONE", bold = true }},
+        ["BufferCurrentIndex"] = {{ fg = colors.mauve, bg = "NONE" }},
+        ["BufferCurrentMod"] = {{ fg = colors.yellow, bg = "NONE" }},
+        ["BufferCurrentSign"] = {{ fg = colors.mauve, bg = "NONE" }},
+        ["BufferCurrentTarget"] = {{ fg = colors.red, bg = "NONE" }},
+        ["BufferVisible"] = {{ fg = colors.text, bg = "NONE" }},
+        ["BufferVisibleIndex"] = {{ fg = colors.overlay0, bg = "NONE" }},
+        ["BufferVisibleMod"] = {{ fg = colors.yellow, bg = "NONE" }},
+        ["BufferVisibleSign"] = {{ fg = colors.overlay0, bg = "NONE" }},
+        ["BufferVisibleTarget"] = {{ fg = colors.red, bg = "NONE" }},
+        ["BufferInactive"] = {{ fg = colors.overlay0, bg = "NONE" }},
+        ["BufferInactiveIndex"] = {{ fg = colors.overlay0, bg = "NONE" }},
+        ["BufferInactiveMod"] = {{ fg = colors.lavender, bg = "NONE" }},
+        ["BufferInactiveSign"] = {{ fg = colors.overlay0, bg = "NONE" }},
+        ["BufferInactiveTarget"] = {{ fg = colors.red, bg = "NONE" }},
+        ["BufferTabpages"] = {{ fg = colors.mauve, bg = "NONE", bold = true }},
+        ["BufferTabpageFill"] = {{ bg = "NONE" }},
+
+        -- Overseer (task runner) - often appears in bufferline
+        ["OverseerTask"] = {{ fg = colors.blue, bg = "NONE" }},
+        ["OverseerTaskBorder"] = {{ fg = colors.blue, bg = "NONE" }},
+        ["OverseerRunning"] = {{ fg = colors.yellow, bg = "NONE" }},
+        ["OverseerSuccess"] = {{ fg = colors.green, bg = "NONE" }},
+        ["OverseerCanceled"] = {{ fg = colors.overlay0, bg = "NONE" }},
+        ["OverseerFailure"] = {{ fg = colors.red, bg = "NONE" }},
+        ["OverseerBorder"] = {{ fg = colors.lavender, bg = "NONE" }},
+        ["OverseerNormal"] = {{ fg = colors.text, bg = colors.surface0 }},
+
+        -- Additional top bar highlights (in case it's something else)
+        ["WinBar"] = {{ fg = "NONE", bg = "NONE" }},
+        ["SatelliteBar"] = {{ fg = "NONE", bg = "NONE" }},
+        ["SatelliteCursor"] = {{ fg = "NONE", bg = "NONE" }},
+        ["NeoTreeTitleBar"] = {{ fg = colors.mantle, bg = colors.teal }},
+        ["NeoTreeDimmedText"] = {{ fg = colors.red }},
+        ["NeoTreeMessage"] = {{ fg = colors.subtext0 }},
+        ["NeoTreeFloatNormal"] = {{ fg = colors.red }},
+        ["NeoTreeFloatBorder"] = {{ fg = colors.teal }},
+        ["NeoTreeFloatTitle"] = {{ fg = colors.red }},
+        ["NvimScrollbarHandle"] = {{ fg = "NONE", bg = "NONE" }},
+        ["NvimScrollbarCursor"] = {{ fg = "NONE", bg = "NONE" }},
+        ["NvimScrollbarError"] = {{ fg = "NONE", bg = "NONE" }},
+        ["NvimScrollbarWarn"] = {{ fg = "NONE", bg = "NONE" }},
+        ["NvimScrollbarInfo"] = {{ fg = "NONE", bg = "NONE" }},
+        ["NvimScrollbarHint"] = {{fg = "NONE", bg = "NONE" }},
+        ["NeoTreeScrollbar"] = {{ fg = "NONE", bg = "NONE" }},
+        ["NeoTreeScrollbarThumb"] = {{ fg = "NONE", bg = "NONE" }},
+        ["WinScrollbar"] = {{ fg = "NONE", bg = "NONE" }},
+        ["WinScrollbarThumb"] = {{ fg = "NONE", bg = "NONE" }},
+        ["WinBarNC"] = {{ fg = "NONE", bg = "NONE" }},
+        ["Title"] = {{ fg = colors.blue, bg = "NONE" }},
+        ["BufferLineDevIconLua"] = {{ bg = "NONE" }},
+        ["BufferLineDevIconDefault"] = {{ bg = "NONE" }},
+
+
+        -- ============================================================================
+        -- TEXT
+        -- ============================================================================
+        ["Comment"] = {{ fg = colors.pink }},
+        ["Constant"] = {{ fg = colors.teal }},
+        -- ============================================================================
+        -- PLUGIN: ALPHA (Dashboard)
+        -- ============================================================================
+        ["DashboardHeader"] = {{ fg = colors.sapphire }},
+        ["DashboardFooter"] = {{ fg = colors.mauve }},
+        ["AlphaShortcut"] = {{ fg = colors.red }},
+        ["AlphaIconNew"] = {{ fg = colors.blue }},
+        ["AlphaIconRecent"] = {{ fg = colors.pink }},
+        ["AlphaIconYazi"] = {{ fg = colors.peach }},
+        ["AlphaIconSessions"] = {{ fg = colors.green }},
+        ["AlphaIconProjects"] = {{ fg = colors.mauve }},
+        ["AlphaIconQuit"] = {{ fg = colors.red }},
+
+
+        ["DiffAdd"] = {{ fg = colors.green, bg = "NONE" }},
+        ["DiffChange"] = {{ fg = colors.blue, bg = "NONE" }},
+        ["DiffDelete"] = {{ fg = colors.red, bg = "NONE" }},
+        ["DiffText"] = {{ fg = colors.yellow, bg = "NONE", bold = true }},
+
+        -- Git signs in the gutter
+        ["GitSignsAdd"] = {{ fg = colors.green, bg = "NONE" }},
+        ["GitSignsChange"] = {{ fg = colors.blue, bg = "NONE" }},
+        ["GitSignsDelete"] = {{ fg = colors.red, bg = "NONE" }},
+
+        -- For syntax highlighting of color hex codes in your editor
+        -- This will make the bright red/green hex codes themselves appear in purple tones
+        ["@string.special"] = {{ fg = colors.green }},  -- For color strings like "#FF0000"
+        ["@number.css"] = {{ fg = colors.peach }},
 
     -- ============================================================================
-    -- LANGUAGE-SPECIFIC LSP SEMANTIC TOKENS
+    -- PLUGIN: LUALINE
     -- ============================================================================
-
-    -- Python-specific
-    hi("@lsp.type.selfParameter.python", {{ fg = colors.red, style = "italic" }})
-    hi("@lsp.type.clsParameter.python", {{ fg = colors.red, style = "italic" }})
-    hi("@lsp.type.decorator.python", {{ fg = colors.yellow, style = "italic" }})
-    hi("@lsp.typemod.function.builtin.python", {{ fg = colors.blue, style = "italic" }})
-    hi("@lsp.type.method.python", {{ fg = colors.sky, style = "italic" }})
-    hi("@lsp.typemod.property.static.python", {{ fg = colors.teal, style = "italic,bold" }})
-
-    -- Go-specific
-    hi("@lsp.type.namespace.go", {{ fg = colors.sapphire, style = "italic" }})
-    hi("@lsp.typemod.variable.exported.go", {{ fg = colors.flamingo }})
-    hi("@lsp.typemod.function.exported.go", {{ fg = colors.sky, style = "bold" }})
-    hi("@lsp.typemod.method.exported.go", {{ fg = colors.sapphire, style = "bold" }})
-    hi("@lsp.typemod.type.exported.go", {{ fg = colors.yellow, style = "bold" }})
-    hi("@lsp.type.typeParameter.go", {{ fg = colors.flamingo, style = "italic" }})
-    hi("@lsp.type.method.go", {{ fg = colors.sky, style = "italic" }})
-    hi("@lsp.mod.importDeclaration.go", {{ fg = colors.yellow, style = "italic" }})
-
-    -- C/C++-specific
-    hi("@lsp.type.concept.cpp", {{ fg = colors.yellow, style = "italic" }})
-    hi("@lsp.typemod.variable.functionScope.cpp", {{ fg = colors.text }})
-    hi("@lsp.typemod.variable.fileScope.cpp", {{ fg = colors.flamingo }})
-    hi("@lsp.typemod.function.functionScope.cpp", {{ fg = colors.blue, style = "bold" }})
-    hi("@lsp.type.templateParameter.cpp", {{ fg = colors.flamingo, style = "italic" }})
-    hi("@lsp.type.namespace.cpp", {{ fg = colors.sapphire, style = "italic" }})
-    hi("@lsp.type.method.cpp", {{ fg = colors.sky, style = "italic" }})
-    hi("@lsp.typemod.property.static.cpp", {{ fg = colors.teal, style = "italic,bold" }})
-    hi("@lsp.typemod.macro.globalScope.c", {{ fg = colors.sapphire }})
-
-    -- Bash-specific
-    hi("@lsp.type.variable.bash", {{ fg = colors.text }})
-    hi("@lsp.type.function.bash", {{ fg = colors.blue, style = "bold" }})
-    hi("@lsp.typemod.variable.readonly.bash", {{ fg = colors.teal }})
-
-    -- ============================================================================
-    -- DIAGNOSTIC
-    -- ============================================================================
-    hi("DiagnosticError", {{ fg = colors.red }})
-    hi("DiagnosticWarn", {{ fg = colors.yellow }})
-    hi("DiagnosticInfo", {{ fg = colors.blue }})
-    hi("DiagnosticHint", {{ fg = colors.teal }})
-    hi("DiagnosticOk", {{ fg = colors.green }})
-
-    hi("DiagnosticVirtualTextError", {{ fg = colors.red, bg = "NONE" }})
-    hi("DiagnosticVirtualTextWarn", {{ fg = colors.yellow, bg = "NONE" }})
-    hi("DiagnosticVirtualTextInfo", {{ fg = colors.blue, bg = "NONE" }})
-    hi("DiagnosticVirtualTextHint", {{ fg = colors.teal, bg = "NONE" }})
-
-    hi("DiagnosticUnderlineError", {{ sp = colors.red, style = "undercurl" }})
-    hi("DiagnosticUnderlineWarn", {{ sp = colors.yellow, style = "undercurl" }})
-    hi("DiagnosticUnderlineInfo", {{ sp = colors.blue, style = "undercurl" }})
-    hi("DiagnosticUnderlineHint", {{ sp = colors.teal, style = "undercurl" }})
-
-    -- ============================================================================
-    -- LSP REFERENCES
-    -- ============================================================================
-    hi("LspReferenceText", {{ bg = colors.mantle }})
-    hi("LspReferenceRead", {{ bg = colors.mantle }})
-    hi("LspReferenceWrite", {{ bg = colors.surface0, style = "bold" }})
-
-    hi("MatchParen", {{ bg = colors.mantle }})
-    hi("MatchParenCur", {{ bg = colors.mantle }})
-
-    -- ============================================================================
-    -- PLUGIN: TELESCOPE
-    -- ============================================================================
-    hi("TelescopeBorder", {{ fg = colors.lavender, bg = "NONE" }})
-    hi("TelescopePromptBorder", {{ fg = colors.mauve, bg = "NONE"}})
-    hi("TelescopeResultsBorder", {{ fg = colors.lavender, bg = "NONE" }})
-    hi("TelescopePreviewBorder", {{ fg = colors.lavender, bg = "NONE" }})
-    hi("TelescopeSelection", {{ fg = colors.surface0, bg = colors.mauve, style = "bold" }})
-    hi("TelescopeSelectionCaret", {{ fg = colors.mauve, bg = colors.surface0 }})
-    hi("TelescopeMatching", {{ fg = colors.blue }})
-
-    -- ============================================================================
-    -- PLUGIN: NVIM-TREE / NEO-TREE
-    -- ============================================================================
-    hi("NvimTreeNormal", {{ fg = colors.text, bg = "NONE" }})
-    hi("NvimTreeFolderIcon", {{ fg = colors.mauve }})
-    hi("NvimTreeFolderName", {{ fg = colors.sapphire }})
-    hi("NvimTreeOpenedFolderName", {{ fg = colors.blue, bold = true }})
-    hi("NvimTreeIndentMarker", {{ fg = colors.overlay0 }})
-    hi("NvimTreeGitDirty", {{ fg = colors.yellow }})
-    hi("NvimTreeGitNew", {{ fg = colors.green }})
-    hi("NvimTreeGitDeleted", {{ fg = colors.red }})
-
-    hi("NeoTreeTabActive", {{ fg = colors.mauve, bg = "NONE" }})
-    hi("NeoTreeGitUntracked", {{ fg = colors.red }})
-    hi("NeoTreeTabInactive", {{ fg = colors.overlay0, bg = "NONE" }})
-    hi("NeoTreeTabSeparatorActive", {{ fg = colors.surface0, bg = "NONE" }})
-    hi("NeoTreeTabSeparatorInactive", {{ fg = colors.surface0, bg = "NONE" }})
-    hi("NeoTreeDirectoryIcon", {{ fg = colors.mauve }})
-    hi("NeoTreeDirectoryName", {{ fg = colors.sky }})
-    hi("NeoTreeCursorLine", {{ fg = colors.red }})
-
-    hi("DressingInput", {{ fg = colors.text, bg = colors.mantle }})
-    hi("DressingInputBorder", {{ fg = colors.lavender, bg = "NONE" }})
-    hi("DressingInputTitle", {{ fg = colors.mauve, bg = "NONE", style = "bold" }})
-    hi("DressingInputPrompt", {{ fg = colors.text, bg = "NONE" }})  -- This is the key one!
-    hi("DressingInputText", {{ fg = colors.text, bg = "NONE" }})
-    hi("Prompt", {{ fg = colors.text, bg = "NONE" }})
-    hi("Question", {{ fg = colors.text, bg = "NONE" }})
-
-    -- ============================================================================
-    -- PLUGIN: INDENT-BLANKLINE
-    -- ============================================================================
-    hi("IblIndent", {{ fg = colors.overlay0 }})
-    hi("IblScope", {{ fg = colors.overlay0 }})
-
-    -- ============================================================================
-    -- PLUGIN: WHICH-KEY
-    -- ============================================================================
-    hi("WhichKey", {{ fg = colors.mauve, bg = "NONE" }})
-    hi("WhichKeyGroup", {{ fg = colors.blue }})
-    hi("WhichKeyBorder", {{ fg = colors.red, bg = "NONE" }})
-    hi("WhichKeyDesc", {{ fg = colors.text }})
-    hi("WhichKeySeparator", {{ fg = colors.mauve }})
-    hi("WhichKeyFloat", {{ bg = "NONE" }})
-    hi("WhichKeyTitle", {{ bg = "NONE" }})
-
-    -- ============================================================================
-    -- PLUGIN: NOTIFY
-    -- ============================================================================
-    hi("NotifyBackground", {{ bg = colors.base }})
-    hi("NotifyERRORBorder", {{ fg = colors.red }})
-    hi("NotifyWARNBorder", {{ fg = colors.yellow }})
-    hi("NotifyINFOBorder", {{ fg = colors.blue }})
-    hi("NotifyDEBUGBorder", {{ fg = colors.overlay0 }})
-    hi("NotifyTRACEBorder", {{ fg = colors.teal }})
-    hi("NotifyERRORIcon", {{ fg = colors.red }})
-    hi("NotifyWARNIcon", {{ fg = colors.yellow }})
-    hi("NotifyINFOIcon", {{ fg = colors.blue }})
-    hi("NotifyDEBUGIcon", {{ fg = colors.overlay0 }})
-    hi("NotifyTRACEIcon", {{ fg = colors.teal }})
-    hi("NotifyERRORTitle", {{ fg = colors.red }})
-    hi("NotifyWARNTitle", {{ fg = colors.yellow }})
-    hi("NotifyINFOTitle", {{ fg = colors.blue }})
-    hi("NotifyDEBUGTitle", {{ fg = colors.overlay0 }})
-    hi("NotifyTRACETitle", {{ fg = colors.teal }})
-
-    -- ============================================================================
-    -- PLUGIN: RAINBOW DELIMITERS
-    -- ============================================================================
-    hi("RainbowDelimiterRed",    {{ fg = "{rainbow_colors['red']}" }})
-    hi("RainbowDelimiterOrange", {{ fg = "{rainbow_colors['orange']}" }})
-    hi("RainbowDelimiterYellow", {{ fg = "{rainbow_colors['yellow']}" }})
-    hi("RainbowDelimiterGreen",  {{ fg = "{rainbow_colors['green']}" }})
-    hi("RainbowDelimiterCyan",   {{ fg = "{rainbow_colors['cyan']}" }})
-    hi("RainbowDelimiterBlue",   {{ fg = "{rainbow_colors['blue']}" }})
-    hi("RainbowDelimiterViolet", {{ fg = "{rainbow_colors['violet']}" }})
-
-    -- ============================================================================
-    -- PLUGIN: RENDER-MARKDOWN
-    -- ============================================================================
-    hi("RenderMarkdownCode", {{ bg = "NONE" }})
-
-    -- ============================================================================
-    -- PLUGIN: BUFFERLINE / BARBAR
-    -- ============================================================================
-    hi("BufferLineFill", {{ bg = "NONE" }})
-    hi("BufferLineBackground", {{ fg = colors.overlay0, bg = "NONE" }})
-    hi("BufferLineBuffer", {{ fg = colors.overlay0, bg = "NONE" }})
-    hi("BufferLineBufferVisible", {{ fg = colors.text, bg = "NONE" }})
-    hi("BufferLineBufferSelected", {{ fg = colors.mauve, bg = "NONE", style = "bold" }})
-    hi("BufferLineTab", {{ fg = colors.overlay0, bg = "NONE" }})
-    hi("BufferLineTabSelected", {{ fg = colors.mauve, bg = "NONE", style = "bold" }})
-    hi("BufferLineSeparator", {{ fg = colors.surface0, bg = "NONE" }})
-    hi("BufferLineSeparatorVisible", {{ fg = colors.surface0, bg = "NONE" }})
-    hi("BufferLineSeparatorSelected", {{ fg = colors.surface0, bg = "NONE" }})
-
-    -- Barbar plugin
-    hi("BufferCurrent", {{ fg = colors.text, bg = "NONE", style = "bold" }})
-    hi("BufferCurrentIndex", {{ fg = colors.mauve, bg = "NONE" }})
-    hi("BufferCurrentMod", {{ fg = colors.yellow, bg = "NONE" }})
-    hi("BufferCurrentSign", {{ fg = colors.mauve, bg = "NONE" }})
-    hi("BufferCurrentTarget", {{ fg = colors.red, bg = "NONE" }})
-    hi("BufferVisible", {{ fg = colors.text, bg = "NONE" }})
-    hi("BufferVisibleIndex", {{ fg = colors.overlay0, bg = "NONE" }})
-    hi("BufferVisibleMod", {{ fg = colors.yellow, bg = "NONE" }})
-    hi("BufferVisibleSign", {{ fg = colors.overlay0, bg = "NONE" }})
-    hi("BufferVisibleTarget", {{ fg = colors.red, bg = "NONE" }})
-    hi("BufferInactive", {{ fg = colors.overlay0, bg = "NONE" }})
-    hi("BufferInactiveIndex", {{ fg = colors.overlay0, bg = "NONE" }})
-    hi("BufferInactiveMod", {{ fg = colors.lavender, bg = "NONE" }})
-    hi("BufferInactiveSign", {{ fg = colors.overlay0, bg = "NONE" }})
-    hi("BufferInactiveTarget", {{ fg = colors.red, bg = "NONE" }})
-    hi("BufferTabpages", {{ fg = colors.mauve, bg = "NONE", style = "bold" }})
-    hi("BufferTabpageFill", {{ bg = "NONE" }})
-
-    -- Overseer (task runner) - often appears in bufferline
-    hi("OverseerTask", {{ fg = colors.blue, bg = "NONE" }})
-    hi("OverseerTaskBorder", {{ fg = colors.blue, bg = "NONE" }})
-    hi("OverseerRunning", {{ fg = colors.yellow, bg = "NONE" }})
-    hi("OverseerSuccess", {{ fg = colors.green, bg = "NONE" }})
-    hi("OverseerCanceled", {{ fg = colors.overlay0, bg = "NONE" }})
-    hi("OverseerFailure", {{ fg = colors.red, bg = "NONE" }})
-    hi("OverseerBorder", {{ fg = colors.lavender, bg = "NONE" }})
-    hi("OverseerNormal", {{ fg = colors.text, bg = colors.surface0 }})
-
-    -- Additional top bar highlights (in case it's something else)
-    hi("WinBar", {{ fg = "NONE", bg = "NONE" }})
-    hi("SatelliteBar", {{ fg = "NONE", bg = "NONE" }})
-    hi("SatelliteCursor", {{ fg = "NONE", bg = "NONE" }})
-    hi("NeoTreeTitleBar", {{ fg = colors.mantle, bg = colors.teal }})
-    hi("NeoTreeDimmedText", {{ fg = colors.red }})
-    hi("NeoTreeMessage", {{ fg = colors.subtext0 }})
-    hi("NeoTreeFloatNormal", {{ fg = colors.red }})
-    hi("NeoTreeFloatBorder", {{ fg = colors.teal }})
-    hi("NeoTreeFloatTitle", {{ fg = colors.red }})
-    hi("NvimScrollbarHandle", {{ fg = "NONE", bg = "NONE" }})
-    hi("NvimScrollbarCursor", {{ fg = "NONE", bg = "NONE" }})
-    hi("NvimScrollbarError", {{ fg = "NONE", bg = "NONE" }})
-    hi("NvimScrollbarWarn", {{ fg = "NONE", bg = "NONE" }})
-    hi("NvimScrollbarInfo", {{ fg = "NONE", bg = "NONE" }})
-    hi("NvimScrollbarHint", {{fg = "NONE", bg = "NONE" }})
-    hi("NeoTreeScrollbar", {{ fg = "NONE", bg = "NONE" }})
-    hi("NeoTreeScrollbarThumb", {{ fg = "NONE", bg = "NONE" }})
-    hi("WinScrollbar", {{ fg = "NONE", bg = "NONE" }})
-    hi("WinScrollbarThumb", {{ fg = "NONE", bg = "NONE" }})
-    hi("WinBarNC", {{ fg = "NONE", bg = "NONE" }})
-    hi("Title", {{ fg = colors.blue, bg = "NONE" }})
-    hi("BufferLineDevIconLua", {{ bg = "NONE" }})
-    hi("BufferLineDevIconDefault", {{ bg = "NONE" }})
-
-
-    -- ============================================================================
-    -- TEXT
-    -- ============================================================================
-    hi("Comment", {{ fg = colors.pink }})
-    hi("Constant", {{ fg = colors.teal }})
-    -- ============================================================================
-    -- PLUGIN: ALPHA (Dashboard)
-    -- ============================================================================
-    hi("DashboardHeader", {{ fg = colors.sapphire }})
-    hi("DashboardFooter", {{ fg = colors.mauve }})
-    hi("AlphaShortcut", {{ fg = colors.red }})
-    hi("AlphaIconNew", {{ fg = colors.blue }})
-    hi("AlphaIconRecent", {{ fg = colors.pink }})
-    hi("AlphaIconYazi", {{ fg = colors.peach }})
-    hi("AlphaIconSessions", {{ fg = colors.green }})
-    hi("AlphaIconProjects", {{ fg = colors.mauve }})
-    hi("AlphaIconQuit", {{ fg = colors.red }})
-
-
-    hi("DiffAdd", {{ fg = colors.green, bg = "NONE" }})
-    hi("DiffChange", {{ fg = colors.blue, bg = "NONE" }})
-    hi("DiffDelete", {{ fg = colors.red, bg = "NONE" }})
-    hi("DiffText", {{ fg = colors.yellow, bg = "NONE", style = "bold" }})
-
-    -- Git signs in the gutter
-    hi("GitSignsAdd", {{ fg = colors.green, bg = "NONE" }})
-    hi("GitSignsChange", {{ fg = colors.blue, bg = "NONE" }})
-    hi("GitSignsDelete", {{ fg = colors.red, bg = "NONE" }})
-
-    -- For syntax highlighting of color hex codes in your editor
-    -- This will make the bright red/green hex codes themselves appear in purple tones
-    hi("@string.special", {{ fg = colors.green }})  -- For color strings like "#FF0000"
-    hi("@number.css", {{ fg = colors.peach }})
-
--- ============================================================================
--- PLUGIN: LUALINE
--- ============================================================================
-    -- Normal mode
-    hi("lualine_a_normal", {{ fg = colors.base, bg = colors.blue, style = "bold" }})
-    hi("lualine_b_normal", {{ fg = colors.text, bg = colors.surface0 }})
-    hi("lualine_c_normal", {{ fg = colors.subtext0, bg = "NONE" }})
-    hi("lualine_x_normal", {{ fg = colors.subtext0, bg = "NONE" }})
-    hi("lualine_y_normal", {{ fg = colors.text, bg = colors.surface0 }})
-    hi("lualine_z_normal", {{ fg = colors.base, bg = colors.blue }})
-
-    -- Insert mode
-    hi("lualine_a_insert", {{ fg = colors.base, bg = colors.teal, style = "bold" }})
-    hi("lualine_b_insert", {{ fg = colors.text, bg = colors.surface0 }})
-    hi("lualine_c_insert", {{ fg = colors.subtext0, bg = "NONE" }})
-    hi("lualine_x_insert", {{ fg = colors.subtext0, bg = "NONE" }})
-    hi("lualine_y_insert", {{ fg = colors.text, bg = colors.surface0 }})
-    hi("lualine_z_insert", {{ fg = colors.base, bg = colors.teal }})
-
-    -- Visual mode
-    hi("lualine_a_visual", {{ fg = colors.base, bg = colors.mauve, style = "bold" }})
-    hi("lualine_b_visual", {{ fg = colors.text, bg = colors.surface0 }})
-    hi("lualine_c_visual", {{ fg = colors.subtext0, bg = "NONE" }})
-    hi("lualine_x_visual", {{ fg = colors.subtext0, bg = "NONE" }})
-    hi("lualine_y_visual", {{ fg = colors.text, bg = colors.surface0 }})
-    hi("lualine_z_visual", {{ fg = colors.base, bg = colors.mauve }})
-
-    -- Replace mode
-    hi("lualine_a_replace", {{ fg = colors.base, bg = colors.red, style = "bold" }})
-    hi("lualine_b_replace", {{ fg = colors.text, bg = colors.surface0 }})
-    hi("lualine_c_replace", {{ fg = colors.subtext0, bg = "NONE" }})
-    hi("lualine_x_replace", {{ fg = colors.subtext0, bg = "NONE" }})
-    hi("lualine_y_replace", {{ fg = colors.text, bg = colors.surface0 }})
-    hi("lualine_z_replace", {{ fg = colors.base, bg = colors.red }})
-
-    -- Command mode
-    hi("lualine_a_command", {{ fg = colors.base, bg = colors.peach, style = "bold" }})
-    hi("lualine_b_command", {{ fg = colors.text, bg = colors.surface0 }})
-    hi("lualine_c_command", {{ fg = colors.subtext0, bg = "NONE" }})
-    hi("lualine_x_command", {{ fg = colors.subtext0, bg = "NONE" }})
-    hi("lualine_y_command", {{ fg = colors.text, bg = colors.surface0 }})
-    hi("lualine_z_command", {{ fg = colors.base, bg = colors.peach }})
-
-    -- Inactive
-    hi("lualine_a_inactive", {{ fg = colors.overlay0, bg = "NONE" }})
-    hi("lualine_b_inactive", {{ fg = colors.overlay0, bg = "NONE" }})
-    hi("lualine_c_inactive", {{ fg = colors.overlay0, bg = "NONE" }})
-
-    -- Additional lualine components
-    --hi("lualine_transitional_lualine_a_normal_to_lualine_b_normal", {{ fg = colors.blue, bg = colors.surface0 }})
-    --hi("lualine_transitional_lualine_a_insert_to_lualine_b_insert", {{ fg = colors.teal, bg = colors.surface0 }})
-    --hi("lualine_transitional_lualine_a_visual_to_lualine_b_visual", {{ fg = colors.mauve, bg = colors.surface0 }})
-    --hi("lualine_transitional_lualine_a_replace_to_lualine_b_replace", {{ fg = colors.red, bg = colors.surface0 }})
-    --hi("lualine_transitional_lualine_a_command_to_lualine_b_command", {{ fg = colors.peach, bg = colors.surface0 }})
+{plugin_lualine}
+    }}
 
 -- ============================================================================
 -- TRANSPARENCY REASSERTION (CRITICAL)
 -- ============================================================================
+    -- Set of groups whose background is forced to NONE
     local transparent_groups = {{
       -- Core editor / windows
-      "Normal",
-      "NormalFloat",
-      "FloatBorder",
-      "SignColumn",
-      "EndOfBuffer",
-      "VertSplit",
-      "WinSeparator",
-      "WinBar",
-      "WinBarNC",
-      "Title",
+      ["Normal"] = true,
+      ["NormalFloat"] = true,
+      ["FloatBorder"] = true,
+      ["SignColumn"] = true,
+      ["EndOfBuffer"] = true,
+      ["VertSplit"] = true,
+      ["WinSeparator"] = true,
+      ["WinBar"] = true,
+      ["WinBarNC"] = true,
+      ["Title"] = true,
 
       -- Cursor / columns (IMPORTANT)
-      "CursorLine",
-      "CursorColumn",
-      "ColorColumn",
+      ["CursorLine"] = true,
+      ["CursorColumn"] = true,
+      ["ColorColumn"] = true,
 
       -- Status / tabline
-      "StatusLine",
-      "StatusLineNC",
-      "TabLine",
-      "TabLineFill",
-      "TabLineSel",
+      ["StatusLine"] = true,
+      ["StatusLineNC"] = true,
+      ["TabLine"] = true,
+      ["TabLineFill"] = true,
+      ["TabLineSel"] = true,
 
       -- Popup / completion
-      "Pmenu",
-      "PmenuSbar",
-      "PmenuThumb",
-      "PmenuBorder",
-      "TelescopePromptBorder",
-      "TelescopeResultsBorder",
-      "TelescopePreviewBorder",
+      ["Pmenu"] = true,
+      ["PmenuSbar"] = true,
+      ["PmenuThumb"] = true,
+      ["PmenuBorder"] = true,
+      ["TelescopePromptBorder"] = true,
+      ["TelescopeResultsBorder"] = true,
+      ["TelescopePreviewBorder"] = true,
 
 
       -- Completion item kinds (nvim-cmp)
-      "CmpItemKindVariable",
-      "CmpItemKindFunction",
-      "CmpItemKindMethod",
-      "CmpItemKindConstructor",
-      "CmpItemKindClass",
-      "CmpItemKindInterface",
-      "CmpItemKindStruct",
-      "CmpItemKindEnum",
-      "CmpItemKindEnumMember",
-      "CmpItemKindModule",
-      "CmpItemKindProperty",
-      "CmpItemKindField",
-      "CmpItemKindTypeParameter",
-      "CmpItemKindConstant",
-      "CmpItemKindKeyword",
-      "CmpItemKindSnippet",
-      "CmpItemKindText",
-      "CmpItemKindFile",
-      "CmpItemKindFolder",
-      "CmpItemKindColor",
-      "CmpItemKindReference",
-      "CmpItemKindOperator",
-      "CmpItemKindUnit",
-      "CmpItemKindValue",
+      ["CmpItemKindVariable"] = true,
+      ["CmpItemKindFunction"] = true,
+      ["CmpItemKindMethod"] = true,
+      ["CmpItemKindConstructor"] = true,
+      ["CmpItemKindClass"] = true,
+      ["CmpItemKindInterface"] = true,
+      ["CmpItemKindStruct"] = true,
+      ["CmpItemKindEnum"] = true,
+      ["CmpItemKindEnumMember"] = true,
+      ["CmpItemKindModule"] = true,
+      ["CmpItemKindProperty"] = true,
+      ["CmpItemKindField"] = true,
+      ["CmpItemKindTypeParameter"] = true,
+      ["CmpItemKindConstant"] = true,
+      ["CmpItemKindKeyword"] = true,
+      ["CmpItemKindSnippet"] = true,
+      ["CmpItemKindText"] = true,
+      ["CmpItemKindFile"] = true,
+      ["CmpItemKindFolder"] = true,
+      ["CmpItemKindColor"] = true,
+      ["CmpItemKindReference"] = true,
+      ["CmpItemKindOperator"] = true,
+      ["CmpItemKindUnit"] = true,
+      ["CmpItemKindValue"] = true,
 
       -- Completion text
-      "CmpItemAbbr",
-      "CmpItemAbbrDeprecated",
-      "CmpItemAbbrMatch",
-      "CmpItemAbbrMatchFuzzy",
-      "CmpItemMenu",
+      ["CmpItemAbbr"] = true,
+      ["CmpItemAbbrDeprecated"] = true,
+      ["CmpItemAbbrMatch"] = true,
+      ["CmpItemAbbrMatchFuzzy"] = true,
+      ["CmpItemMenu"] = true,
 
       -- Which-key
-      "WhichKey",
-      "WhichKeyFloat",
-      "WhichKeyTile",
+      ["WhichKey"] = true,
+      ["WhichKeyFloat"] = true,
+      ["WhichKeyTile"] = true,
 
       -- Neo-tree
-      "NeoTreeTabActive",
-      "NeoTreeTabInactive",
-      "NeoTreeTabSeparatorActive",
-      "NeoTreeTabSeparatorInactive",
+      ["NeoTreeTabActive"] = true,
+      ["NeoTreeTabInactive"] = true,
+      ["NeoTreeTabSeparatorActive"] = true,
+      ["NeoTreeTabSeparatorInactive"] = true,
 
       -- Render / markdown
-      "RenderMarkdownCode",
+      ["RenderMarkdownCode"] = true,
 
       -- Bufferline / Barbar
-      "BufferLineFill",
-      "BufferLineBackground",
-      "BufferLineBuffer",
-      "BufferLineBufferVisible",
-      "BufferLineBufferSelected",
-      "BufferLineTab",
-      "BufferLineTabSelected",
-      "BufferLineSeparator",
-      "BufferLineSeparatorVisible",
-      "BufferLineSeparatorSelected",
-
-      "BufferCurrent",
-      "BufferCurrentIndex",
-      "BufferCurrentMod",
-      "BufferCurrentSign",
-      "BufferCurrentTarget",
-
-      "BufferVisible",
-      "BufferVisibleIndex",
-      "BufferVisibleMod",
-      "BufferVisibleSign",
-      "BufferVisibleTarget",
-
-      "BufferInactive",
-      "BufferInactiveIndex",
-      "BufferInactiveMod",
-      "BufferInactiveSign",
-      "BufferInactiveTarget",
-
-      "BufferTabpages",
-      "BufferTabpageFill",
+      ["BufferLineFill"] = true,
+      ["BufferLineBackground"] = true,
+      ["BufferLineBuffer"] = true,
+      ["BufferLineBufferVisible"] = true,
+      ["BufferLineBufferSelected"] = true,
+      ["BufferLineTab"] = true,
+      ["BufferLineTabSelected"] = true,
+      ["BufferLineSeparator"] = true,
+      ["BufferLineSeparatorVisible"] = true,
+      ["BufferLineSeparatorSelected"] = true,
+
+      ["BufferCurrent"] = true,
+      ["BufferCurrentIndex"] = true,
+      ["BufferCurrentMod"] = true,
+      ["BufferCurrentSign"] = true,
+      ["BufferCurrentTarget"] = true,
+
+      ["BufferVisible"] = true,
+      ["BufferVisibleIndex"] = true,
+      ["BufferVisibleMod"] = true,
+      ["BufferVisibleSign"] = true,
+      ["BufferVisibleTarget"] = true,
+
+      ["BufferInactive"] = true,
+      ["BufferInactiveIndex"] = true,
+      ["BufferInactiveMod"] = true,
+      ["BufferInactiveSign"] = true,
+      ["BufferInactiveTarget"] = true,
+
+      ["BufferTabpages"] = true,
+      ["BufferTabpageFill"] = true,
 
       -- Devicons
-      "BufferLineDevIconLua",
-      "BufferLineDevIconDefault",
+      ["BufferLineDevIconLua"] = true,
+      ["BufferLineDevIconDefault"] = true,
 
       -- Overseer
-      "OverseerTask",
-      "OverseerTaskBorder",
-      "OverseerRunning",
-      "OverseerSuccess",
-      "OverseerCanceled",
-      "OverseerFailure",
-      "OverseerBorder",
+      ["OverseerTask"] = true,
+      ["OverseerTaskBorder"] = true,
+      ["OverseerRunning"] = true,
+      ["OverseerSuccess"] = true,
+      ["OverseerCanceled"] = true,
+      ["OverseerFailure"] = true,
+      ["OverseerBorder"] = true,
         }}
 
-    for _, group in ipairs(transparent_groups) do
+    -- Groups defined above just get their bg cleared before they are set;
+    -- only the others need a read-modify-write of the live definition
+    local others = {{}}
+    for group in pairs(transparent_groups) do
+        if H[group] then
+            H[group].bg = "NONE"
+        else
+            table.insert(others, group)
+        end
+    end
+
+    for group, spec in pairs(H) do
+        vim.api.nvim_set_hl(0, group, spec)
+    end
+
+    for _, group in ipairs(others) do
         local ok, hl = pcall(vim.api.nvim_get_hl, 0, {{ name = group }})
         if ok then
             hl.bg = "NONE"
@@ -1010,8 +856,184 @@ end
 setup_highlights()
 '''
 
-    with open(output_path, "w") as f:
-        f.write(nvim_theme_content)
+
+# Plugin highlight blocks spliced into _LUA_TEMPLATE as {plugin_<name>}:
+# name -> (lazy.nvim plugin names that enable it, H table entries)
+_PLUGIN_HIGHLIGHTS = {
+    "telescope": (('telescope.nvim',), '''        ["TelescopeBorder"] = {{ fg = colors.lavender, bg = "NONE" }},
+        ["TelescopePromptBorder"] = {{ fg = colors.mauve, bg = "NONE"}},
+        ["TelescopeResultsBorder"] = {{ fg = colors.lavender, bg = "NONE" }},
+        ["TelescopePreviewBorder"] = {{ fg = colors.lavender, bg = "NONE" }},
+        ["TelescopeSelection"] = {{ fg = colors.surface0, bg = colors.mauve, bold = true }},
+        ["TelescopeSelectionCaret"] = {{ fg = colors.mauve, bg = colors.surface0 }},
+        ["TelescopeMatching"] = {{ fg = colors.blue }},
+'''),
+    "nvim_tree": (('nvim-tree.lua',), '''        ["NvimTreeNormal"] = {{ fg = colors.text, bg = "NONE" }},
+        ["NvimTreeFolderIcon"] = {{ fg = colors.mauve }},
+        ["NvimTreeFolderName"] = {{ fg = colors.sapphire }},
+        ["NvimTreeOpenedFolderName"] = {{ fg = colors.blue, bold = true }},
+        ["NvimTreeIndentMarker"] = {{ fg = colors.overlay0 }},
+        ["NvimTreeGitDirty"] = {{ fg = colors.yellow }},
+        ["NvimTreeGitNew"] = {{ fg = colors.green }},
+        ["NvimTreeGitDeleted"] = {{ fg = colors.red }},
+'''),
+    "neo_tree": (('neo-tree.nvim',), '''        ["NeoTreeTabActive"] = {{ fg = colors.mauve, bg = "NONE" }},
+        ["NeoTreeGitUntracked"] = {{ fg = colors.red }},
+        ["NeoTreeTabInactive"] = {{ fg = colors.overlay0, bg = "NONE" }},
+        ["NeoTreeTabSeparatorActive"] = {{ fg = colors.surface0, bg = "NONE" }},
+        ["NeoTreeTabSeparatorInactive"] = {{ fg = colors.surface0, bg = "NONE" }},
+        ["NeoTreeDirectoryIcon"] = {{ fg = colors.mauve }},
+        ["NeoTreeDirectoryName"] = {{ fg = colors.sky }},
+        ["NeoTreeCursorLine"] = {{ fg = colors.red }},
+'''),
+    "indent_blankline": (('indent-blankline.nvim',), '''        ["IblIndent"] = {{ fg = colors.overlay0 }},
+        ["IblScope"] = {{ fg = colors.overlay0 }},
+'''),
+    "which_key": (('which-key.nvim',), '''        ["WhichKey"] = {{ fg = colors.mauve, bg = "NONE" }},
+        ["WhichKeyGroup"] = {{ fg = colors.blue }},
+        ["WhichKeyBorder"] = {{ fg = colors.red, bg = "NONE" }},
+        ["WhichKeyDesc"] = {{ fg = colors.text }},
+        ["WhichKeySeparator"] = {{ fg = colors.mauve }},
+        ["WhichKeyFloat"] = {{ bg = "NONE" }},
+        ["WhichKeyTitle"] = {{ bg = "NONE" }},
+'''),
+    "notify": (('nvim-notify',), '''        ["NotifyBackground"] = {{ bg = colors.base }},
+        ["NotifyERRORBorder"] = {{ fg = colors.red }},
+        ["NotifyWARNBorder"] = {{ fg = colors.yellow }},
+        ["NotifyINFOBorder"] = {{ fg = colors.blue }},
+        ["NotifyDEBUGBorder"] = {{ fg = colors.overlay0 }},
+        ["NotifyTRACEBorder"] = {{ fg = colors.teal }},
+        ["NotifyERRORIcon"] = {{ fg = colors.red }},
+        ["NotifyWARNIcon"] = {{ fg = colors.yellow }},
+        ["NotifyINFOIcon"] = {{ fg = colors.blue }},
+        ["NotifyDEBUGIcon"] = {{ fg = colors.overlay0 }},
+        ["NotifyTRACEIcon"] = {{ fg = colors.teal }},
+        ["NotifyERRORTitle"] = {{ fg = colors.red }},
+        ["NotifyWARNTitle"] = {{ fg = colors.yellow }},
+        ["NotifyINFOTitle"] = {{ fg = colors.blue }},
+        ["NotifyDEBUGTitle"] = {{ fg = colors.overlay0 }},
+        ["NotifyTRACETitle"] = {{ fg = colors.teal }},
+'''),
+    "rainbow_delimiters": (('rainbow-delimiters.nvim',), '''        ["RainbowDelimiterRed"] = {{ fg = "{rainbow_red}" }},
+        ["RainbowDelimiterOrange"] = {{ fg = "{rainbow_orange}" }},
+        ["RainbowDelimiterYellow"] = {{ fg = "{rainbow_yellow}" }},
+        ["RainbowDelimiterGreen"] = {{ fg = "{rainbow_green}" }},
+        ["RainbowDelimiterCyan"] = {{ fg = "{rainbow_cyan}" }},
+        ["RainbowDelimiterBlue"] = {{ fg = "{rainbow_blue}" }},
+        ["RainbowDelimiterViolet"] = {{ fg = "{rainbow_violet}" }},
+'''),
+    "render_markdown": (('render-markdown.nvim', 'markdown.nvim'), '''        ["RenderMarkdownCode"] = {{ bg = "NONE" }},
+'''),
+    "lualine": (('lualine.nvim',), '''        -- Normal mode
+        ["lualine_a_normal"] = {{ fg = colors.base, bg = colors.blue, bold = true }},
+        ["lualine_b_normal"] = {{ fg = colors.text, bg = colors.surface0 }},
+        ["lualine_c_normal"] = {{ fg = colors.subtext0, bg = "NONE" }},
+        ["lualine_x_normal"] = {{ fg = colors.subtext0, bg = "NONE" }},
+        ["lualine_y_normal"] = {{ fg = colors.text, bg = colors.surface0 }},
+        ["lualine_z_normal"] = {{ fg = colors.base, bg = colors.blue }},
+
+        -- Insert mode
+        ["lualine_a_insert"] = {{ fg = colors.base, bg = colors.teal, bold = true }},
+        ["lualine_b_insert"] = {{ fg = colors.text, bg = colors.surface0 }},
+        ["lualine_c_insert"] = {{ fg = colors.subtext0, bg = "NONE" }},
+        ["lualine_x_insert"] = {{ fg = colors.subtext0, bg = "NONE" }},
+        ["lualine_y_insert"] = {{ fg = colors.text, bg = colors.surface0 }},
+        ["lualine_z_insert"] = {{ fg = colors.base, bg = colors.teal }},
+
+        -- Visual mode
+        ["lualine_a_visual"] = {{ fg = colors.base, bg = colors.mauve, bold = true }},
+        ["lualine_b_visual"] = {{ fg = colors.text, bg = colors.surface0 }},
+        ["lualine_c_visual"] = {{ fg = colors.subtext0, bg = "NONE" }},
+        ["lualine_x_visual"] = {{ fg = colors.subtext0, bg = "NONE" }},
+        ["lualine_y_visual"] = {{ fg = colors.text, bg = colors.surface0 }},
+        ["lualine_z_visual"] = {{ fg = colors.base, bg = colors.mauve }},
+
+        -- Replace mode
+        ["lualine_a_replace"] = {{ fg = colors.base, bg = colors.red, bold = true }},
+        ["lualine_b_replace"] = {{ fg = colors.text, bg = colors.surface0 }},
+        ["lualine_c_replace"] = {{ fg = colors.subtext0, bg = "NONE" }},
+        ["lualine_x_replace"] = {{ fg = colors.subtext0, bg = "NONE" }},
+        ["lualine_y_replace"] = {{ fg = colors.text, bg = colors.surface0 }},
+        ["lualine_z_replace"] = {{ fg = colors.base, bg = colors.red }},
+
+        -- Command mode
+        ["lualine_a_command"] = {{ fg = colors.base, bg = colors.peach, bold = true }},
+        ["lualine_b_command"] = {{ fg = colors.text, bg = colors.surface0 }},
+        ["lualine_c_command"] = {{ fg = colors.subtext0, bg = "NONE" }},
+        ["lualine_x_command"] = {{ fg = colors.subtext0, bg = "NONE" }},
+        ["lualine_y_command"] = {{ fg = colors.text, bg = colors.surface0 }},
+        ["lualine_z_command"] = {{ fg = colors.base, bg = colors.peach }},
+
+        -- Inactive
+        ["lualine_a_inactive"] = {{ fg = colors.overlay0, bg = "NONE" }},
+        ["lualine_b_inactive"] = {{ fg = colors.overlay0, bg = "NONE" }},
+        ["lualine_c_inactive"] = {{ fg = colors.overlay0, bg = "NONE" }},
+
+        -- Additional lualine components
+        --["lualine_transitional_lualine_a_normal_to_lualine_b_normal"] = {{ fg = colors.blue, bg = colors.surface0 }},
+        --["lualine_transitional_lualine_a_insert_to_lualine_b_insert"] = {{ fg = colors.teal, bg = colors.surface0 }},
+        --["lualine_transitional_lualine_a_visual_to_lualine_b_visual"] = {{ fg = colors.mauve, bg = colors.surface0 }},
+        --["lualine_transitional_lualine_a_replace_to_lualine_b_replace"] = {{ fg = colors.red, bg = colors.surface0 }},
+        --["lualine_transitional_lualine_a_command_to_lualine_b_command"] = {{ fg = colors.peach, bg = colors.surface0 }},'''),
+}
+
+
+def installed_nvim_plugins():
+    """
+    Read the plugin names pinned in lazy.nvim's lockfile
+
+    Returns:
+        frozenset of plugin names, or None if there is no readable, non-empty
+        lockfile (callers then emit highlights for every plugin)
+    """
+    lock_path = HOME / ".config" / "nvim" / "lazy-lock.json"
+    try:
+        with open(lock_path) as f:
+            return frozenset(json.load(f)) or None
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def write_neovim_colorscheme(
+    neovim_colors: dict, output_path: str = None, debug: bool = False, plugins=None
+):
+    """
+    Write Neovim colorscheme Lua file
+
+    Args:
+        neovim_colors: Dict of color definitions
+        output_path: Optional custom output path
+        debug: Enable debug output
+        plugins: Plugin names to emit highlights for (default: read from
+                 lazy-lock.json, or every plugin if it is missing or empty)
+    """
+    if output_path is None:
+        nvim_colors_dir = ensure_dir(HOME / ".config" / "nvim" / "colors")
+        output_path = str(nvim_colors_dir / "material_purple_mocha.lua")
+
+    # Rainbow delimiters boost their source colors in one batch
+    hues, chromas, tones = zip(*(
+        hct_components(hex_to_argb(neovim_colors[src])) for _, src, _, _ in RAINBOW_SPEC
+    ))
+    ctx = dict(neovim_colors)
+    ctx.update(zip((f"rainbow_{name}" for name, _, _, _ in RAINBOW_SPEC), hct_batch_to_hex(
+        hues,
+        [min(chroma * boost, 90) for chroma, (_, _, boost, _) in zip(chromas, RAINBOW_SPEC)],
+        [max(tone, min_tone) for tone, (_, _, _, min_tone) in zip(tones, RAINBOW_SPEC)],
+    )))
+
+    if plugins is None:
+        plugins = installed_nvim_plugins()
+    for name, (repos, block) in _PLUGIN_HIGHLIGHTS.items():
+        if plugins is None or not plugins.isdisjoint(repos):
+            ctx[f"plugin_{name}"] = block.format_map(ctx)
+        else:
+            ctx[f"plugin_{name}"] = ""
+            if debug:
+                print(f"Skipping {name} highlights (plugin not installed)")
+    nvim_theme_content = _LUA_TEMPLATE.format_map(ctx)
+
+    write_if_changed(output_path, nvim_theme_content.encode())
 
     if debug:
         print(f"\nNeovim colorscheme written to: {output_path}")
@@ -3,20 +3,42 @@
 Starship Prompt Theme Generator
 Generates Starship prompt configuration with Material You colors
 """
-from pathlib import Path
-from materialyoucolor.hct import Hct
-from materialyoucolor.utils.color_utils import rgba_from_argb, argb_from_rgb
+from color_utils import hct_from_hex, hct_spec_to_hex, HOME, ensure_dir, write_if_changed
 
 
-def hex_to_argb(hex_code: str) -> int:
-    """Convert hex color to ARGB integer"""
-    return argb_from_rgb(int(hex_code[1:3], 16), int(hex_code[3:5], 16), int(hex_code[5:], 16))
-
-
-def argb_to_hex(argb: int) -> str:
-    """Convert ARGB integer to hex color"""
-    rgba = rgba_from_argb(argb)
-    return "#{:02X}{:02X}{:02X}".format(*map(round, rgba))
+# Derived colors: (name, hue offset, chroma multiplier, chroma cap, dark tone, light tone)
+STARSHIP_SPEC = (
+    # Directory - vibrant primary color
+    ('directory',         0,   1.4, 80, 75, 40),
+    # Git branch - slightly shifted purple
+    ('git_branch',        -10, 1.3, 75, 72, 42),
+    # Git status - different states
+    ('git_added',         140, 1.3, 75, 70, 45),
+    ('git_modified',      30,  1.4, 80, 75, 40),
+    ('git_deleted',       200, 1.3, 75, 70, 45),
+    ('git_untracked',     15,  1.2, 70, 68, 47),
+    # Command success/error
+    ('success',           140, 1.3, 75, 72, 42),
+    ('error',             200, 1.4, 80, 72, 42),
+    # Language/environment indicators
+    ('python',            25,  1.3, 75, 70, 45),
+    ('nodejs',            140, 1.2, 70, 68, 47),
+    ('rust',              20,  1.4, 80, 73, 43),
+    ('golang',            150, 1.3, 75, 70, 45),
+    # Time
+    ('time',              0,   0.6, float('inf'), 60, 55),
+    # Username/hostname
+    ('username',          5,   1.3, 75, 73, 43),
+    ('hostname',          10,  1.2, 70, 70, 45),
+    # Character (prompt symbol)
+    ('character_success', 0,   1.5, 85, 78, 38),
+    # Duration
+    ('duration',          30,  1.2, 70, 68, 47),
+    # Docker
+    ('docker',            160, 1.3, 75, 70, 45),
+    # Package version
+    ('package',           -5,  1.2, 70, 68, 47),
+)
 
 
 def generate_starship_colors(material_colors: dict, term_colors: dict, darkmode: bool = True) -> dict:
@@ -32,126 +54,31 @@ def generate_starship_colors(material_colors: dict, term_colors: dict, darkmode:
         Dict of Starship color definitions
     """
     # Get primary hue for consistency
-    primary_hct = Hct.from_int(hex_to_argb(material_colors['primary_paletteKeyColor']))
-    base_hue = primary_hct.hue
-
-    starship_colors = {}
-
-    # Directory - vibrant primary color
-    starship_colors['directory'] = argb_to_hex(
-        Hct.from_hct(base_hue, min(primary_hct.chroma * 1.4, 80), 75 if darkmode else 40).to_int()
-    )
-
-    # Git branch - slightly shifted purple
-    starship_colors['git_branch'] = argb_to_hex(
-        Hct.from_hct(base_hue - 10, min(primary_hct.chroma * 1.3, 75), 72 if darkmode else 42).to_int()
-    )
-
-    # Git status - different states
-    starship_colors['git_added'] = argb_to_hex(
-        Hct.from_hct(base_hue + 140, min(primary_hct.chroma * 1.3, 75), 70 if darkmode else 45).to_int()
-    )
-    starship_colors['git_modified'] = argb_to_hex(
-        Hct.from_hct(base_hue + 30, min(primary_hct.chroma * 1.4, 80), 75 if darkmode else 40).to_int()
-    )
-    starship_colors['git_deleted'] = argb_to_hex(
-        Hct.from_hct((base_hue + 200) % 360, min(primary_hct.chroma * 1.3, 75), 70 if darkmode else 45).to_int()
-    )
-    starship_colors['git_untracked'] = argb_to_hex(
-        Hct.from_hct(base_hue + 15, min(primary_hct.chroma * 1.2, 70), 68 if darkmode else 47).to_int()
-    )
-
-    # Command success/error
-    starship_colors['success'] = argb_to_hex(
-        Hct.from_hct(base_hue + 140, min(primary_hct.chroma * 1.3, 75), 72 if darkmode else 42).to_int()
-    )
-    starship_colors['error'] = argb_to_hex(
-        Hct.from_hct((base_hue + 200) % 360, min(primary_hct.chroma * 1.4, 80), 72 if darkmode else 42).to_int()
-    )
-
-    # Language/environment indicators
-    starship_colors['python'] = argb_to_hex(
-        Hct.from_hct(base_hue + 25, min(primary_hct.chroma * 1.3, 75), 70 if darkmode else 45).to_int()
-    )
-    starship_colors['nodejs'] = argb_to_hex(
-        Hct.from_hct(base_hue + 140, min(primary_hct.chroma * 1.2, 70), 68 if darkmode else 47).to_int()
-    )
-    starship_colors['rust'] = argb_to_hex(
-        Hct.from_hct(base_hue + 20, min(primary_hct.chroma * 1.4, 80), 73 if darkmode else 43).to_int()
-    )
-    starship_colors['golang'] = argb_to_hex(
-        Hct.from_hct(base_hue + 150, min(primary_hct.chroma * 1.3, 75), 70 if darkmode else 45).to_int()
-    )
-
-    # Time
-    starship_colors['time'] = argb_to_hex(
-        Hct.from_hct(base_hue, primary_hct.chroma * 0.6, 60 if darkmode else 55).to_int()
-    )
+    primary_hct = hct_from_hex(material_colors['primary_paletteKeyColor'])
 
-    # Username/hostname
-    starship_colors['username'] = argb_to_hex(
-        Hct.from_hct(base_hue + 5, min(primary_hct.chroma * 1.3, 75), 73 if darkmode else 43).to_int()
-    )
-    starship_colors['hostname'] = argb_to_hex(
-        Hct.from_hct(base_hue + 10, min(primary_hct.chroma * 1.2, 70), 70 if darkmode else 45).to_int()
-    )
-
-    # Character (prompt symbol)
-    starship_colors['character_success'] = argb_to_hex(
-        Hct.from_hct(base_hue, min(primary_hct.chroma * 1.5, 85), 78 if darkmode else 38).to_int()
-    )
+    # All derived colors are solved in one batch
+    starship_colors = hct_spec_to_hex(STARSHIP_SPEC, primary_hct.hue, primary_hct.chroma, darkmode)
     starship_colors['character_error'] = starship_colors['error']
 
-    # Duration
-    starship_colors['duration'] = argb_to_hex(
-        Hct.from_hct(base_hue + 30, min(primary_hct.chroma * 1.2, 70), 68 if darkmode else 47).to_int()
-    )
-
-    # Docker
-    starship_colors['docker'] = argb_to_hex(
-        Hct.from_hct(base_hue + 160, min(primary_hct.chroma * 1.3, 75), 70 if darkmode else 45).to_int()
-    )
-
-    # Package version
-    starship_colors['package'] = argb_to_hex(
-        Hct.from_hct(base_hue - 5, min(primary_hct.chroma * 1.2, 70), 68 if darkmode else 47).to_int()
-    )
-
     return starship_colors
 
 
-def write_starship_config(starship_colors: dict, output_path: str = None, debug: bool = False) -> str:
-    """
-    Write Starship configuration file with Material You colors
-
-    Args:
-        starship_colors: Dict of Starship color definitions
-        output_path: Optional custom output path
-        debug: Enable debug output
-
-    Returns:
-        Path to the written config file
-    """
-    if output_path is None:
-        starship_config_dir = Path.home() / '.config'
-        starship_config_dir.mkdir(parents=True, exist_ok=True)
-        output_path = str(starship_config_dir / 'starship.toml')
-
-    config_content = f'''# Auto-generated Starship configuration (Material You theme)
+# Starship config; each {key} is filled from starship_colors[key]
+_STARSHIP_TEMPLATE = r'''# Auto-generated Starship configuration (Material You theme)
 # Don't print a new line at the start of the prompt
 add_newline = false
 
 format = """
- ┌[$cmd_duration](fg:{starship_colors['duration']})──[$username$hostname](fg:{starship_colors['username']})────[$directory](fg:{starship_colors['directory']}) [$git_branch](fg:{starship_colors['git_branch']})
- └─[$character](fg:{starship_colors['character_success']})"""
+ ┌[$cmd_duration](fg:{duration})──[$username$hostname](fg:{username})────[$directory](fg:{directory}) [$git_branch](fg:{git_branch})
+ └─[$character](fg:{character_success})"""
 
 # Right prompt
 right_format = """$time"""
 
 # Character (prompt symbol)
 [character]
-success_symbol = "[ ](bold fg:{starship_colors['character_success']})"
-error_symbol = "[ ](bold fg:{starship_colors['character_error']})"
+success_symbol = "[ ](bold fg:{character_success})"
+error_symbol = "[ ](bold fg:{character_error})"
 
 # Disable the package module by default
 [package]
@@ -159,11 +86,11 @@ disabled = true
 
 # Git branch
 [git_branch]
-style = "bold bg:{starship_colors['git_branch']} fg:black"
+style = "bold bg:{git_branch} fg:black"
 symbol = "󰘬 "
 truncation_length = 12
 truncation_symbol = ""
-format = "󰜥 [](bold bg:none fg:{starship_colors['git_branch']})[ $symbol$branch(:$remote_branch) ]($style)[](bold bg:none fg:{starship_colors['git_branch']})"
+format = "󰜥 [](bold bg:none fg:{git_branch})[ $symbol$branch(:$remote_branch) ]($style)[](bold bg:none fg:{git_branch})"
 
 [git_commit]
 commit_hash_length = 4
@@ -188,14 +115,14 @@ deleted = " 🗑 "
 
 [git_metrics]
 disabled = false
-added_style = "{starship_colors['git_added']}"
-deleted_style = "{starship_colors['git_deleted']}"
+added_style = "{git_added}"
+deleted_style = "{git_deleted}"
 format = "([+$added]($added_style) )([-$deleted]($deleted_style) )"
 
 # Hostname
 [hostname]
 ssh_only = false
-format = "[• $hostname ](bg:{starship_colors['username']} bold fg:black)[](bold bg:none fg:{starship_colors['username']})"
+format = "[• $hostname ](bg:{username} bold fg:black)[](bold bg:none fg:{username})"
 trim_at = ".companyname.com"
 disabled = false
 
@@ -218,9 +145,9 @@ time_format = "%T"
 
 # Username
 [username]
-style_user = "bold bg:{starship_colors['username']} fg:black"
+style_user = "bold bg:{username} fg:black"
 style_root = "red bold"
-format = "[](bold bg:none fg:{starship_colors['username']})[ $user ]($style)"
+format = "[](bold bg:none fg:{username})[ $user ]($style)"
 disabled = false
 show_always = true
 
@@ -228,10 +155,10 @@ show_always = true
 [directory]
 home_symbol = "  "
 read_only = "  "
-style = "bold bg:{starship_colors['directory']} fg:black"
+style = "bold bg:{directory} fg:black"
 truncation_length = 6
 truncation_symbol = " ••/"
-format = '[](bold bg:none fg:{starship_colors['directory']})[ 󰉋 $path ]($style)[$read_only]($style)[](bold bg:none fg:{starship_colors['directory']})'
+format = '[](bold bg:none fg:{directory})[ 󰉋 $path ]($style)[$read_only]($style)[](bold bg:none fg:{directory})'
 
 [directory.substitutions]
 "Desktop" = "  "
@@ -245,12 +172,12 @@ format = '[](bold bg:none fg:{starship_colors['directory']})[ 󰉋 $path ]($s
 # Command duration
 [cmd_duration]
 min_time = 0
-format = '[](bold bg:none fg:{starship_colors['duration']})[ 󰪢 $duration ](bold bg:{starship_colors['duration']} fg:black)[](bold bg:none fg:{starship_colors['duration']})'
+format = '[](bold bg:none fg:{duration})[ 󰪢 $duration ](bold bg:{duration} fg:black)[](bold bg:none fg:{duration})'
 
 # Python
 [python]
 symbol = " "
-style = "bold bg:{starship_colors['python']} fg:black"
+style = "bold bg:{python} fg:black"
 format = '[ $symbol$version(\($virtualenv\)) ]($style)'
 pyenv_version_name = false
 python_binary = ["python3", "python"]
@@ -258,56 +185,56 @@ python_binary = ["python3", "python"]
 # Node.js
 [nodejs]
 symbol = " "
-style = "bold bg:{starship_colors['nodejs']} fg:black"
+style = "bold bg:{nodejs} fg:black"
 format = '[ $symbol$version ]($style)'
 
 # Rust
 [rust]
 symbol = " "
-style = "bold bg:{starship_colors['rust']} fg:black"
+style = "bold bg:{rust} fg:black"
 format = '[ $symbol$version ]($style)'
 
 # Go
 [golang]
 symbol = " "
-style = "bold bg:{starship_colors['golang']} fg:black"
+style = "bold bg:{golang} fg:black"
 format = '[ $symbol$version ]($style)'
 
 # Docker
 [docker_context]
 symbol = " "
-style = "bold bg:{starship_colors['docker']} fg:black"
+style = "bold bg:{docker} fg:black"
 format = '[ $symbol$context ]($style)'
 only_with_files = true
 
 # Java
 [java]
 symbol = " "
-style = "bold bg:{starship_colors['rust']} fg:black"
+style = "bold bg:{rust} fg:black"
 format = '[ $symbol$version ]($style)'
 
 # Lua
 [lua]
 symbol = " "
-style = "bold bg:{starship_colors['nodejs']} fg:black"
+style = "bold bg:{nodejs} fg:black"
 format = '[ $symbol$version ]($style)'
 
 # Ruby
 [ruby]
 symbol = " "
-style = "bold bg:{starship_colors['error']} fg:black"
+style = "bold bg:{error} fg:black"
 format = '[ $symbol$version ]($style)'
 
 # PHP
 [php]
 symbol = " "
-style = "bold bg:{starship_colors['python']} fg:black"
+style = "bold bg:{python} fg:black"
 format = '[ $symbol$version ]($style)'
 
 # AWS
 [aws]
 symbol = "  "
-style = "bold bg:{starship_colors['duration']} fg:black"
+style = "bold bg:{duration} fg:black"
 format = '[ $symbol$profile(\($region\)) ]($style)'
 
 # Battery
@@ -320,26 +247,44 @@ empty_symbol = "󰂎 "
 
 [[battery.display]]
 threshold = 10
-style = "bold {starship_colors['error']}"
+style = "bold {error}"
 
 [[battery.display]]
 threshold = 30
-style = "{starship_colors['duration']}"
+style = "{duration}"
 
 [[battery.display]]
 threshold = 100
-style = "{starship_colors['success']}"
+style = "{success}"
 
 # Jobs
 [jobs]
 symbol = " "
-style = "bold bg:{starship_colors['duration']} fg:black"
+style = "bold bg:{duration} fg:black"
 number_threshold = 1
 format = "[ $symbol$number ]($style)"
 '''
 
-    with open(output_path, 'w') as f:
-        f.write(config_content)
+
+def write_starship_config(starship_colors: dict, output_path: str = None, debug: bool = False) -> str:
+    """
+    Write Starship configuration file with Material You colors
+
+    Args:
+        starship_colors: Dict of Starship color definitions
+        output_path: Optional custom output path
+        debug: Enable debug output
+
+    Returns:
+        Path to the written config file
+    """
+    if output_path is None:
+        starship_config_dir = ensure_dir(HOME / '.config')
+        output_path = str(starship_config_dir / 'starship.toml')
+
+    config_content = _STARSHIP_TEMPLATE.format_map(starship_colors)
+
+    write_if_changed(output_path, config_content.encode())
 
     if debug:
         print(f"\nStarship config written to: {output_path}")
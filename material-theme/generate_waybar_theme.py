@@ -2,40 +2,41 @@
 """
 Generate Waybar CSS theme from Material You colors
 """
+import os
 import json
+import stat
 import argparse
+import tempfile
+import functools
 from pathlib import Path
 
-
-def generate_waybar_css(material_colors: dict, term_colors: dict, darkmode: bool = True,
-                        transparency: float = 0.85, debug: bool = False) -> str:
-    """Generate Waybar CSS from Material You color palette"""
-
-    # Extract key colors
-    primary = material_colors.get('primary', '#89b4fa')
-    on_primary = material_colors.get('onPrimary', '#ffffff')
-    surface = material_colors.get('surface', '#1e1e2e')
-    surface_container = material_colors.get('surfaceContainer', '#181825')
-    surface_container_low = material_colors.get('surfaceContainerLow', '#11111b')
-    on_surface = material_colors.get('onSurface', '#cdd6f4')
-    on_surface_variant = material_colors.get('onSurfaceVariant', '#a6adc8')
-    secondary = material_colors.get('secondary', '#b4befe')
-    tertiary = material_colors.get('tertiary', '#f5c2e7')
-    error = material_colors.get('error', '#f38ba8')
-    success = material_colors.get('success', '#a6e3a1')
-    warning = material_colors.get('warning', '#f9e2af')
-
-    # Terminal colors for accents
-    term_yellow = term_colors.get('term3', '#f9e2af')
-    term_red = term_colors.get('term1', '#f38ba8')
-
-    # Convert hex to rgba for transparency
-    def hex_to_rgba(hex_color: str, alpha: float = 1.0) -> str:
-        hex_color = hex_color.lstrip('#')
-        r, g, b = int(hex_color[0:2], 16), int(hex_color[2:4], 16), int(hex_color[4:6], 16)
-        return f'rgba({r}, {g}, {b}, {alpha})'
-
-    css = f'''/* Material You Waybar Theme - Refined TUI */
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Placeholder name -> (Material color role, fallback when the role is missing)
+_WAYBAR_COLORS = {
+    'primary': ('primary', '#89b4fa'),
+    'surface': ('surface', '#1e1e2e'),
+    'on_surface': ('onSurface', '#cdd6f4'),
+    'on_surface_variant': ('onSurfaceVariant', '#a6adc8'),
+    'secondary': ('secondary', '#b4befe'),
+    'tertiary': ('tertiary', '#f5c2e7'),
+    'error': ('error', '#f38ba8'),
+    'success': ('success', '#a6e3a1'),
+    'warning': ('warning', '#f9e2af'),
+}
+
+# Colors the stylesheet also uses translucently, as {name_rgb}
+_WAYBAR_RGBA_COLORS = (
+    'primary', 'surface', 'on_surface_variant', 'secondary',
+    'tertiary', 'error', 'success', 'warning',
+)
+
+# Stylesheet body; palette colors are {name}, rgba() channels {name_rgb}
+_WAYBAR_CSS_TEMPLATE = '''/* Material You Waybar Theme - Refined TUI */
 /* Primary: {primary} | Surface: {surface} */
 /* Cohesive TUI aesthetic - Neovim/btop/yazi inspired */
 
@@ -64,9 +65,9 @@ window#waybar {{
 #workspaces button {{
   padding: 1px 8px;
   margin: 2px 1px;
-  color: {hex_to_rgba(on_surface_variant, 0.6)};
+  color: rgba({on_surface_variant_rgb}, 0.6);
   background: transparent;
-  border: 1px solid {hex_to_rgba(on_surface_variant, 0.3)};
+  border: 1px solid rgba({on_surface_variant_rgb}, 0.3);
   transition: all 0.15s ease;
   font-family: monospace;
   min-width: 20px;
@@ -75,21 +76,21 @@ window#waybar {{
 
 #workspaces button.active {{
   color: {primary};
-  background: {hex_to_rgba(surface, 0.6)};
-  border: 1px solid {hex_to_rgba(primary, 0.6)};
+  background: rgba({surface_rgb}, 0.6);
+  border: 1px solid rgba({primary_rgb}, 0.6);
   font-weight: 600;
 }}
 
 #workspaces button:hover {{
-  background: {hex_to_rgba(surface, 0.4)};
+  background: rgba({surface_rgb}, 0.4);
   color: {on_surface_variant};
-  border: 1px solid {hex_to_rgba(on_surface_variant, 0.4)};
+  border: 1px solid rgba({on_surface_variant_rgb}, 0.4);
 }}
 
 #workspaces button.urgent {{
   color: {error};
-  background: {hex_to_rgba(surface, 0.6)};
-  border: 1px solid {hex_to_rgba(error, 0.6)};
+  background: rgba({surface_rgb}, 0.6);
+  border: 1px solid rgba({error_rgb}, 0.6);
   font-weight: 600;
 }}
 
@@ -97,7 +98,7 @@ window#waybar {{
 #window {{
   padding: 0 10px;
   margin: 0;
-  color: {hex_to_rgba(on_surface_variant, 0.8)};
+  color: rgba({on_surface_variant_rgb}, 0.8);
   font-weight: 400;
   font-family: "Iosevka Nerd Font", monospace;
   font-size: 11px;
@@ -112,18 +113,18 @@ window#waybar {{
 #clock {{
   padding: 1px 12px;
   margin: 2px 4px;
-  background: {hex_to_rgba(surface, 0.6)};
+  background: rgba({surface_rgb}, 0.6);
   color: {primary};
   font-weight: 600;
-  border: 1px solid {hex_to_rgba(primary, 0.5)};
+  border: 1px solid rgba({primary_rgb}, 0.5);
   font-family: monospace;
   letter-spacing: 0.3px;
   font-size: 11px;
 }}
 
 #clock:hover {{
-  background: {hex_to_rgba(surface, 0.8)};
-  border-color: {hex_to_rgba(primary, 0.7)};
+  background: rgba({surface_rgb}, 0.8);
+  border-color: rgba({primary_rgb}, 0.7);
 }}
 
 /* Module container base */
@@ -135,9 +136,9 @@ window#waybar {{
 #battery {{
   padding: 1px 8px;
   margin: 2px 1px;
-  background: {hex_to_rgba(surface, 0.5)};
+  background: rgba({surface_rgb}, 0.5);
   color: {on_surface_variant};
-  border: 1px solid {hex_to_rgba(on_surface_variant, 0.4)};
+  border: 1px solid rgba({on_surface_variant_rgb}, 0.4);
   transition: all 0.15s ease;
   font-size: 11px;
 }}
@@ -148,180 +149,180 @@ window#waybar {{
 #disk:hover,
 #backlight:hover,
 #battery:hover {{
-  background: {hex_to_rgba(surface, 0.7)};
-  border-color: {hex_to_rgba(on_surface_variant, 0.6)};
+  background: rgba({surface_rgb}, 0.7);
+  border-color: rgba({on_surface_variant_rgb}, 0.6);
 }}
 
 /* CPU */
 #cpu {{
-  border-color: {hex_to_rgba(secondary, 0.4)};
+  border-color: rgba({secondary_rgb}, 0.4);
 }}
 
 #cpu.warning {{
   color: {warning};
-  border-color: {hex_to_rgba(warning, 0.6)};
-  background: {hex_to_rgba(surface, 0.65)};
+  border-color: rgba({warning_rgb}, 0.6);
+  background: rgba({surface_rgb}, 0.65);
 }}
 
 #cpu.critical {{
   color: {error};
-  border-color: {hex_to_rgba(error, 0.6)};
-  background: {hex_to_rgba(surface, 0.65)};
+  border-color: rgba({error_rgb}, 0.6);
+  background: rgba({surface_rgb}, 0.65);
   font-weight: 600;
 }}
 
 /* Memory */
 #memory {{
-  border-color: {hex_to_rgba(tertiary, 0.4)};
+  border-color: rgba({tertiary_rgb}, 0.4);
 }}
 
 #memory.warning {{
   color: {warning};
-  border-color: {hex_to_rgba(warning, 0.6)};
-  background: {hex_to_rgba(surface, 0.65)};
+  border-color: rgba({warning_rgb}, 0.6);
+  background: rgba({surface_rgb}, 0.65);
 }}
 
 #memory.critical {{
   color: {error};
-  border-color: {hex_to_rgba(error, 0.6)};
-  background: {hex_to_rgba(surface, 0.65)};
+  border-color: rgba({error_rgb}, 0.6);
+  background: rgba({surface_rgb}, 0.65);
   font-weight: 600;
 }}
 
 /* Temperature */
 #temperature {{
-  border-color: {hex_to_rgba(success, 0.4)};
+  border-color: rgba({success_rgb}, 0.4);
 }}
 
 #temperature.critical {{
-  background: {hex_to_rgba(surface, 0.65)};
+  background: rgba({surface_rgb}, 0.65);
   color: {error};
-  border-color: {hex_to_rgba(error, 0.6)};
+  border-color: rgba({error_rgb}, 0.6);
   font-weight: 600;
 }}
 
 /* Disk */
 #disk {{
-  border-color: {hex_to_rgba(on_surface_variant, 0.35)};
+  border-color: rgba({on_surface_variant_rgb}, 0.35);
 }}
 
 #disk.warning {{
   color: {warning};
-  border-color: {hex_to_rgba(warning, 0.6)};
-  background: {hex_to_rgba(surface, 0.65)};
+  border-color: rgba({warning_rgb}, 0.6);
+  background: rgba({surface_rgb}, 0.65);
 }}
 
 #disk.critical {{
   color: {error};
-  border-color: {hex_to_rgba(error, 0.6)};
-  background: {hex_to_rgba(surface, 0.65)};
+  border-color: rgba({error_rgb}, 0.6);
+  background: rgba({surface_rgb}, 0.65);
 }}
 
 /* Backlight */
 #backlight {{
-  border-color: {hex_to_rgba(warning, 0.4)};
+  border-color: rgba({warning_rgb}, 0.4);
 }}
 
 /* Network */
 #network {{
   padding: 1px 8px;
   margin: 2px 1px;
-  background: {hex_to_rgba(surface, 0.5)};
+  background: rgba({surface_rgb}, 0.5);
   color: {on_surface_variant};
-  border: 1px solid {hex_to_rgba(on_surface_variant, 0.4)};
+  border: 1px solid rgba({on_surface_variant_rgb}, 0.4);
   transition: all 0.15s ease;
   font-size: 11px;
 }}
 
 #network.ethernet {{
-  border-color: {hex_to_rgba(success, 0.5)};
+  border-color: rgba({success_rgb}, 0.5);
   color: {success};
 }}
 
 #network.wifi {{
-  border-color: {hex_to_rgba(secondary, 0.5)};
+  border-color: rgba({secondary_rgb}, 0.5);
   color: {secondary};
 }}
 
 #network.disconnected {{
   color: {error};
-  background: {hex_to_rgba(surface, 0.65)};
-  border-color: {hex_to_rgba(error, 0.6)};
+  background: rgba({surface_rgb}, 0.65);
+  border-color: rgba({error_rgb}, 0.6);
 }}
 
 #network:hover {{
-  background: {hex_to_rgba(surface, 0.7)};
-  border-color: {hex_to_rgba(secondary, 0.6)};
+  background: rgba({surface_rgb}, 0.7);
+  border-color: rgba({secondary_rgb}, 0.6);
 }}
 
 /* Bluetooth */
 #bluetooth {{
   padding: 1px 8px;
   margin: 2px 1px;
-  background: {hex_to_rgba(surface, 0.5)};
+  background: rgba({surface_rgb}, 0.5);
   color: {on_surface_variant};
-  border: 1px solid {hex_to_rgba(on_surface_variant, 0.4)};
+  border: 1px solid rgba({on_surface_variant_rgb}, 0.4);
   font-size: 11px;
 }}
 
 #bluetooth.connected {{
   color: {secondary};
-  border-color: {hex_to_rgba(secondary, 0.5)};
+  border-color: rgba({secondary_rgb}, 0.5);
 }}
 
 #bluetooth.disabled {{
-  color: {hex_to_rgba(on_surface_variant, 0.6)};
+  color: rgba({on_surface_variant_rgb}, 0.6);
   opacity: 0.5;
 }}
 
 #bluetooth:hover {{
-  background: {hex_to_rgba(surface, 0.7)};
-  border-color: {hex_to_rgba(secondary, 0.6)};
+  background: rgba({surface_rgb}, 0.7);
+  border-color: rgba({secondary_rgb}, 0.6);
 }}
 
 /* Audio */
 #pulseaudio {{
   padding: 1px 8px;
   margin: 2px 1px;
-  background: {hex_to_rgba(surface, 0.5)};
+  background: rgba({surface_rgb}, 0.5);
   color: {on_surface_variant};
-  border: 1px solid {hex_to_rgba(on_surface_variant, 0.4)};
+  border: 1px solid rgba({on_surface_variant_rgb}, 0.4);
   transition: all 0.15s ease;
   font-size: 11px;
 }}
 
 #pulseaudio.muted {{
   color: {error};
-  background: {hex_to_rgba(surface, 0.65)};
-  border-color: {hex_to_rgba(error, 0.6)};
+  background: rgba({surface_rgb}, 0.65);
+  border-color: rgba({error_rgb}, 0.6);
 }}
 
 #pulseaudio:hover {{
-  background: {hex_to_rgba(surface, 0.7)};
-  border-color: {hex_to_rgba(tertiary, 0.6)};
+  background: rgba({surface_rgb}, 0.7);
+  border-color: rgba({tertiary_rgb}, 0.6);
 }}
 
 /* Battery */
 #battery {{
-  border-color: {hex_to_rgba(success, 0.4)};
+  border-color: rgba({success_rgb}, 0.4);
 }}
 
 #battery.charging,
 #battery.plugged {{
   color: {success};
-  border-color: {hex_to_rgba(success, 0.6)};
+  border-color: rgba({success_rgb}, 0.6);
 }}
 
 #battery.warning:not(.charging) {{
   color: {warning};
-  background: {hex_to_rgba(surface, 0.65)};
-  border-color: {hex_to_rgba(warning, 0.6)};
+  background: rgba({surface_rgb}, 0.65);
+  border-color: rgba({warning_rgb}, 0.6);
 }}
 
 #battery.critical:not(.charging) {{
   color: {error};
-  background: {hex_to_rgba(surface, 0.7)};
-  border-color: {hex_to_rgba(error, 0.7)};
+  background: rgba({surface_rgb}, 0.7);
+  border-color: rgba({error_rgb}, 0.7);
   font-weight: 600;
 }}
 
@@ -329,8 +330,8 @@ window#waybar {{
 #tray {{
   padding: 1px 6px;
   margin: 2px 1px;
-  background: {hex_to_rgba(surface, 0.5)};
-  border: 1px solid {hex_to_rgba(on_surface_variant, 0.35)};
+  background: rgba({surface_rgb}, 0.5);
+  border: 1px solid rgba({on_surface_variant_rgb}, 0.35);
 }}
 
 #tray > .passive {{
@@ -339,47 +340,47 @@ window#waybar {{
 
 #tray > .needs-attention {{
   -gtk-icon-effect: highlight;
-  background: {hex_to_rgba(primary, 0.12)};
+  background: rgba({primary_rgb}, 0.12);
 }}
 
 #tray:hover {{
-  background: {hex_to_rgba(surface, 0.7)};
-  border-color: {hex_to_rgba(on_surface_variant, 0.5)};
+  background: rgba({surface_rgb}, 0.7);
+  border-color: rgba({on_surface_variant_rgb}, 0.5);
 }}
 
 /* Idle Inhibitor */
 #idle_inhibitor {{
   padding: 1px 8px;
   margin: 2px 1px;
-  background: {hex_to_rgba(surface, 0.5)};
+  background: rgba({surface_rgb}, 0.5);
   color: {on_surface_variant};
-  border: 1px solid {hex_to_rgba(on_surface_variant, 0.35)};
+  border: 1px solid rgba({on_surface_variant_rgb}, 0.35);
   font-size: 11px;
 }}
 
 #idle_inhibitor.activated {{
   color: {warning};
-  border-color: {hex_to_rgba(warning, 0.6)};
-  background: {hex_to_rgba(surface, 0.65)};
+  border-color: rgba({warning_rgb}, 0.6);
+  background: rgba({surface_rgb}, 0.65);
 }}
 
 /* Media Player */
 #mpris {{
   padding: 1px 8px;
   margin: 2px 1px;
-  background: {hex_to_rgba(surface, 0.5)};
+  background: rgba({surface_rgb}, 0.5);
   color: {on_surface_variant};
-  border: 1px solid {hex_to_rgba(on_surface_variant, 0.4)};
+  border: 1px solid rgba({on_surface_variant_rgb}, 0.4);
   font-size: 11px;
 }}
 
 #mpris.playing {{
   color: {tertiary};
-  border-color: {hex_to_rgba(tertiary, 0.6)};
+  border-color: rgba({tertiary_rgb}, 0.6);
 }}
 
 #mpris.paused {{
-  color: {hex_to_rgba(on_surface_variant, 0.6)};
+  color: rgba({on_surface_variant_rgb}, 0.6);
   opacity: 0.7;
 }}
 
@@ -387,51 +388,51 @@ window#waybar {{
 #custom-power {{
   padding: 1px 10px;
   margin: 2px 2px 2px 1px;
-  background: {hex_to_rgba(surface, 0.6)};
+  background: rgba({surface_rgb}, 0.6);
   color: {error};
   font-size: 12px;
   font-weight: 600;
-  border: 1px solid {hex_to_rgba(error, 0.6)};
+  border: 1px solid rgba({error_rgb}, 0.6);
   transition: all 0.15s ease;
 }}
 
 #custom-power:hover {{
-  background: {hex_to_rgba(surface, 0.8)};
-  border-color: {hex_to_rgba(error, 0.8)};
+  background: rgba({surface_rgb}, 0.8);
+  border-color: rgba({error_rgb}, 0.8);
 }}
 
 #custom-notification {{
   padding: 1px 8px;
   margin: 2px 1px;
-  background: {hex_to_rgba(surface, 0.5)};
+  background: rgba({surface_rgb}, 0.5);
   color: {on_surface_variant};
-  border: 1px solid {hex_to_rgba(on_surface_variant, 0.35)};
+  border: 1px solid rgba({on_surface_variant_rgb}, 0.35);
   font-size: 11px;
 }}
 
 #custom-notification.notification {{
   color: {primary};
-  border-color: {hex_to_rgba(primary, 0.6)};
+  border-color: rgba({primary_rgb}, 0.6);
 }}
 
 #custom-notification.dnd {{
   color: {error};
-  border-color: {hex_to_rgba(error, 0.6)};
+  border-color: rgba({error_rgb}, 0.6);
 }}
 
 #custom-updates {{
   padding: 1px 8px;
   margin: 2px 1px;
-  background: {hex_to_rgba(surface, 0.5)};
+  background: rgba({surface_rgb}, 0.5);
   color: {on_surface_variant};
-  border: 1px solid {hex_to_rgba(on_surface_variant, 0.35)};
+  border: 1px solid rgba({on_surface_variant_rgb}, 0.35);
   font-size: 11px;
 }}
 
 #custom-updates.has-updates {{
   color: {warning};
-  border-color: {hex_to_rgba(warning, 0.6)};
-  background: {hex_to_rgba(surface, 0.65)};
+  border-color: rgba({warning_rgb}, 0.6);
+  background: rgba({surface_rgb}, 0.65);
 }}
 
 #custom-spacer {{
@@ -440,9 +441,9 @@ window#waybar {{
 
 /* Tooltips */
 tooltip {{
-  background: {hex_to_rgba(surface, 0.95)};
+  background: rgba({surface_rgb}, 0.95);
   color: {on_surface};
-  border: 1px solid {hex_to_rgba(primary, 0.5)};
+  border: 1px solid rgba({primary_rgb}, 0.5);
   border-radius: 0;
   padding: 6px 10px;
   font-family: monospace;
@@ -459,19 +460,43 @@ scrollbar {{
 }}
 
 scrollbar slider {{
-  background: {hex_to_rgba(primary, 0.3)};
+  background: rgba({primary_rgb}, 0.3);
   border-radius: 0;
   min-width: 2px;
-  border: 1px solid {hex_to_rgba(primary, 0.5)};
+  border: 1px solid rgba({primary_rgb}, 0.5);
 }}
 
 scrollbar slider:hover {{
-  background: {hex_to_rgba(primary, 0.5)};
-  border-color: {hex_to_rgba(primary, 0.7)};
+  background: rgba({primary_rgb}, 0.5);
+  border-color: rgba({primary_rgb}, 0.7);
 }}
 '''
 
-    return css
+
+def generate_waybar_css(material_colors: dict, term_colors: dict, darkmode: bool = True,
+                        transparency: float = 0.85, debug: bool = False) -> str:
+    """Generate Waybar CSS from Material You color palette"""
+
+    # The resolved palette values, in _WAYBAR_COLORS order, are the memoization key
+    return _waybar_css(tuple(
+        material_colors.get(role, fallback) for role, fallback in _WAYBAR_COLORS.values()
+    ))
+
+
+@functools.lru_cache(maxsize=8)
+def _waybar_css(values: tuple) -> str:
+    """Render the stylesheet for the _WAYBAR_COLORS values, memoized"""
+    colors = dict(zip(_WAYBAR_COLORS, values))
+
+    # "r, g, b" channels for the rgba() colors, parsed once per color instead
+    # of once per use in the stylesheet
+    for name in _WAYBAR_RGBA_COLORS:
+        hex_color = colors[name].lstrip('#')
+        colors[f'{name}_rgb'] = (
+            f'{int(hex_color[0:2], 16)}, {int(hex_color[2:4], 16)}, {int(hex_color[4:6], 16)}'
+        )
+
+    return _WAYBAR_CSS_TEMPLATE.format_map(colors)
 
 
 def write_waybar_theme(colors: dict, output_path: str = None, debug: bool = False) -> Path:
@@ -493,8 +518,35 @@ def write_waybar_theme(colors: dict, output_path: str = None, debug: bool = Fals
     css_content = generate_waybar_css(material_colors, term_colors, darkmode, transparency, debug)
 
     theme_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(theme_path, 'w') as f:
-        f.write(css_content)
+    # Leave an identical stylesheet alone so waybar's reload_style_on_change
+    # doesn't fire for a no-op regeneration
+    payload = css_content.encode()
+    try:
+        unchanged = theme_path.read_bytes() == payload
+    except OSError:
+        unchanged = False
+    if not unchanged:
+        # Swap in a complete file from a private temp file; a symlinked
+        # style.css keeps its link and the stylesheet keeps its permissions
+        target = theme_path.resolve()
+        try:
+            mode = stat.S_IMODE(target.stat().st_mode)
+        except FileNotFoundError:
+            umask = os.umask(0)
+            os.umask(umask)
+            mode = 0o666 & ~umask
+        fd, tmp_path = tempfile.mkstemp(dir=target.parent, prefix=f'.{target.name}.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+            os.chmod(tmp_path, mode)
+            os.replace(tmp_path, target)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
 
     if debug:
         print(f"Waybar CSS written to: {theme_path}")
@@ -516,8 +568,8 @@ if __name__ == '__main__':
         print(f"Error: Colors file not found: {colors_path}")
         exit(1)
 
-    with open(colors_path, 'r') as f:
-        colors = json.load(f)
+    payload = colors_path.read_bytes()
+    colors = orjson.loads(payload) if orjson is not None else json.loads(payload)
 
     # Generate theme
     theme_path = write_waybar_theme(colors, args.output, args.debug)
@@ -18,10 +18,52 @@ Expected config shape (from your config.json):
 
 from __future__ import annotations
 
-from pathlib import Path
+import functools
 from typing import Dict, Optional
+from color_utils import HOME, ensure_dir, write_if_changed
 
 
+# style.css; every {name} is a key of the generate_wofi_colors palette
+_WOFI_TEMPLATE = """/* Auto-generated Wofi style (Material You) */
+
+* {{
+  font-family: Iosevka;
+  font-size: 18px;
+}}
+
+window {{
+  background-color: {bg};
+  border: 2px solid {border};
+  padding: 10px;
+}}
+
+#input {{
+  background-color: {input_bg};
+  color: {input_fg};
+  border: 2px solid {input_border};
+  padding: 6px 10px;
+  margin-bottom: 10px;
+}}
+
+#entry {{
+  padding: 6px 10px;
+  color: {entry_fg};
+}}
+
+#entry:selected {{
+  background-color: {selected_bg};
+  color: {selected_fg};
+  font-weight: bold;
+}}
+
+#entry:hover {{
+  background-color: {hover_bg};
+  color: {hover_fg};
+}}
+"""
+
+
+@functools.lru_cache(maxsize=256)
 def hex_to_rgba(hex_color: str, alpha: float) -> str:
     hex_color = hex_color.strip().lstrip("#")
     if len(hex_color) != 6:
@@ -128,49 +170,12 @@ def write_wofi_theme(wofi_colors: dict, output_path: str = None, debug: bool = F
     Write ~/.config/wofi/style.css (or custom output path).
     """
     if output_path is None:
-        wofi_dir = Path.home() / ".config" / "wofi"
-        wofi_dir.mkdir(parents=True, exist_ok=True)
+        wofi_dir = ensure_dir(HOME / ".config" / "wofi")
         output_path = str(wofi_dir / "style.css")
 
-    css = f"""/* Auto-generated Wofi style (Material You) */
-
-* {{
-  font-family: Iosevka;
-  font-size: 18px;
-}}
-
-window {{
-  background-color: {wofi_colors["bg"]};
-  border: 2px solid {wofi_colors["border"]};
-  padding: 10px;
-}}
-
-#input {{
-  background-color: {wofi_colors["input_bg"]};
-  color: {wofi_colors["input_fg"]};
-  border: 2px solid {wofi_colors["input_border"]};
-  padding: 6px 10px;
-  margin-bottom: 10px;
-}}
-
-#entry {{
-  padding: 6px 10px;
-  color: {wofi_colors["entry_fg"]};
-}}
-
-#entry:selected {{
-  background-color: {wofi_colors["selected_bg"]};
-  color: {wofi_colors["selected_fg"]};
-  font-weight: bold;
-}}
-
-#entry:hover {{
-  background-color: {wofi_colors["hover_bg"]};
-  color: {wofi_colors["hover_fg"]};
-}}
-"""
+    css = _WOFI_TEMPLATE.format_map(wofi_colors)
 
-    Path(output_path).write_text(css)
+    write_if_changed(output_path, css.encode())
 
     if debug:
         print(f"Wofi theme written to: {output_path}")
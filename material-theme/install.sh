@@ -49,6 +49,11 @@ python3 -c "import cv2" 2>/dev/null || {
     echo "Install with: pip install opencv-python"
 }
 
+python3 -c "import numpy" 2>/dev/null || {
+    echo "Warning: numpy not found (optional, for faster batch color generation)"
+    echo "Install with: pip install numpy"
+}
+
 echo "✓ Python packages OK"
 echo ""
 
@@ -70,7 +75,7 @@ chmod +x "$THEME_DIR/generate_material_theme.py"
 # Individual theme generators
 for generator in generate_kitty_theme.py generate_nvim_theme.py generate_lazygit_theme.py \
                  generate_yazi_theme.py generate_fzf_theme.py generate_btop_theme.py \
-                 generate_fish_theme.py; do
+                 generate_fish_theme.py color_utils.py; do
     if [ -f "$SCRIPT_DIR/$generator" ]; then
         cp "$SCRIPT_DIR/$generator" "$THEME_DIR/"
         echo "  ✓ $generator"